@@ -1,216 +1,607 @@
-import os
-import fitz  # PyMuPDF
-import docx
-import pdfplumber
-import json
-import re
+import copy
 import time
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
-from datetime import datetime, timedelta
-from groq import Groq
-from dotenv import load_dotenv
+from cache import AnalysisCache, make_cache_key
+from groq_client import get_client, get_governor, get_completion_budget, get_api_key, load_environment
+from routing import get_router, CircuitOpenError
+from chunking import count_tokens, input_budget, plan_chunks, fit_job_description, merge_analysis_results
+from singleflight import SingleFlight, run_once
+from metrics import span, increment, observe, record_token_usage
+from json_parsing import IncrementalJSONParser, ANALYSIS_SCHEMA, extract_json_object, validate_schema
+from keyword_match import get_skill_matcher
+from result_model import AnalysisResult
+from prompts import (PROMPT_VERSION, SYSTEM_PROMPT, ANALYSIS_TEMPLATE, JOB_ANALYSIS_TEMPLATE, MATCH_TEMPLATE, PART_NOTE,
+                     GENERAL_FIELDS, JOB_FIELDS, MATCH_FIELDS, schema_spec)
 
-# Load environment variables
-load_dotenv()
+# Size of the resume profile sent with each job description instead of the full resume
+PROFILE_SUMMARY_TOKEN_BUDGET = 700
+
+class TruncatedResponseError(Exception):
+    """Raised after a streamed completion that was cut off by its max_tokens."""
 
 # SmartAnalyzer: Handles API communication, rate limiting, caching
 class SmartAnalyzer:
     def __init__(self, api_key):
-        self.client = Groq(api_key=api_key)  # ✅ Correct instantiation
-        self.requests_per_minute = 30
-        self.request_times = []
-        self.cache = {}
+        self.api_key = api_key or get_api_key()
+        if not self.api_key:
+            raise ValueError("GROQ_API_KEY is not configured")
+        self.governor = get_governor()
+        self.completion_budget = get_completion_budget()
+        # Preferred analysis model; part of the cache key together with the prompt version
+        self.router = get_router()
+        self.model = self.router.primary("analysis")
+        self.cache = AnalysisCache()
 
-    def _get_cache_key(self, resume_text, job_description=""):
-        combined_text = f"{resume_text[:500]}{job_description[:200]}"
-        return hashlib.md5(combined_text.encode()).hexdigest()
+    @property
+    def client(self):
+        # Shared with pdf_generator and other sessions; created (and the SDK imported) on the first request
+        return get_client(self.api_key)
+
+    @property
+    def requests_per_minute(self):
+        return self.governor.requests_per_minute
 
-    def _can_make_request(self):
-        now = datetime.now()
-        self.request_times = [t for t in self.request_times if now - t < timedelta(minutes=1)]
-        return len(self.request_times) < self.requests_per_minute
+    @requests_per_minute.setter
+    def requests_per_minute(self, value):
+        self.governor.requests_per_minute = value
+
+    def _get_cache_key(self, resume_text, job_description=""):
+        return make_cache_key(resume_text, job_description, PROMPT_VERSION, self.model)
 
     def _wait_for_rate_limit(self):
-        if not self._can_make_request():
-            wait_time = 60 - (datetime.now() - min(self.request_times)).seconds
-            if wait_time > 0:
-                st.info(f"Rate limit reached. Waiting {wait_time} seconds...")
-                time.sleep(wait_time + 1)
+        # Reserves a slot in the shared window before calling the API
+        def on_wait(wait_time):
+            increment("rate_limit_waits_total", source="analysis")
+            st.info(f"Rate limit reached. Waiting {int(wait_time) + 1} seconds...")
+
+        with span("rate_limit_wait", source="analysis"):
+            self.governor.acquire("analysis", on_wait=on_wait)
 
-    def _make_groq_request(self, prompt, max_retries=3):
+    def _backoff(self, attempt, max_retries, error_msg):
+        # Sleep before the next attempt; rate-limit errors back off exponentially
+        if "rate limit" in error_msg or "quota" in error_msg:
+            increment("groq_retries_total", reason="rate_limit")
+            wait_time = 2 ** attempt
+            st.warning(f"Rate limit hit. Waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
+        else:
+            increment("groq_retries_total", reason="error")
+            wait_time = 1
+        with span("retry_backoff"):
+            time.sleep(wait_time)
+
+    def _complete(self, model, prompt, kind=None):
+        max_tokens = self.completion_budget.max_tokens(kind)
+        chat_completion = self.client.chat.completions.create(
+            messages=[
+                {
+                    "role": "system",
+                    "content": SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model=model,
+            temperature=0.3,
+            max_tokens=max_tokens,
+            top_p=0.9,
+            stream=False
+        )
+        _, completion_tokens = record_token_usage(getattr(chat_completion, "usage", None), "analysis")
+        choice = chat_completion.choices[0]
+        truncated = choice.finish_reason == "length"
+        self.completion_budget.record(kind, completion_tokens, truncated)
+        if truncated and max_tokens < self.completion_budget.ceiling:
+            # Cut off by a learned cap rather than the model's limit: ask again with the full cap
+            # (the truncation cleared what was learned for kind, so kind now gets the full cap too)
+            self.governor.acquire("analysis")
+            return self._complete(model, prompt, kind)
+        return choice.message.content
+
+    def _make_groq_request(self, prompt, max_retries=3, validate=None, kind="analysis"):
+        """
+        Complete a prompt with retries, routing and hedging.
+
+        kind names the prompt ("analysis", "match") so its output cap is
+        learned from earlier answers to the same prompt; None always
+        reserves the full cap (e.g. packed prompts, whose answers grow with
+        the pack).
+        """
+        for attempt in range(max_retries):
+            try:
+                self._wait_for_rate_limit()
+                # Routed to the first healthy model and hedged if it is slower than usual
+                with span("groq_request", model=self.model, attempt=attempt + 1):
+                    response = self.router.call(
+                        "analysis", lambda model: self._complete(model, prompt, kind), validate=validate, source="analysis"
+                    )
+                increment("groq_requests_total", source="analysis", status="ok")
+                return response
+            except CircuitOpenError as e:
+                increment("groq_requests_total", source="analysis", status="error")
+                st.error(str(e))
+                raise
+            except Exception as e:
+                increment("groq_requests_total", source="analysis", status="error")
+                error_msg = str(e).lower()
+                if attempt == max_retries - 1 and not ("rate limit" in error_msg or "quota" in error_msg):
+                    st.error(f"Final retry failed: {str(e)}")
+                    raise e
+                self._backoff(attempt, max_retries, error_msg)
+
+    def _stream_groq_request(self, prompt, max_retries=3, kind="analysis"):
+        """
+        Yield the completion text chunk by chunk as the model generates it.
+
+        Raises:
+            TruncatedResponseError: The stream was cut off by a learned output
+                cap below the full cap (see _stream_analysis)
+        """
+        truncated = False
+        max_tokens = None
         for attempt in range(max_retries):
+            started = False
+            # Streams are routed and circuit-broken but not hedged, since output is shown as it arrives
+            model = self.router.select("analysis")
             try:
                 self._wait_for_rate_limit()
-                chat_completion = self.client.chat.completions.create(
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are an expert resume analyzer and career coach. Always respond with valid JSON only, no additional text or formatting."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    model="llama3-8b-8192",
-                    temperature=0.3,
-                    max_tokens=4000,
-                    top_p=0.9,
-                    stream=False
-                )
-                self.request_times.append(datetime.now())
-                return chat_completion.choices[0].message.content
+                with span("groq_stream", model=model, attempt=attempt + 1):
+                    request_start = time.perf_counter()
+                    completion_tokens = None
+                    truncated = False
+                    max_tokens = self.completion_budget.max_tokens(kind)
+                    stream = self.client.chat.completions.create(
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": SYSTEM_PROMPT
+                            },
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ],
+                        model=model,
+                        temperature=0.3,
+                        max_tokens=max_tokens,
+                        top_p=0.9,
+                        stream=True
+                    )
+                    for chunk in stream:
+                        # Groq reports token usage on the final chunk
+                        x_groq = getattr(chunk, "x_groq", None)
+                        if x_groq is not None:
+                            _, completion_tokens = record_token_usage(getattr(x_groq, "usage", None), "analysis")
+                        if not chunk.choices:
+                            continue
+                        truncated = truncated or chunk.choices[0].finish_reason == "length"
+                        content = chunk.choices[0].delta.content
+                        if content:
+                            if not started:
+                                observe("groq_time_to_first_token_seconds", time.perf_counter() - request_start)
+                            started = True
+                            yield content
+                self.router.record_success(model, time.perf_counter() - request_start)
+                self.completion_budget.record(kind, completion_tokens, truncated)
+                increment("groq_requests_total", source="analysis_stream", status="ok")
+                if truncated:
+                    break
+                return
             except Exception as e:
+                self.router.record_failure(model, e)
+                increment("groq_requests_total", source="analysis_stream", status="error")
+                # Once output has been shown we cannot transparently retry
+                if started:
+                    raise
                 error_msg = str(e).lower()
-                if "rate limit" in error_msg or "quota" in error_msg:
-                    wait_time = 2 ** attempt
-                    st.warning(f"Rate limit hit. Waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                    time.sleep(wait_time)
-                elif attempt == max_retries - 1:
+                if attempt == max_retries - 1 and not ("rate limit" in error_msg or "quota" in error_msg):
                     st.error(f"Final retry failed: {str(e)}")
                     raise e
-                else:
-                    time.sleep(1)
+                self._backoff(attempt, max_retries, error_msg)
+        if truncated and max_tokens < self.completion_budget.ceiling:
+            # Asking again only helps below the full cap; an answer cut off at the full cap is kept as it is
+            raise TruncatedResponseError("The streamed response reached its output cap")
 
 # Global analyzer instance
 analyzer = None
 
 def initialize_analyzer(api_key):
     global analyzer
+    load_environment()
     analyzer = SmartAnalyzer(api_key)
 
-def extract_text_from_file(file_path):
-    file_extension = file_path.split('.')[-1].lower()
-    try:
-        if file_extension == 'pdf':
-            try:
-                text = ""
-                with fitz.open(file_path) as doc:
-                    for page in doc:
-                        text += page.get_text()
-                return text
-            except:
-                text = ""
-                with pdfplumber.open(file_path) as pdf:
-                    for page in pdf.pages:
-                        text += page.extract_text() or ""
-                return text
-        elif file_extension == 'docx':
-            doc = docx.Document(file_path)
-            return "\n".join([p.text for p in doc.paragraphs])
-        elif file_extension == 'txt':
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                return f.read()
-        else:
-            return None
-    except Exception as e:
-        print(f"Text extraction error: {str(e)}")
-        return None
-
 def extract_json_from_text(text):
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
-    try:
-        matches = re.findall(r'({[\s\S]*?})', text)
-        for match in matches:
-            try:
-                return json.loads(match)
-            except json.JSONDecodeError:
-                continue
-    except:
-        pass
-    return None
+    # Single-pass, schema-aware extraction with repair of common model defects
+    return extract_json_object(text, ANALYSIS_SCHEMA)
 
-def analyze_resume(resume_text, job_description=""):
-    cache_key = analyzer._get_cache_key(resume_text, job_description)
-    if cache_key in analyzer.cache:
-        st.info("Using cached analysis results")
-        return analyzer.cache[cache_key]
+def has_json(text):
+    """Return True if a response contains a usable JSON object (decides hedged requests)."""
+    return bool(text) and extract_json_from_text(text) is not None
 
+def build_analysis_prompt(resume_text, job_description="", part=None, total_parts=None):
+    """Build the analysis prompt for a resume, optionally against a job description."""
+    part_note = ""
+    if part is not None and total_parts and total_parts > 1:
+        part_note = PART_NOTE.format(part=part, total_parts=total_parts)
     if job_description.strip():
-        prompt = f"""
-        You are an expert resume analyzer and career coach. Analyze the following resume against the provided job description and provide detailed, constructive feedback.
-
-        RESUME:
-        {resume_text[:3000]}
-
-        JOB DESCRIPTION:
-        {job_description[:2000]}
-
-        Provide your analysis in this exact JSON structure:
-        {{
-            "job_match_score": "8 out of 10",
-            "job_match_summary": "Brief explanation",
-            "strengths": [{{"category": "Category", "details": "Details"}}],
-            "weaknesses": [{{"category": "Category", "details": "Details"}}],
-            "improvement_suggestions": [{{"category": "Category", "current": "Current", "suggested_improvement": "Improvement"}}],
-            "missing_keywords": [{{"keyword": "Keyword", "importance": "Why it's important"}}],
-            "skills_to_develop": [{{"skill": "Skill", "reason": "Why develop it"}}],
-            "overall_score": "7 out of 10",
-            "summary_feedback": "Summary"
-        }}
-
-        Only return valid JSON.
-        """
-    else:
-        prompt = f"""
-        You are an expert resume analyzer and career coach. Analyze the following resume and provide detailed, constructive feedback.
-
-        RESUME:
-        {resume_text[:4000]}
-
-        Provide your analysis in this exact JSON structure:
-        {{
-            "strengths": [{{"category": "Category", "details": "Details"}}],
-            "weaknesses": [{{"category": "Category", "details": "Details"}}],
-            "improvement_suggestions": [{{"category": "Category", "current": "Current", "suggested_improvement": "Improvement"}}],
-            "job_recommendations": [{{"title": "Job", "match_reason": "Reason", "required_skills": ["Skill1", "Skill2"]}}],
-            "skills_to_develop": [{{"skill": "Skill", "reason": "Why"}}],
-            "overall_score": "7 out of 10",
-            "summary_feedback": "Summary"
-        }}
-
-        Only return valid JSON.
-        """
+        return JOB_ANALYSIS_TEMPLATE.format(part_note=part_note, resume=resume_text, job_description=job_description,
+                                            schema=schema_spec(*JOB_FIELDS))
+    return ANALYSIS_TEMPLATE.format(part_note=part_note, resume=resume_text, schema=schema_spec(*GENERAL_FIELDS))
 
-    try:
-        response_text = analyzer._make_groq_request(prompt)
-        if not response_text:
-            return {"error": True, "message": "No response from Groq"}
+def _strings(value):
+    """Flatten a profile field the model returned as a string, list or objects into strings."""
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if not isinstance(value, list):
+        return []
+    items = []
+    for item in value:
+        if isinstance(item, dict):
+            item = ", ".join(str(v) for v in item.values() if v)
+        if item and str(item).strip():
+            items.append(str(item).strip())
+    return items
+
+def summarize_profile(analysis, resume_text=""):
+    """
+    Describe a resume compactly for the job-match stage.
+
+    Built from the "profile" of a general analysis plus skills found locally
+    in the resume text, most important lines first, and trimmed to
+    PROFILE_SUMMARY_TOKEN_BUDGET.
+
+    Args:
+        analysis (dict): General (job-independent) analysis of the resume
+        resume_text (str): Full resume text, scanned for known skills
+
+    Returns:
+        str: Profile summary
+    """
+    profile = analysis.get("profile") if isinstance(analysis.get("profile"), dict) else {}
+    lines = []
+    headline = " ".join(_strings(profile.get("headline")))
+    if headline:
+        lines.append(f"Headline: {headline}")
+    years = " ".join(_strings(profile.get("years_experience")))
+    if years:
+        lines.append(f"Years of experience: {years}")
+    skills = _strings(profile.get("skills"))
+    listed = {skill.lower() for skill in skills}
+    if resume_text:
+        skills += [skill for skill in get_skill_matcher().count_skills(resume_text) if skill.lower() not in listed]
+    if skills:
+        lines.append("Skills: " + ", ".join(skills))
+    for label, key in (("Experience", "experience"), ("Education", "education"), ("Certifications", "certifications")):
+        items = _strings(profile.get(key))
+        if items:
+            lines.append(f"{label}:")
+            lines.extend(f"- {item}" for item in items)
+    for label, key in (("Strengths", "strengths"), ("Weaknesses", "weaknesses")):
+        items = [f"{item.get('category', '')}: {item.get('details', '')}" for item in analysis.get(key, []) if isinstance(item, dict)]
+        if items:
+            lines.append(f"{label}:")
+            lines.extend(f"- {item}" for item in items)
+    if not profile and analysis.get("summary_feedback"):
+        lines.append(f"Summary: {analysis['summary_feedback']}")
+
+    # Drop the least important lines until the summary fits its budget
+    summary = "\n".join(lines)
+    while len(lines) > 1 and count_tokens(summary) > PROFILE_SUMMARY_TOKEN_BUDGET:
+        lines.pop()
+        summary = "\n".join(lines)
+    return summary
+
+def build_match_prompt(profile_summary, job_description):
+    """Build the job-match prompt from a compact profile instead of the full resume."""
+    return MATCH_TEMPLATE.format(profile=profile_summary, job_description=job_description,
+                                 schema=schema_spec(*MATCH_FIELDS))
+
+def combine_profile_and_match(profile, match, resume_text, job_description):
+    """
+    Merge the job-independent profile analysis with a job-match result.
+
+    Strengths, weaknesses and the overall score come from the profile; the
+    match score, keywords and targeted suggestions come from the match stage.
+    Keywords reported missing that do appear in the resume are dropped,
+    since the match stage only saw the profile summary.
 
+    Returns:
+        dict: Result with the same schema as a job-specific analyze_resume
+    """
+    lowered_resume = resume_text.lower()
+    result = {
+        "strengths": profile.get("strengths", []),
+        "weaknesses": profile.get("weaknesses", []),
+        "overall_score": profile.get("overall_score"),
+        "improvement_suggestions": match.get("improvement_suggestions") or profile.get("improvement_suggestions", []),
+        "missing_keywords": [
+            item for item in match.get("missing_keywords", [])
+            if not (item.get("keyword") and str(item["keyword"]).lower() in lowered_resume)
+        ],
+        "skills_to_develop": match.get("skills_to_develop", []),
+        "summary_feedback": match.get("summary_feedback") or profile.get("summary_feedback"),
+    }
+    for key in ("job_match_score", "job_match_summary"):
+        if match.get(key) is not None:
+            result[key] = match[key]
+    return finalize_analysis_result({k: v for k, v in result.items() if v is not None}, job_description)
+
+def plan_analysis(resume_text, job_description=""):
+    """
+    Split a resume into chunks that fit the model's context with the prompt.
+
+    The job description is trimmed to JOB_DESCRIPTION_TOKEN_BUDGET; the resume
+    itself is never truncated. Short resumes yield a single chunk.
+
+    Returns:
+        tuple: (list of resume chunks, job description to send)
+    """
+    job_description = fit_job_description(job_description) if job_description.strip() else job_description
+    overhead = count_tokens(SYSTEM_PROMPT) + count_tokens(build_analysis_prompt("", job_description, 1, 2))
+    return plan_chunks(resume_text, input_budget() - overhead), job_description
+
+def _parse_json_response(response_text):
+    if not response_text:
+        return {"error": True, "message": "No response from Groq"}
+
+    with span("json_parse"):
         result = extract_json_from_text(response_text)
-        if not result:
-            return {
-                "error": True,
-                "message": "Could not parse JSON",
-                "details": f"Raw response: {response_text[:500]}"
-            }
-
-        # Add required defaults
-        defaults = {
-            "strengths": [],
-            "weaknesses": [],
-            "improvement_suggestions": [],
-            "skills_to_develop": [],
-            "overall_score": "5 out of 10",
-            "summary_feedback": "Analysis complete"
+    if not result:
+        increment("json_parse_failures_total")
+        return {
+            "error": True,
+            "message": "Could not parse JSON",
+            "details": f"Raw response: {response_text[:500]}"
         }
-        for k, v in defaults.items():
-            result.setdefault(k, v)
+    return result
+
+def parse_analysis_response(response_text, job_description=""):
+    """
+    Parse a raw model response into an analysis result with required defaults.
 
-        if not job_description.strip() and "job_recommendations" not in result:
-            result["job_recommendations"] = [{
-                "title": "Consider various relevant roles",
-                "match_reason": "Skills and experience suggest good fit",
-                "required_skills": ["Communication", "Teamwork", "Problem Solving"]
-            }]
+    Returns:
+        dict: Analysis result, or an error dict if the response could not be parsed
+    """
+    result = _parse_json_response(response_text)
+    if result.get("error"):
+        return result
+    return finalize_analysis_result(result, job_description)
+
+def parse_match_response(response_text):
+    """
+    Parse a raw job-match response (see build_match_prompt).
 
-        analyzer.cache[cache_key] = result
+    Returns:
+        dict: Match fields without defaults, or an error dict if the response could not be parsed
+    """
+    result = _parse_json_response(response_text)
+    if result.get("error"):
         return result
+    result, _ = validate_schema(result, ANALYSIS_SCHEMA)
+    return result
+
+def finalize_analysis_result(result, job_description=""):
+    """
+    Validate a parsed analysis once and fill in the fields every result is expected to have.
 
+    Returns:
+        AnalysisResult: Typed result with parsed scores (reads like the dict it replaces)
+    """
+    result, _ = validate_schema(result, ANALYSIS_SCHEMA)
+    if not job_description.strip() and "job_recommendations" not in result:
+        result["job_recommendations"] = [{
+            "title": "Consider various relevant roles",
+            "match_reason": "Skills and experience suggest good fit",
+            "required_skills": ["Communication", "Teamwork", "Problem Solving"]
+        }]
+    # AnalysisResult.from_dict applies the remaining defaults ("5 out of 10", empty sections)
+    return AnalysisResult.from_dict(result)
+
+def _analyze_chunk(chunk, job_description, part, total_parts):
+    prompt = build_analysis_prompt(chunk, job_description, part, total_parts)
+    try:
+        response_text = analyzer._make_groq_request(prompt, validate=has_json, kind="analysis_part")
+        return parse_analysis_response(response_text, job_description)
+    except Exception as e:
+        return {"error": True, "message": str(e)}
+
+# Identical analyses in flight in this process (other processes coordinate via cache leases)
+_flights = SingleFlight()
+
+def get_resume_profile(resume_text):
+    """
+    Return the job-independent analysis of a resume, computing it at most once.
+
+    This is the same result (and cache entry) as a general analyze_resume, so
+    every job description the resume is matched against afterwards only
+    needs the smaller job-match request.
+
+    Returns:
+        dict: General analysis including a "profile" section, or an error dict
+    """
+    cache_key = analyzer._get_cache_key(resume_text, "")
+    cached_result = analyzer.cache.get(cache_key)
+    increment("profile_cache_total", result="hit" if cached_result is not None else "miss")
+    if cached_result is not None:
+        return cached_result
+
+    with span("resume_profile"):
+        result, shared = run_once(
+            analyzer.cache, cache_key,
+            lambda: _run_analysis(resume_text, "", cache_key),
+            _flights
+        )
+    return copy.deepcopy(result) if shared else result
+
+def _run_analysis(resume_text, job_description, cache_key):
+    if job_description.strip():
+        # Job-specific: reuse the resume's profile and only send its summary with the job description
+        profile = get_resume_profile(resume_text)
+        if profile.get("error"):
+            return profile
+        job_description = fit_job_description(job_description)
+        prompt = build_match_prompt(summarize_profile(profile, resume_text), job_description)
+        with span("job_match"):
+            match = parse_match_response(analyzer._make_groq_request(prompt, validate=has_json, kind="match"))
+        if match.get("error"):
+            return match
+        result = combine_profile_and_match(profile, match, resume_text, job_description)
+        analyzer.cache.set(cache_key, result)
+        return result
+
+    chunks, job_description = plan_analysis(resume_text, job_description)
+    if len(chunks) == 1:
+        prompt = build_analysis_prompt(resume_text, job_description)
+        response_text = analyzer._make_groq_request(prompt, validate=has_json)
+        result = parse_analysis_response(response_text, job_description)
+    else:
+        # Long resume: analyze section-aware chunks concurrently, then merge
+        with ThreadPoolExecutor(max_workers=min(len(chunks), 4)) as executor:
+            partials = list(executor.map(
+                lambda args: _analyze_chunk(args[1], job_description, args[0] + 1, len(chunks)),
+                enumerate(chunks)
+            ))
+        result = merge_analysis_results(partials, [count_tokens(c) for c in chunks], resume_text, job_description)
+        if not result.get("error"):
+            result = finalize_analysis_result(result, job_description)
+    if not result.get("error"):
+        analyzer.cache.set(cache_key, result)
+    return result
+
+def analyze_resume(resume_text, job_description=""):
+    cache_key = analyzer._get_cache_key(resume_text, job_description)
+    cached_result = analyzer.cache.get(cache_key)
+    increment("analysis_cache_total", result="hit" if cached_result is not None else "miss")
+    if cached_result is not None:
+        st.info("Using cached analysis results")
+        return cached_result
+
+    try:
+        # Concurrent identical submissions share a single API call
+        with span("analysis"):
+            result, shared = run_once(
+                analyzer.cache, cache_key,
+                lambda: _run_analysis(resume_text, job_description, cache_key),
+                _flights
+            )
     except Exception as e:
         st.error(f"Analysis error: {str(e)}")
         return {"error": True, "message": str(e)}
+
+    if shared:
+        increment("analysis_coalesced_total")
+        st.info("Reused an identical analysis that was already in progress")
+        result = copy.deepcopy(result)
+    return result
+
+# Profile sections shown while the job match is still being generated
+PROFILE_SECTIONS = ("strengths", "weaknesses", "overall_score")
+
+def analyze_resume_stream(resume_text, job_description=""):
+    """
+    Stream an analysis, yielding sections as soon as the model finishes them.
+
+    Yields (event, key, value) tuples from IncrementalJSONParser ("item",
+    "field", "end"), followed by a final ("result", None, result) where result
+    has the same schema as analyze_resume. With a job description, the
+    resume's strengths, weaknesses and score come first (from the cached
+    profile when there is one), then the job-match sections.
+    """
+    cache_key = analyzer._get_cache_key(resume_text, job_description)
+    cached_result = analyzer.cache.get(cache_key)
+    if cached_result is not None:
+        increment("analysis_cache_total", result="hit")
+        st.info("Using cached analysis results")
+        yield ("result", None, cached_result)
+        return
+
+    if not job_description.strip():
+        chunks, _ = plan_analysis(resume_text)
+        yield from _stream_analysis(
+            cache_key, build_analysis_prompt(resume_text), len(chunks) > 1,
+            finalize_analysis_result,
+            lambda: analyze_resume(resume_text)
+        )
+        return
+
+    profile_key = analyzer._get_cache_key(resume_text, "")
+    profile = analyzer.cache.get(profile_key)
+    increment("profile_cache_total", result="hit" if profile is not None else "miss")
+    if profile is None:
+        chunks, _ = plan_analysis(resume_text)
+        for event in _stream_analysis(
+            profile_key, build_analysis_prompt(resume_text), len(chunks) > 1,
+            finalize_analysis_result,
+            lambda: get_resume_profile(resume_text)
+        ):
+            if event[0] == "result":
+                profile = event[2]
+            elif event[1] in PROFILE_SECTIONS:
+                yield event
+        if profile.get("error"):
+            yield ("result", None, profile)
+            return
+    else:
+        for key in PROFILE_SECTIONS:
+            value = profile.get(key)
+            if isinstance(value, list):
+                for item in value:
+                    yield ("item", key, item)
+            elif value is not None:
+                yield ("field", key, value)
+
+    match_description = fit_job_description(job_description)
+    prompt = build_match_prompt(summarize_profile(profile, resume_text), match_description)
+    yield from _stream_analysis(
+        cache_key, prompt, False,
+        lambda match: combine_profile_and_match(
+            profile, validate_schema(match, ANALYSIS_SCHEMA)[0], resume_text, match_description
+        ),
+        lambda: analyze_resume(resume_text, job_description),
+        kind="match"
+    )
+
+def _stream_analysis(cache_key, prompt, chunked, finalize, fallback, kind="analysis"):
+    # Streams one prompt as the single-flight leader for cache_key; finalize turns the
+    # parsed object into the cached result. Otherwise fallback() provides the result.
+    call, leader = _flights.begin(cache_key)
+    if chunked or not leader or not analyzer.cache.try_lease(cache_key):
+        # Map-reduce results are only available once every chunk is done, and an
+        # identical analysis already in flight is awaited rather than repeated
+        if leader:
+            _flights.finish(cache_key, call)
+        yield ("result", None, fallback())
+        return
+    increment("analysis_cache_total", result="miss")
+    renewing = analyzer.cache.keep_lease(cache_key)
+
+    parser = IncrementalJSONParser()
+    chunks = []
+    result = None
+    try:
+        try:
+            for chunk in analyzer._stream_groq_request(prompt, kind=kind):
+                chunks.append(chunk)
+                for event in parser.feed(chunk):
+                    yield event
+
+            # The incremental parser already holds the complete object unless the stream was cut short
+            result = parser.result if parser.finished else _parse_json_response("".join(chunks))
+        except TruncatedResponseError:
+            # Cut off by a learned output cap: ask again with the full cap instead of caching a partial answer.
+            # The truncation cleared what was learned for kind, so kind gets the full cap and records the usage.
+            result = _parse_json_response(analyzer._make_groq_request(prompt, validate=has_json, kind=kind))
+        if not result.get("error"):
+            result = finalize(result)
+            analyzer.cache.set(cache_key, result)
+    except Exception as e:
+        st.error(f"Analysis error: {str(e)}")
+        result = {"error": True, "message": str(e)}
+    finally:
+        # Also runs if the consumer abandons the stream; waiters then analyze themselves
+        renewing.set()
+        analyzer.cache.release_lease(cache_key)
+        _flights.finish(cache_key, call, result)
+    yield ("result", None, result)
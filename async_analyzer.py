@@ -0,0 +1,251 @@
+import copy
+import time
+import asyncio
+from groq import AsyncGroq
+from analyzer import (SYSTEM_PROMPT, PROMPT_VERSION, build_analysis_prompt, plan_analysis,
+                      parse_analysis_response, finalize_analysis_result, build_match_prompt, summarize_profile,
+                      parse_match_response, combine_profile_and_match)
+from chunking import count_tokens, merge_analysis_results, fit_job_description
+from cache import AnalysisCache, make_cache_key
+from groq_client import get_governor, get_completion_budget
+from metrics import record_token_usage
+from routing import get_router
+
+# Groq limits for llama3-8b-8192 on the default tier
+DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_TOKENS_PER_MINUTE = 30000
+# Expected completion size used to reserve tokens before the real usage is known
+ESTIMATED_COMPLETION_TOKENS = 1000
+
+def estimate_tokens(text):
+    """Token estimate used for rate budgeting (see chunking.count_tokens)."""
+    return max(1, count_tokens(text))
+
+class TokenBucket:
+    """Token bucket that refills continuously up to capacity every period seconds"""
+
+    def __init__(self, capacity, period=60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount=1):
+        """Wait until amount tokens are available and take them (FIFO across coroutines)."""
+        amount = min(float(amount), self.capacity)
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def refund(self, amount):
+        """Return unused tokens (e.g. when actual usage was below the estimate)."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def available(self):
+        self._refill()
+        return self.tokens
+
+class RateLimiter:
+    """Shared requests/min and tokens/min budget for all coroutines on one loop"""
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    async def acquire(self, estimated_tokens):
+        await self.requests.acquire(1)
+        await self.tokens.acquire(estimated_tokens)
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """Correct the token bucket once the real usage of a request is known."""
+        if actual_tokens is not None and actual_tokens < estimated_tokens:
+            self.tokens.refund(estimated_tokens - actual_tokens)
+
+class AsyncSmartAnalyzer:
+    """
+    Asyncio counterpart of SmartAnalyzer.
+
+    Multiplexes many in-flight Groq requests on one event loop while a shared
+    token-bucket limiter keeps them within the requests/min and tokens/min quota.
+    Results use the same schema, cache and pipeline as analyzer.analyze_resume:
+    a job-specific analysis reuses the resume's cached profile and only sends
+    its summary with the job description.
+    """
+
+    def __init__(self, api_key, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE, max_concurrency=16, cache=None):
+        self.client = AsyncGroq(api_key=api_key)
+        self.router = get_router()
+        # Cache keys use the preferred model; each request may fall back to another (see _make_groq_request)
+        self.model = self.router.primary("analysis")
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        # Cross-process window shared with the Streamlit app and resume generation
+        self.governor = get_governor()
+        self.completion_budget = get_completion_budget()
+        self.max_concurrency = max_concurrency
+        self.cache = cache if cache is not None else AnalysisCache()
+        # Identical analyses in flight on this loop, keyed by cache key
+        self.inflight = {}
+
+    def _get_cache_key(self, resume_text, job_description=""):
+        return make_cache_key(resume_text, job_description, PROMPT_VERSION, self.model)
+
+    async def _make_groq_request(self, prompt, max_retries=3, kind="analysis"):
+        estimated_tokens = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prompt) + ESTIMATED_COMPLETION_TOKENS
+        for attempt in range(max_retries):
+            max_tokens = self.completion_budget.max_tokens(kind)
+            await self.limiter.acquire(estimated_tokens)
+            await asyncio.get_running_loop().run_in_executor(None, self.governor.acquire, "async_analysis")
+            # Routed and circuit-broken like the sync engine, but not hedged: a hedge would
+            # spend a second request from the same per-minute budget the batch is paced by
+            model = self.router.select("analysis")
+            request_start = time.perf_counter()
+            try:
+                chat_completion = await self.client.chat.completions.create(
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    model=model,
+                    temperature=0.3,
+                    max_tokens=max_tokens,
+                    top_p=0.9,
+                    stream=False
+                )
+                self.router.record_success(model, time.perf_counter() - request_start)
+                usage = getattr(chat_completion, "usage", None)
+                self.limiter.record_usage(estimated_tokens, getattr(usage, "total_tokens", None))
+                _, completion_tokens = record_token_usage(usage, "async_analysis")
+                choice = chat_completion.choices[0]
+                truncated = choice.finish_reason == "length"
+                self.completion_budget.record(kind, completion_tokens, truncated)
+                if truncated and max_tokens < self.completion_budget.ceiling and attempt < max_retries - 1:
+                    # Cut off by a learned cap: the next attempt reserves the full cap
+                    kind = None
+                    continue
+                return choice.message.content
+            except Exception as e:
+                self.router.record_failure(model, e)
+                error_msg = str(e).lower()
+                if attempt == max_retries - 1:
+                    raise
+                if "rate limit" in error_msg or "quota" in error_msg:
+                    await asyncio.sleep(2 ** attempt)
+                else:
+                    await asyncio.sleep(1)
+
+    async def analyze_resume(self, resume_text, job_description=""):
+        """Analyze one resume; same result schema as analyzer.analyze_resume."""
+        cache_key = self._get_cache_key(resume_text, job_description)
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+
+        # Duplicates on this loop await the same task; other processes wait on the cache lease
+        task = self.inflight.get(cache_key)
+        if task is not None:
+            return copy.deepcopy(await asyncio.shield(task))
+        task = asyncio.ensure_future(self._analyze_once(resume_text, job_description, cache_key))
+        self.inflight[cache_key] = task
+        task.add_done_callback(lambda _: self.inflight.pop(cache_key, None))
+        return await asyncio.shield(task)
+
+    async def _analyze_once(self, resume_text, job_description, cache_key):
+        loop = asyncio.get_running_loop()
+        while not await loop.run_in_executor(None, self.cache.try_lease, cache_key):
+            result = await loop.run_in_executor(None, self.cache.wait_for, cache_key)
+            if result is not None:
+                return result
+        renewing = self.cache.keep_lease(cache_key)
+        try:
+            return self.cache.peek(cache_key) or await self._analyze_uncached(resume_text, job_description, cache_key)
+        finally:
+            renewing.set()
+            self.cache.release_lease(cache_key)
+
+    async def _analyze_uncached(self, resume_text, job_description, cache_key):
+        if job_description.strip():
+            # Same profile + match flow (and cache entries) as analyzer._run_analysis
+            profile = await self.analyze_resume(resume_text, "")
+            if profile.get("error"):
+                return profile
+            job_description = fit_job_description(job_description)
+            prompt = build_match_prompt(summarize_profile(profile, resume_text), job_description)
+            try:
+                match = parse_match_response(await self._make_groq_request(prompt, kind="match"))
+            except Exception as e:
+                return {"error": True, "message": str(e)}
+            if match.get("error"):
+                return match
+            result = combine_profile_and_match(profile, match, resume_text, job_description)
+            self.cache.set(cache_key, result)
+            return result
+
+        chunks, job_description = plan_analysis(resume_text, job_description)
+        if len(chunks) == 1:
+            result = await self._analyze_chunk(resume_text, job_description)
+        else:
+            partials = await asyncio.gather(*(
+                self._analyze_chunk(chunk, job_description, i + 1, len(chunks))
+                for i, chunk in enumerate(chunks)
+            ))
+            result = merge_analysis_results(partials, [count_tokens(c) for c in chunks], resume_text, job_description)
+            if not result.get("error"):
+                result = finalize_analysis_result(result, job_description)
+
+        if not result.get("error"):
+            self.cache.set(cache_key, result)
+        return result
+
+    async def _analyze_chunk(self, resume_text, job_description, part=None, total_parts=None):
+        prompt = build_analysis_prompt(resume_text, job_description, part, total_parts)
+        kind = "analysis_part" if part else "analysis"
+        try:
+            response_text = await self._make_groq_request(prompt, kind=kind)
+        except Exception as e:
+            return {"error": True, "message": str(e)}
+        return parse_analysis_response(response_text, job_description)
+
+    async def analyze_many(self, items, job_description=""):
+        """
+        Analyze many resumes concurrently.
+
+        Args:
+            items (list): Resume texts, or (resume_text, job_description) tuples
+            job_description (str): Job description used for plain resume texts
+
+        Returns:
+            list: Analysis results in the same order as items
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(item):
+            if isinstance(item, (tuple, list)):
+                resume_text, item_job_description = item
+            else:
+                resume_text, item_job_description = item, job_description
+            async with semaphore:
+                return await self.analyze_resume(resume_text, item_job_description)
+
+        return await asyncio.gather(*(run(item) for item in items))
+
+def analyze_many(api_key, items, job_description="", **kwargs):
+    """Synchronous entry point: run AsyncSmartAnalyzer.analyze_many on a fresh event loop."""
+    async def run():
+        engine = AsyncSmartAnalyzer(api_key, **kwargs)
+        try:
+            return await engine.analyze_many(items, job_description)
+        finally:
+            await engine.client.close()
+    return asyncio.run(run())
@@ -0,0 +1,206 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import analyzer
+from analyzer import analyze_resume, initialize_analyzer
+from extractor import extract_text_from_file, find_resumes
+from keyword_match import match_keywords, get_skill_matcher
+from packing import analyze_resumes_packed
+from groq_client import load_environment
+from metrics import percentile
+
+def prepare_file(file_path, job_description="", prescreen_threshold=None):
+    """
+    Extract a resume and prescreen it against the job description.
+
+    With a job description, the resume is first scored locally against the
+    job's skills; resumes scoring below prescreen_threshold are not sent to
+    the model. If the job description names no known skill there is no
+    score, and the resume is not screened out.
+
+    Returns:
+        tuple: (record, resume_text) where resume_text is None if the resume
+            failed or was screened out (record["status"] says which)
+    """
+    record = {"file": file_path}
+    try:
+        resume_text = extract_text_from_file(file_path)
+        if not resume_text:
+            record["status"] = "error"
+            record["error"] = "Failed to extract text"
+            return record, None
+        if job_description.strip():
+            # Milliseconds locally, versus a full API round trip
+            record["prescreen"] = match_keywords(resume_text, job_description)
+        score = record.get("prescreen", {}).get("score")
+        if prescreen_threshold is not None and score is not None and score < prescreen_threshold:
+            record["status"] = "screened_out"
+            return record, None
+        return record, resume_text
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e)
+        return record, None
+
+def record_analysis(record, result):
+    """Store an analysis result (or its error) in a batch record."""
+    if result.get("error"):
+        record["status"] = "error"
+        record["error"] = result.get("message", "Unknown error")
+    else:
+        record["status"] = "ok"
+    # Plain dict so the record can be written as a JSON line
+    record["analysis"] = dict(result)
+
+def analyze_file(file_path, job_description="", prescreen_threshold=None):
+    """
+    Extract and analyze a single resume file.
+
+    Args:
+        file_path (str): Path to the resume
+        job_description (str): Optional job description for targeted analysis
+        prescreen_threshold (float, optional): Minimum local match score (0-10) for the LLM pass
+
+    Returns:
+        dict: Record with the file path, status, latency and analysis result
+    """
+    start = time.perf_counter()
+    record, resume_text = prepare_file(file_path, job_description, prescreen_threshold)
+    if resume_text is not None:
+        try:
+            record_analysis(record, analyze_resume(resume_text, job_description))
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = str(e)
+    record["latency_seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+def analyze_files_packed(file_paths, job_description="", prescreen_threshold=None, pack_size=4):
+    """
+    Extract a group of resumes and analyze them together in packed requests.
+
+    Returns:
+        list: One record per file (see analyze_file); latency is the group's
+    """
+    start = time.perf_counter()
+    prepared = [prepare_file(path, job_description, prescreen_threshold) for path in file_paths]
+    to_analyze = [(record, text) for record, text in prepared if text is not None]
+    try:
+        results = analyze_resumes_packed([text for _, text in to_analyze], job_description, max_pack=pack_size)
+    except Exception as e:
+        results = [{"error": True, "message": str(e)}] * len(to_analyze)
+    for (record, _), result in zip(to_analyze, results):
+        record_analysis(record, result)
+    latency = round(time.perf_counter() - start, 4)
+    records = [record for record, _ in prepared]
+    for record in records:
+        record["latency_seconds"] = latency
+    return records
+
+def run_batch(file_paths, output_path, job_description="", workers=4, prescreen_threshold=None, pack_size=1):
+    """
+    Analyze resumes with a bounded worker pool, streaming results to JSONL.
+
+    All workers go through the global SmartAnalyzer, so they share a single
+    requests-per-minute budget. With pack_size > 1, each worker analyzes a
+    group of resumes in packed requests, so the same budget covers up to
+    pack_size times as many resumes.
+
+    Args:
+        file_paths (list): Resume files to analyze
+        output_path (str): JSONL file that receives one record per resume as it finishes
+        job_description (str): Optional job description used for every resume
+        workers (int): Maximum number of concurrent analyses
+        prescreen_threshold (float, optional): Skip the LLM for resumes whose local
+            keyword match score is below this value
+        pack_size (int): Resumes analyzed per request (1 disables packing)
+
+    Returns:
+        dict: Summary with counts, throughput and latency percentiles
+    """
+    if prescreen_threshold is not None and not get_skill_matcher().count_skills(job_description):
+        # Every resume would score 0 and be dropped without a single API call
+        print("Warning: the job description names no known skills; prescreening is disabled", file=sys.stderr)
+        prescreen_threshold = None
+    latencies = []
+    succeeded = 0
+    screened_out = 0
+    start = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=workers) as executor:
+        if pack_size > 1:
+            futures = [
+                executor.submit(analyze_files_packed, file_paths[i:i + pack_size], job_description,
+                                prescreen_threshold, pack_size)
+                for i in range(0, len(file_paths), pack_size)
+            ]
+        else:
+            futures = [
+                executor.submit(lambda path: [analyze_file(path, job_description, prescreen_threshold)], path)
+                for path in file_paths
+            ]
+        for future in as_completed(futures):
+            for record in future.result():
+                latencies.append(record["latency_seconds"])
+                if record["status"] == "ok":
+                    succeeded += 1
+                elif record["status"] == "screened_out":
+                    screened_out += 1
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                print(f"[{len(latencies)}/{len(file_paths)}] {record['status']}: {record['file']}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+    return {
+        "total": len(file_paths),
+        "succeeded": succeeded,
+        "screened_out": screened_out,
+        "failed": len(file_paths) - succeeded - screened_out,
+        "elapsed_seconds": round(elapsed, 2),
+        "docs_per_second": round(len(file_paths) / elapsed, 3) if elapsed > 0 else 0.0,
+        "p50_latency_seconds": percentile(latencies, 50),
+        "p95_latency_seconds": percentile(latencies, 95),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a folder of resumes without the Streamlit UI")
+    parser.add_argument("directory", nargs="?", default="resumes", help="Folder containing PDF/DOCX/TXT resumes")
+    parser.add_argument("-o", "--output", default="analysis_results.jsonl", help="JSONL file to write results to")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Number of concurrent analyses")
+    parser.add_argument("-j", "--job-description", help="Path to a text file with a job description")
+    parser.add_argument("--prescreen", type=float, metavar="MIN_SCORE",
+                        help="With -j, only send resumes whose local keyword match score (0-10) is at least MIN_SCORE to the model")
+    parser.add_argument("--pack", type=int, default=1, metavar="N",
+                        help="Analyze up to N short resumes per request (multiplies resumes per minute)")
+    parser.add_argument("--requests-per-minute", type=int, help="Override the Groq request budget")
+    args = parser.parse_args(argv)
+
+    load_environment()
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        parser.error("GROQ_API_KEY is not set (environment or .env file)")
+
+    job_description = ""
+    if args.job_description:
+        with open(args.job_description, "r", encoding="utf-8") as f:
+            job_description = f.read()
+
+    if args.prescreen is not None and not job_description.strip():
+        parser.error("--prescreen requires a job description (-j)")
+
+    file_paths = find_resumes(args.directory)
+    if not file_paths:
+        parser.error(f"No PDF, DOCX or TXT files found in {args.directory}")
+
+    initialize_analyzer(api_key)
+    if args.requests_per_minute:
+        analyzer.analyzer.requests_per_minute = args.requests_per_minute
+
+    summary = run_batch(file_paths, args.output, job_description, max(1, args.workers), args.prescreen, max(1, args.pack))
+    summary["cache"] = analyzer.analyzer.cache.stats()
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["failed"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
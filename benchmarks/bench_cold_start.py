@@ -0,0 +1,90 @@
+"""
+Measure cold-start import time of the app and worker entry points.
+
+Each module is imported in a fresh interpreter with `python -X importtime`,
+and the median cumulative import time is reported over several runs. The
+heavy backends loaded along the way (Groq SDK, PyMuPDF, pdfplumber,
+python-docx, fpdf, dotenv) are listed too. Streamlit is measured on its own
+so the app's share of startup can be tracked as one number (fastest import
+of main minus fastest import of streamlit), checked against --budget-ms.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs 5] [--output cold_start.json] [--budget-ms 150]
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+import statistics
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ("streamlit", "main", "jobs", "analyzer", "extractor", "pdf_generator", "batch")
+# Backends that should only be imported when a request needs them
+HEAVY_MODULES = ("groq", "fitz", "pdfplumber", "docx", "fpdf", "dotenv")
+
+def import_profile(module):
+    """
+    Import module in a fresh interpreter.
+
+    Returns:
+        tuple: (cumulative import time of module in ms, set of all imported module names)
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+    total_us = None
+    loaded = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        name = name.strip()
+        loaded.add(name)
+        if name == module:
+            total_us = int(cumulative)
+    return (total_us or 0) / 1000, loaded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=list(DEFAULT_MODULES))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--budget-ms", type=float, help="Fail if the app's own import time (main - streamlit) exceeds this")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'module':<16} {'median_ms':>10} {'min_ms':>10}  heavy backends loaded")
+    for module in args.modules:
+        times = []
+        loaded = set()
+        for _ in range(args.runs):
+            elapsed, loaded = import_profile(module)
+            times.append(elapsed)
+        heavy = sorted(name for name in HEAVY_MODULES if name in loaded)
+        results[module] = {"median_ms": round(statistics.median(times), 1), "min_ms": round(min(times), 1),
+                           "heavy_modules": heavy}
+        print(f"{module:<16} {results[module]['median_ms']:>10.1f} {results[module]['min_ms']:>10.1f}  {', '.join(heavy) or '-'}")
+
+    report = {"runs": args.runs, "modules": results}
+    if "main" in results and "streamlit" in results:
+        # Fastest runs, since Streamlit's own import time varies by ~100 ms between runs
+        report["app_import_ms"] = round(results["main"]["min_ms"] - results["streamlit"]["min_ms"], 1)
+        print(f"App import time on top of Streamlit: {report['app_import_ms']:.1f} ms")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.budget_ms is not None and report.get("app_import_ms", 0) > args.budget_ms:
+        print(f"Over the {args.budget_ms:.0f} ms cold-start budget", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
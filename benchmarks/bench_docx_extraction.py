@@ -0,0 +1,135 @@
+"""
+Benchmark DOCX text extraction on large synthetic resumes.
+
+Compares the previous python-docx reader (joining document.paragraphs) with
+the streaming XML reader in extractor.py for speed, peak memory and
+coverage. Each document has a header, and every page carries a skills
+table; the coverage columns show whether the header and table text made it
+into the output. Peak memory is the growth of the process's maximum
+resident set size while extracting, measured in a fresh interpreter per run
+(tracemalloc does not see lxml's allocations). Large documents are
+built by repeating one python-docx page, so the zip stays small while
+word/document.xml grows.
+
+Usage:
+    python benchmarks/bench_docx_extraction.py [--pages 10 100 1000] [--repeat 3]
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import zipfile
+import tempfile
+import resource
+import subprocess
+import docx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+import extractor  # noqa: E402
+from fixtures import resume_text  # noqa: E402
+
+HEADER_MARKER = "Jane Doe - Senior Backend Engineer"
+TABLE_MARKER = "Pulumi, Ansible, Nomad"
+
+def make_large_docx(path, pages):
+    # One page is built with python-docx and its body repeated, since adding
+    # thousands of paragraphs and tables through python-docx takes minutes
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = HEADER_MARKER
+    for line in resume_text(1).splitlines():
+        document.add_paragraph(line)
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Languages"
+    table.cell(0, 1).text = "Python, Go, SQL"
+    table.cell(1, 0).text = "Infrastructure"
+    table.cell(1, 1).text = TABLE_MARKER
+    page = io.BytesIO()
+    document.save(page)
+
+    with zipfile.ZipFile(page) as source, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+        for name in source.namelist():
+            data = source.read(name)
+            if name == "word/document.xml":
+                xml = data.decode("utf-8")
+                start = xml.index("<w:body>") + len("<w:body>")
+                end = xml.index("<w:sectPr")
+                data = (xml[:start] + xml[start:end] * pages + xml[end:]).encode("utf-8")
+            target.writestr(name, data)
+
+def legacy_extract(path):
+    # Previous implementation: the full python-docx object model, paragraphs only
+    return "\n".join([p.text for p in docx.Document(path).paragraphs])
+
+METHODS = {"python-docx": legacy_extract, "streaming": extractor._docx_text}
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def peak_rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    # ru_maxrss may still hold the parent's peak from before exec
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def reset_peak_rss():
+    # Linux resets VmHWM to the current RSS when "5" is written to clear_refs
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def peak_memory_mb(method, path):
+    """Growth in peak RSS while extracting path once, in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", method, path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)["peak_mb"]
+
+def child(method, path):
+    # Both backends are imported before the baseline so only the extraction is counted
+    fn = METHODS[method]
+    reset_peak_rss()
+    before = peak_rss_kb()
+    fn(path)
+    after = peak_rss_kb()
+    print(json.dumps({"peak_mb": (after - before) / 1024}))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", nargs=2, metavar=("METHOD", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        child(*args.child)
+        return
+
+    print(f"{'pages':>6} {'xml_KB':>8} {'method':<12} {'best_s':>8} {'peak_MB':>8} {'header':>7} {'tables':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        for pages in args.pages:
+            path = os.path.join(directory, f"resume_{pages}p.docx")
+            make_large_docx(path, pages)
+            with zipfile.ZipFile(path) as archive:
+                size_kb = archive.getinfo("word/document.xml").file_size / 1024
+            for method, fn in METHODS.items():
+                text = fn(path)
+                best = timed(lambda: fn(path), args.repeat)
+                peak = peak_memory_mb(method, path)
+                print(f"{pages:>6} {size_kb:>8.0f} {method:<12} {best:>8.3f} {peak:>8.1f} "
+                      f"{'yes' if HEADER_MARKER in text else 'no':>7} {'yes' if TABLE_MARKER in text else 'no':>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Micro-benchmark JSON extraction over a corpus of raw model responses.
+
+Compares the previous regex fallback in extract_json_from_text with the
+single-pass scanner in json_parsing.py: how often each recovers the full
+analysis (rather than a fragment or nothing) and how long it takes.
+
+The built-in corpus reproduces the response shapes seen from the model
+(clean JSON, code fences, prose around the object, trailing commas and
+truncated output). Pass --corpus with a JSONL file of {"raw": "..."} lines
+to run against captured responses instead.
+
+Usage:
+    python benchmarks/bench_json_extraction.py [--corpus responses.jsonl] [--repeat 200]
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from json_parsing import extract_json_object, ANALYSIS_SCHEMA  # noqa: E402
+
+SAMPLE_ANALYSIS = {
+    "job_match_score": "7 out of 10",
+    "job_match_summary": "Strong backend experience; limited exposure to the required cloud stack.",
+    "strengths": [
+        {"category": "Technical Skills", "details": "Python, Django and PostgreSQL used across 5 years of production work."},
+        {"category": "Leadership", "details": "Led a team of four engineers through a platform migration."},
+    ],
+    "weaknesses": [
+        {"category": "Quantification", "details": "Most bullet points describe duties rather than measurable outcomes."},
+    ],
+    "improvement_suggestions": [
+        {"category": "Summary", "current": "Hard-working developer", "suggested_improvement": "Backend engineer with 5 years building APIs serving 2M users"},
+        {"category": "Skills", "current": "Listed as a paragraph", "suggested_improvement": "Group skills by {languages, frameworks, tools}"},
+    ],
+    "missing_keywords": [
+        {"keyword": "Kubernetes", "importance": "Listed as required in the job description"},
+        {"keyword": "CI/CD", "importance": "Mentioned three times in the posting"},
+    ],
+    "skills_to_develop": [{"skill": "AWS", "reason": "The team deploys exclusively on AWS"}],
+    "overall_score": "7 out of 10",
+    "summary_feedback": "A solid resume that needs more quantified achievements.",
+}
+
+def build_corpus():
+    text = json.dumps(SAMPLE_ANALYSIS, indent=2)
+    compact = json.dumps(SAMPLE_ANALYSIS)
+    return {
+        "clean": compact,
+        "indented": text,
+        "code_fence": f"```json\n{text}\n```",
+        "prose_around": f"Here is the analysis you asked for:\n\n{text}\n\nI hope this helps {{and good luck}}!",
+        "trailing_commas": text.replace('"\n    }', '",\n    }').replace("}\n  ]", "},\n  ]"),
+        "truncated_array": text[:text.index('"CI/CD"') + 20],
+        "truncated_string": text[:text.index("The team deploys") + 8],
+    }
+
+def legacy_extract(text):
+    # Previous implementation: json.loads, then the first non-greedy {...} match
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    for match in re.findall(r'({[\s\S]*?})', text):
+        try:
+            return json.loads(match)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+def is_full_analysis(result):
+    # The outer analysis object (possibly repaired), not an inner fragment
+    return isinstance(result, dict) and "strengths" in result
+
+def bench(fn, raw, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(raw)
+    return (time.perf_counter() - start) / repeat, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", help="JSONL file of captured responses ({\"raw\": ...} per line)")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        with open(args.corpus, "r", encoding="utf-8") as f:
+            corpus = {f"line_{i + 1}": json.loads(line)["raw"] for i, line in enumerate(f) if line.strip()}
+    else:
+        corpus = build_corpus()
+
+    methods = {
+        "legacy": legacy_extract,
+        "scanner": lambda raw: extract_json_object(raw, ANALYSIS_SCHEMA),
+    }
+    totals = {name: [0, 0.0] for name in methods}
+    print(f"{'case':<18} {'method':<8} {'us/call':>9} {'full':>5}")
+    for case, raw in corpus.items():
+        for name, fn in methods.items():
+            seconds, result = bench(fn, raw, args.repeat)
+            full = is_full_analysis(result)
+            totals[name][0] += full
+            totals[name][1] += seconds
+            print(f"{case:<18} {name:<8} {seconds * 1e6:>9.1f} {'yes' if full else 'no':>5}")
+    print()
+    for name, (full, seconds) in totals.items():
+        print(f"{name:<8} recovered {full}/{len(corpus)} full analyses, mean {seconds / len(corpus) * 1e6:.1f} us/call")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark text normalization on large resume text.
+
+Compares the previous sanitize_text (nine str.replace passes and a regex
+that deletes all non-ASCII) with normalization.to_latin1, and
+normalization.normalize_text with the same cleanup done as one
+replace/regex pass per rule.
+
+Usage:
+    python benchmarks/bench_normalization.py [--sizes 100000 1000000 10000000] [--repeat 5]
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import normalization  # noqa: E402
+
+SAMPLE = (
+    "Zoë Łukasiewicz — Senior Software Engineer\r\n"
+    "  Led a team of 8 engineers building distributed data pipe-\nlines in Python and Go.\r\n"
+    "• Reduced infrastructure cost by 35%   by migrating batch jobs to Kubernetes.\r\n"
+    "\r\n\r\n\r\n"
+    "▪ Designed REST and gRPC APIs serving 20k requests per second for “eﬃcient” workﬂows…\r\n"
+)
+
+def legacy_sanitize(text):
+    # Previous pdf_generator.sanitize_text
+    replacements = {
+        '–': '-', '—': '-', '‘': "'", '’': "'", '“': '"',
+        '”': '"', '•': '*', '…': '...', ' ': ' ',
+    }
+    for char, replacement in replacements.items():
+        text = text.replace(char, replacement)
+    return re.sub(r'[^\x00-\x7F]+', '', text)
+
+def multi_pass_normalize(text):
+    # The same rules as normalize_text, applied one pass at a time
+    text = text.replace("\r\n", "\n")
+    for char in normalization._INVISIBLE:
+        text = text.replace(char, "")
+    for char in normalization._BULLETS:
+        text = text.replace(char, "•")
+    for char in normalization._LINE_BREAKS:
+        text = text.replace(char, "\n")
+    for ligature, replacement in normalization._LIGATURES.items():
+        text = text.replace(ligature, replacement)
+    text = unicodedata.normalize("NFKC", text)
+    text = re.sub(r"[^\S\n]+", " ", text)
+    text = re.sub(r" ?\n ?", "\n", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = re.sub(r"(?<=[^\W\d_])-\n(?=[a-z])", "", text)
+    return text.strip()
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000],
+                        help="Text sizes in characters")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'chars':>10} {'method':<22} {'best_s':>9} {'MB/s':>8}")
+    for size in args.sizes:
+        text = (SAMPLE * (size // len(SAMPLE) + 1))[:size]
+        assert normalization.normalize_text(text) == multi_pass_normalize(text)
+        methods = {
+            "legacy_sanitize": lambda: legacy_sanitize(text),
+            "to_latin1": lambda: normalization.to_latin1(text),
+            "multi_pass_normalize": lambda: multi_pass_normalize(text),
+            "normalize_text": lambda: normalization.normalize_text(text),
+        }
+        for name, fn in methods.items():
+            best = timed(fn, args.repeat)
+            print(f"{size:>10} {name:<22} {best:>9.4f} {size / best / 1e6:>8.1f}")
+
+if __name__ == "__main__":
+    main()
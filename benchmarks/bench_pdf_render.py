@@ -0,0 +1,58 @@
+"""
+Benchmark improved-resume PDF rendering on synthetic 1-5 page resumes.
+
+Compares the previous FPDF path (sanitize_text + multi_cell per line) with
+the native renderer in pdf_render.py, and reports the one-off cost of
+parsing the fonts when the first PDF of a process is rendered.
+
+Usage:
+    python benchmarks/bench_pdf_render.py [--pages 1 2 3 4 5] [--repeat 20]
+"""
+import os
+import sys
+import time
+import argparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+import pdf_render  # noqa: E402
+from pdf_generator import render_pdf_fpdf, sanitize_text  # noqa: E402
+from fixtures import resume_text  # noqa: E402
+
+# Names that the FPDF path used to strip
+UNICODE_HEADER = "Zoë Łukasiewicz – Señor Ingeniero, São Paulo\n"
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 3, 4, 5])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    fonts = pdf_render.get_fonts()
+    print(f"font loading (once per process): {time.perf_counter() - start:.4f}s "
+          f"({', '.join(f'{style}={font.name}' for style, font in fonts.items())})")
+
+    print(f"{'pages':>6} {'method':<8} {'best_s':>9} {'pdfs/s':>9} {'bytes':>9}")
+    for pages in args.pages:
+        text = UNICODE_HEADER + resume_text(pages)
+        methods = {
+            "fpdf": lambda: render_pdf_fpdf(sanitize_text(text)),
+            "native": lambda: pdf_render.render_resume_pdf(text),
+        }
+        for name, fn in methods.items():
+            size = len(fn())
+            best = timed(fn, args.repeat)
+            print(f"{pages:>6} {name:<8} {best:>9.4f} {1 / best:>9.1f} {size:>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Before/after token report for the prompt templates on a fixed resume corpus.
+
+Part 1 counts the prompt tokens (system + user message) of every kind of
+Groq call with the previous indented, example-schema prompts (kept below,
+verbatim) and with the compact templates in prompts.py, both for the
+template alone and per call on the corpus.
+
+Part 2 runs general and job-specific analyses of the corpus against the
+local fake Groq server and reports the output caps learned from the
+observed completion lengths, i.e. the tokens each call reserves
+(prompt + max_tokens) compared with the previous fixed max_tokens=4000.
+The fake server's answers are fixed-size, so the learned caps only show
+the mechanism; real caps follow the real answer lengths.
+
+Usage:
+    python benchmarks/bench_prompt_tokens.py [--resumes 30] [--output prompt_tokens.json]
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+from chunking import count_tokens, MAX_COMPLETION_TOKENS  # noqa: E402
+from fixtures import resume_text, JOB_DESCRIPTION  # noqa: E402
+from bench_json_extraction import SAMPLE_ANALYSIS  # noqa: E402
+
+LEGACY_SYSTEM_PROMPT = "You are an expert resume analyzer and career coach. Always respond with valid JSON only, no additional text or formatting."
+LEGACY_REWRITE_SYSTEM_PROMPT = "You are an expert resume writer. Always respond with only the improved resume text, no additional text or formatting."
+
+def legacy_analysis_prompt(resume_text, job_description=""):
+    if job_description.strip():
+        return f"""
+        You are an expert resume analyzer and career coach. Analyze the following resume against the provided job description and provide detailed, constructive feedback.
+
+
+        RESUME:
+        {resume_text}
+
+        JOB DESCRIPTION:
+        {job_description}
+
+        Provide your analysis in this exact JSON structure:
+        {{
+            "job_match_score": "8 out of 10",
+            "job_match_summary": "Brief explanation",
+            "strengths": [{{"category": "Category", "details": "Details"}}],
+            "weaknesses": [{{"category": "Category", "details": "Details"}}],
+            "improvement_suggestions": [{{"category": "Category", "current": "Current", "suggested_improvement": "Improvement"}}],
+            "missing_keywords": [{{"keyword": "Keyword", "importance": "Why it's important"}}],
+            "skills_to_develop": [{{"skill": "Skill", "reason": "Why develop it"}}],
+            "overall_score": "7 out of 10",
+            "summary_feedback": "Summary"
+        }}
+
+        Only return valid JSON.
+        """
+    return f"""
+        You are an expert resume analyzer and career coach. Analyze the following resume and provide detailed, constructive feedback.
+
+
+        RESUME:
+        {resume_text}
+
+        Provide your analysis in this exact JSON structure:
+        {{
+            "strengths": [{{"category": "Category", "details": "Details"}}],
+            "weaknesses": [{{"category": "Category", "details": "Details"}}],
+            "improvement_suggestions": [{{"category": "Category", "current": "Current", "suggested_improvement": "Improvement"}}],
+            "job_recommendations": [{{"title": "Job", "match_reason": "Reason", "required_skills": ["Skill1", "Skill2"]}}],
+            "skills_to_develop": [{{"skill": "Skill", "reason": "Why"}}],
+            "overall_score": "7 out of 10",
+            "summary_feedback": "Summary",
+            "profile": {{
+                "headline": "Current role and seniority",
+                "years_experience": "6",
+                "skills": ["Skill1", "Skill2"],
+                "experience": ["Title, Company (years): key achievements with numbers"],
+                "education": ["Degree, Institution"],
+                "certifications": ["Certification"]
+            }}
+        }}
+
+        Only return valid JSON.
+        """
+
+def legacy_match_prompt(profile_summary, job_description):
+    return f"""
+        You are an expert resume analyzer and career coach. Compare the candidate profile below, extracted from the candidate's full resume, with the job description and provide detailed, constructive feedback.
+
+        CANDIDATE PROFILE:
+        {profile_summary}
+
+        JOB DESCRIPTION:
+        {job_description}
+
+        Provide your analysis in this exact JSON structure:
+        {{
+            "job_match_score": "8 out of 10",
+            "job_match_summary": "Brief explanation",
+            "improvement_suggestions": [{{"category": "Category", "current": "Current", "suggested_improvement": "Improvement"}}],
+            "missing_keywords": [{{"keyword": "Keyword", "importance": "Why it's important"}}],
+            "skills_to_develop": [{{"skill": "Skill", "reason": "Why develop it"}}],
+            "summary_feedback": "Summary"
+        }}
+
+        Only return valid JSON.
+        """
+
+def legacy_packed_analysis_prompt(resume_texts):
+    resumes = "\n\n".join(f"RESUME {i}:\n{text}" for i, text in enumerate(resume_texts, 1))
+    return f"""
+        You are an expert resume analyzer and career coach. Analyze each of the following resumes on its own and provide detailed, constructive feedback for each.
+
+        {resumes}
+
+        Return a JSON object with a "results" array of {len(resume_texts)} entries, one per resume in the order given, each in this exact structure:
+        {{"results": [{{
+            "index": 1,
+            "strengths": [{{"category": "Category", "details": "Details"}}],
+            "weaknesses": [{{"category": "Category", "details": "Details"}}],
+            "improvement_suggestions": [{{"category": "Category", "current": "Current", "suggested_improvement": "Improvement"}}],
+            "job_recommendations": [{{"title": "Job", "match_reason": "Reason", "required_skills": ["Skill1", "Skill2"]}}],
+            "skills_to_develop": [{{"skill": "Skill", "reason": "Why"}}],
+            "overall_score": "7 out of 10",
+            "summary_feedback": "Summary",
+            "profile": {{"headline": "Current role and seniority", "years_experience": "6", "skills": ["Skill1"], "experience": ["Title, Company (years): key achievements"], "education": ["Degree, Institution"], "certifications": ["Certification"]}}
+        }}]}}
+
+        Only return valid JSON.
+        """
+
+def legacy_rewrite_prompt(resume_text, suggestions, job_description):
+    formatted_suggestions = "".join(
+        f"- {s['category']}:\n  Current: {s['current']}\n  Suggested: {s['suggested_improvement']}\n\n" for s in suggestions
+    )
+    return f"""
+        You are an expert resume writer. Rewrite the following resume by implementing these specific improvements:
+
+JOB DESCRIPTION:
+{job_description}
+        ORIGINAL RESUME:
+        {resume_text}
+        IMPROVEMENTS TO IMPLEMENT:
+        {formatted_suggestions}
+        Please rewrite the entire resume with these improvements while maintaining the same core information.
+        Structure the resume in standard sections: Contact Information, Summary, Experience, Education, Skills.
+        Use bullet points for accomplishments and make them quantifiable where possible.
+        Focus on clarity, conciseness, and professional formatting.
+        Return ONLY the improved resume text with section headers, no additional explanations.
+        Keep names, places and other proper nouns exactly as written in the original, including accented letters.
+        """
+
+def corpus(count):
+    """Distinct one- and two-page resumes (distinct so nothing is served from the cache)."""
+    return [resume_text(1 + i % 2) + f"\nReference: candidate {i + 1}\n" for i in range(count)]
+
+def compare_prompts(resumes):
+    from analyzer import build_analysis_prompt, build_match_prompt, summarize_profile
+    from packing import build_packed_analysis_prompt
+    from pdf_generator import build_rewrite_prompt
+    from prompts import SYSTEM_PROMPT, REWRITE_SYSTEM_PROMPT
+    from result_model import AnalysisResult
+
+    profile = AnalysisResult.from_dict(dict(SAMPLE_ANALYSIS, profile={
+        "headline": "Senior backend engineer", "years_experience": "8",
+        "skills": ["Python", "Go", "Kubernetes"], "experience": ["Backend Engineer, Example Corp (2015-2023)"],
+    }))
+    suggestions = SAMPLE_ANALYSIS["improvement_suggestions"]
+    new_suggestions = "".join(
+        f"- {s['category']}\n  Current: {s['current']}\n  Suggested: {s['suggested_improvement']}\n" for s in suggestions
+    )
+    kinds = {
+        "analysis": lambda r: (
+            (LEGACY_SYSTEM_PROMPT, legacy_analysis_prompt(r)), (SYSTEM_PROMPT, build_analysis_prompt(r))),
+        "job_analysis": lambda r: (
+            (LEGACY_SYSTEM_PROMPT, legacy_analysis_prompt(r, JOB_DESCRIPTION)),
+            (SYSTEM_PROMPT, build_analysis_prompt(r, JOB_DESCRIPTION))),
+        "match": lambda r: (
+            (LEGACY_SYSTEM_PROMPT, legacy_match_prompt(summarize_profile(profile, r), JOB_DESCRIPTION)),
+            (SYSTEM_PROMPT, build_match_prompt(summarize_profile(profile, r), JOB_DESCRIPTION))),
+        "packed_analysis[x4]": lambda r: (
+            (LEGACY_SYSTEM_PROMPT, legacy_packed_analysis_prompt([r] * 4)),
+            (SYSTEM_PROMPT, build_packed_analysis_prompt([r] * 4))),
+        "rewrite": lambda r: (
+            (LEGACY_REWRITE_SYSTEM_PROMPT, legacy_rewrite_prompt(r, suggestions, JOB_DESCRIPTION)),
+            (REWRITE_SYSTEM_PROMPT, build_rewrite_prompt(r, new_suggestions, f"\nJOB DESCRIPTION:\n{JOB_DESCRIPTION}"))),
+    }
+    report = {}
+    print(f"{'prompt':<22} {'overhead':>17} {'per call':>17} {'saved':>7}")
+    for kind, build in kinds.items():
+        # Overhead: the prompt around an empty resume (the resume itself is sent unchanged)
+        overhead = [sum(count_tokens(text) for text in messages) for messages in build("")]
+        totals = [0, 0]
+        for resume in resumes:
+            for i, messages in enumerate(build(resume)):
+                totals[i] += sum(count_tokens(text) for text in messages)
+        before, after = (total / len(resumes) for total in totals)
+        report[kind] = {"overhead_before": overhead[0], "overhead_after": overhead[1],
+                        "before": round(before, 1), "after": round(after, 1),
+                        "saved_pct": round((1 - after / before) * 100, 1)}
+        print(f"{kind:<22} {overhead[0]:>7} -> {overhead[1]:>6} {before:>7.0f} -> {after:>6.0f} "
+              f"{report[kind]['saved_pct']:>6.1f}%")
+    return report
+
+def learn_caps(resumes):
+    from fake_groq_server import FakeGroqConfig, start_server
+    server, url = start_server(FakeGroqConfig(latency=0.0))
+    workdir = tempfile.mkdtemp(prefix="bench_prompt_tokens_")
+    os.environ.update(GROQ_BASE_URL=url, GROQ_API_KEY="benchmark", GROQ_REQUESTS_PER_MINUTE="1000000",
+                      ANALYSIS_CACHE_PATH=os.path.join(workdir, "cache.sqlite3"),
+                      RATE_LIMIT_DB_PATH=os.path.join(workdir, "rate_limit.sqlite3"))
+    from streamlit import logger
+    logger.set_log_level(logging.ERROR)
+    import analyzer
+    from groq_client import get_completion_budget
+    from metrics import get_registry
+
+    analyzer.initialize_analyzer("benchmark")
+    try:
+        for resume in resumes:
+            analyzer.analyze_resume(resume)
+            analyzer.analyze_resume(resume, JOB_DESCRIPTION)
+    finally:
+        server.shutdown()
+
+    caps = get_completion_budget().status()
+    sizes = {row["metric"]: row for row in get_registry().snapshot()["sizes"] if row["labels"] == "source=analysis"}
+    prompt_mean = sizes.get("groq_prompt_tokens", {}).get("mean", 0)
+    completion_p99 = sizes.get("groq_completion_tokens", {}).get("p99", 0)
+    print()
+    print(f"{'kind':<22} {'samples':>8} {'max_tokens':>11}  (was {MAX_COMPLETION_TOKENS})")
+    for kind, status in caps.items():
+        print(f"{kind:<22} {status['samples']:>8} {status['max_tokens']:>11}")
+    learned = max((status["max_tokens"] for status in caps.values()), default=MAX_COMPLETION_TOKENS)
+    before = prompt_mean + MAX_COMPLETION_TOKENS
+    after = prompt_mean + learned
+    print(f"Completion p99 {completion_p99} tokens; tokens reserved per analysis call "
+          f"{before:.0f} -> {after:.0f} ({(1 - after / before) * 100:.0f}% less)")
+    return {"caps": caps, "completion_p99": completion_p99, "reserved_before": round(before, 1),
+            "reserved_after": round(after, 1)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=30, help="Resumes in the corpus")
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    resumes = corpus(args.resumes)
+    report = {"resumes": len(resumes), "prompts": compare_prompts(resumes), "completion": learn_caps(resumes)}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
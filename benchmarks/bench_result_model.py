@@ -0,0 +1,73 @@
+"""
+Compare the typed AnalysisResult with the plain dict it replaces.
+
+Reports the memory held per cached result (tracemalloc over many copies),
+the size of the serialized payload, and serialize/deserialize throughput of
+AnalysisResult.dumps/loads (msgpack when installed, compact positional JSON
+otherwise) against json.dumps/json.loads of the dict. Deserialization is
+also measured including validation, since dict results were validated
+again on every cache hit by the display code.
+
+Usage:
+    python benchmarks/bench_result_model.py [--count 2000] [--repeat 5000]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from result_model import AnalysisResult, msgpack  # noqa: E402
+from bench_json_extraction import SAMPLE_ANALYSIS  # noqa: E402
+
+def memory_per_object(factory, count):
+    """Average bytes allocated per object for count objects built by factory()."""
+    tracemalloc.start()
+    objects = [factory() for _ in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current / count
+
+def throughput(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return repeat / (time.perf_counter() - start)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000, help="Results held in memory for the memory measurement")
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    sample = dict(SAMPLE_ANALYSIS, profile={"headline": "Backend engineer", "years_experience": "5",
+                                             "skills": ["Python", "Django", "PostgreSQL"]})
+    result = AnalysisResult.from_dict(sample)
+    json_payload = json.dumps(sample, ensure_ascii=False, separators=(",", ":"))
+    typed_payload = result.dumps()
+    assert AnalysisResult.loads(typed_payload).to_dict() == result.to_dict()
+
+    # Decoded from a payload, as cache hits are, so strings are not shared between copies
+    dict_memory = memory_per_object(lambda: json.loads(json_payload), args.count)
+    typed_memory = memory_per_object(lambda: AnalysisResult.loads(typed_payload), args.count)
+
+    rows = [
+        ("dict + json", len(json_payload.encode("utf-8")), dict_memory,
+         throughput(lambda: json.dumps(sample, ensure_ascii=False, separators=(",", ":")), args.repeat),
+         throughput(lambda: json.loads(json_payload), args.repeat),
+         throughput(lambda: AnalysisResult.from_dict(json.loads(json_payload)), args.repeat)),
+        (f"AnalysisResult ({'msgpack' if msgpack is not None else 'json'})", len(typed_payload), typed_memory,
+         throughput(result.dumps, args.repeat),
+         throughput(lambda: AnalysisResult.loads(typed_payload), args.repeat),
+         None),
+    ]
+    print(f"{'format':<26} {'payload_B':>9} {'memory_B':>9} {'dumps/s':>9} {'loads/s':>9} {'validated/s':>12}")
+    for name, size, memory, dumps_rate, loads_rate, validated_rate in rows:
+        validated_rate = validated_rate or loads_rate
+        print(f"{name:<26} {size:>9} {memory:>9.0f} {dumps_rate:>9.0f} {loads_rate:>9.0f} {validated_rate:>12.0f}")
+
+if __name__ == "__main__":
+    main()
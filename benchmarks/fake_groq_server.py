@@ -0,0 +1,217 @@
+"""
+Local stand-in for the Groq chat-completions API used by the benchmarks.
+
+Serves POST /openai/v1/chat/completions (streaming and non-streaming) with a
+canned analysis or rewritten resume, after a configurable latency. A share
+of responses can be turned into rate-limit errors (HTTP 429) or malformed
+JSON (code fences, trailing commas, truncation) to exercise the retry and
+repair paths, or delayed much longer (slow tail) to exercise hedging. Point the Groq SDK at it with GROQ_BASE_URL.
+
+Usage:
+    python benchmarks/fake_groq_server.py --port 8765 --latency 0.2 --rate-limit-rate 0.1
+    GROQ_BASE_URL=http://127.0.0.1:8765 GROQ_API_KEY=fake streamlit run main.py
+"""
+import os
+import sys
+import json
+import time
+import re
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_json_extraction import SAMPLE_ANALYSIS, build_corpus  # noqa: E402
+
+MALFORMED_SHAPES = ("code_fence", "prose_around", "trailing_commas", "truncated_array", "truncated_string")
+
+IMPROVED_RESUME = """CONTACT INFORMATION
+Jane Doe | jane.doe@example.com | (555) 010-0000
+
+SUMMARY
+Backend engineer with 5 years building APIs serving 2M users.
+
+EXPERIENCE
+- Led a team of four engineers through a platform migration, cutting hosting cost by 30%.
+- Built Python/Django services handling 20k requests per second.
+
+EDUCATION
+B.Sc. Computer Science, Example University
+
+SKILLS
+Python, Django, PostgreSQL, Docker, Kubernetes, AWS
+"""
+
+class FakeGroqConfig:
+    """Behaviour of the fake server; attributes can be changed while it runs"""
+
+    def __init__(self, latency=0.0, jitter=0.0, rate_limit_rate=0.0, malformed_rate=0.0, seed=0,
+                 slow_rate=0.0, slow_latency=2.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+        self.malformed = 0
+        self.slow = 0
+
+    def draw(self):
+        # One locked draw per request keeps runs reproducible for a given seed
+        with self.lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            rate_limited = self.random.random() < self.rate_limit_rate
+            malformed = not rate_limited and self.random.random() < self.malformed_rate
+            shape = self.random.choice(MALFORMED_SHAPES)
+            if self.random.random() < self.slow_rate:
+                delay += self.slow_latency
+                self.slow += 1
+            self.rate_limited += rate_limited
+            self.malformed += malformed
+        return delay, rate_limited, malformed and shape
+
+    def stats(self):
+        with self.lock:
+            return {"requests": self.requests, "rate_limited": self.rate_limited, "malformed": self.malformed,
+                    "slow": self.slow}
+
+def _estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+# Packed prompts ask for one entry per resume or job description
+_PACKED_RE = re.compile(r'"results" array of (\d+) entries')
+
+def build_content(messages, malformed_shape=None):
+    """Pick the response body for a request from its system and user prompts."""
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    if "resume writer" in system:
+        return IMPROVED_RESUME
+    if malformed_shape:
+        return build_corpus()[malformed_shape]
+    user = next((m.get("content", "") for m in messages if m.get("role") == "user"), "")
+    packed = _PACKED_RE.search(user)
+    if packed:
+        results = [dict(SAMPLE_ANALYSIS, index=i) for i in range(1, int(packed.group(1)) + 1)]
+        return json.dumps({"results": results}, indent=2)
+    return json.dumps(SAMPLE_ANALYSIS, indent=2)
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls on keep-alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        config = self.server.config
+        delay, rate_limited, malformed_shape = config.draw()
+        time.sleep(delay)
+
+        if rate_limited:
+            self._send_json(429, {"error": {
+                "message": "Rate limit reached for model on tokens per minute (TPM). Please try again in 0.1s.",
+                "type": "tokens", "code": "rate_limit_exceeded"
+            }}, {"retry-after": "0"})
+            return
+
+        content = build_content(request.get("messages", []), malformed_shape)
+        prompt_tokens = sum(_estimate_tokens(m.get("content", "")) for m in request.get("messages", []))
+        completion_tokens = _estimate_tokens(content)
+        finish_reason = "stop"
+        max_tokens = request.get("max_tokens")
+        if max_tokens and completion_tokens > max_tokens:
+            # Cut off at the output cap, like the real API
+            content = content[:max_tokens * 4]
+            completion_tokens = max_tokens
+            finish_reason = "length"
+        base = {
+            "id": f"chatcmpl-fake-{config.requests}",
+            "created": int(time.time()),
+            "model": request.get("model", "llama3-8b-8192"),
+            "system_fingerprint": "fake",
+        }
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+
+        if not request.get("stream"):
+            self._send_json(200, dict(base, object="chat.completion", usage=usage, choices=[{
+                "index": 0, "finish_reason": finish_reason, "message": {"role": "assistant", "content": content}
+            }]))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        step = 64
+        for i in range(0, len(content), step):
+            chunk = dict(base, object="chat.completion.chunk", choices=[{
+                "index": 0, "finish_reason": None, "delta": {"content": content[i:i + step]}
+            }])
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        final = dict(base, object="chat.completion.chunk", x_groq={"usage": usage},
+                     choices=[{"index": 0, "finish_reason": finish_reason, "delta": {}}])
+        self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+        self.wfile.flush()
+        self.close_connection = True
+
+def start_server(config=None, host="127.0.0.1", port=0):
+    """
+    Start the fake server on a background thread.
+
+    Returns:
+        tuple: (server, base_url); call server.shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.config = config or FakeGroqConfig()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local fake Groq chat-completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with HTTP 429")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of analyses returned as malformed JSON")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Share of requests delayed by --slow-latency")
+    parser.add_argument("--slow-latency", type=float, default=2.0, help="Extra seconds for slow requests")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = FakeGroqConfig(args.latency, args.jitter, args.rate_limit_rate, args.malformed_rate, args.seed,
+                            args.slow_rate, args.slow_latency)
+    server, base_url = start_server(config, args.host, args.port)
+    print(f"Fake Groq API listening on {base_url} (set GROQ_BASE_URL={base_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Synthetic resume fixtures (PDF, DOCX and TXT) for the benchmarks.
+
+Fixtures are generated on demand rather than checked in, so every format
+carries the same text at the requested length.
+"""
+import os
+import docx
+from bench_pdf_extraction import PAGE_TEXT, make_pdf
+
+HEADER = (
+    "Jane Doe\n"
+    "jane.doe@example.com | (555) 010-0000 | linkedin.com/in/janedoe\n\n"
+    "SUMMARY\n"
+    "Backend engineer with experience in Python, Go, Kubernetes and AWS.\n\n"
+    "EXPERIENCE\n"
+)
+FOOTER = (
+    "\nEDUCATION\n"
+    "B.Sc. Computer Science, Example University (2011 - 2015)\n\n"
+    "SKILLS\n"
+    "Python, Go, Django, PostgreSQL, Docker, Kubernetes, Terraform, AWS, Kafka\n"
+)
+
+JOB_DESCRIPTION = (
+    "We are hiring a senior backend engineer to build data pipelines in Python and Go. "
+    "You will run services on Kubernetes and AWS, manage infrastructure with Terraform, "
+    "and stream events through Kafka. Experience with PostgreSQL and CI/CD is required."
+)
+
+def resume_text(pages=1):
+    """Resume text roughly `pages` PDF pages long."""
+    return HEADER + PAGE_TEXT * pages + FOOTER
+
+def make_docx(path, text):
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    document.save(path)
+
+def make_fixtures(directory, pages=(1, 10)):
+    """
+    Write one PDF, DOCX and TXT resume per page count into directory.
+
+    Returns:
+        dict: Fixture name (e.g. "pdf_10p") -> file path
+    """
+    fixtures = {}
+    for count in pages:
+        text = resume_text(count)
+        pdf_path = os.path.join(directory, f"resume_{count}p.pdf")
+        make_pdf(pdf_path, count)
+        fixtures[f"pdf_{count}p"] = pdf_path
+
+        docx_path = os.path.join(directory, f"resume_{count}p.docx")
+        make_docx(docx_path, text)
+        fixtures[f"docx_{count}p"] = docx_path
+
+        txt_path = os.path.join(directory, f"resume_{count}p.txt")
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        fixtures[f"txt_{count}p"] = txt_path
+    return fixtures
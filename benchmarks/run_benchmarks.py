@@ -0,0 +1,259 @@
+"""
+End-to-end benchmark suite against a local fake Groq server.
+
+Measures latency (p50/p95), throughput and peak Python memory of text
+extraction, JSON extraction, resume analysis (sequential, concurrent and
+streaming) and improved-resume generation, without touching the real API.
+Results are written as a JSON report; pass --compare with an earlier report
+to flag regressions between versions.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output report.json
+    python benchmarks/run_benchmarks.py --latency 0.3 --rate-limit-rate 0.1 --malformed-rate 0.2
+    python benchmarks/run_benchmarks.py --compare baseline.json --threshold 0.2
+    python benchmarks/run_benchmarks.py --slow-rate 0.03 --no-hedging --output unhedged.json
+    python benchmarks/run_benchmarks.py --slow-rate 0.03 --compare unhedged.json
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+from metrics import percentile  # noqa: E402
+
+REPORT_VERSION = 1
+
+def measure(fn, iterations, concurrency=1, warmup=1):
+    """
+    Time fn(i) over iterations calls and trace the peak memory of one extra call.
+
+    Returns:
+        dict: iterations, errors, p50/p95/mean latency (ms), ops/sec and peak_memory_kb
+    """
+    for i in range(warmup):
+        fn(-1 - i)
+
+    latencies = []
+    errors = 0
+
+    def timed(i):
+        start = time.perf_counter()
+        try:
+            ok = fn(i)
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok is not False
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(timed, range(iterations)))
+    else:
+        outcomes = [timed(i) for i in range(iterations)]
+    elapsed = time.perf_counter() - start
+    for latency, ok in outcomes:
+        latencies.append(latency)
+        errors += not ok
+
+    # Memory is traced on a separate call so tracing overhead does not skew the timings
+    tracemalloc.start()
+    try:
+        fn(iterations)
+    except Exception:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "ops_per_second": round(iterations / elapsed, 3) if elapsed > 0 else 0.0,
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(args, tmp_dir):
+    # Isolate caches and the rate window from a developer's real ones, and point the SDK at the fake server
+    from fake_groq_server import FakeGroqConfig, start_server
+    config = FakeGroqConfig(args.latency, args.jitter, args.rate_limit_rate, args.malformed_rate, args.seed,
+                            args.slow_rate, args.slow_latency)
+    server, base_url = start_server(config)
+    os.environ["GROQ_BASE_URL"] = base_url
+    os.environ["GROQ_API_KEY"] = "fake-benchmark-key"
+    os.environ["ANALYSIS_CACHE_PATH"] = ":memory:"
+    os.environ["RATE_LIMIT_DB_PATH"] = os.path.join(tmp_dir, "rate_limit.sqlite3")
+    os.environ["GROQ_REQUESTS_PER_MINUTE"] = str(args.requests_per_minute)
+    os.environ.pop("EXTRACTION_CACHE_DIR", None)
+    os.environ["GROQ_HEDGING"] = "0" if args.no_hedging else "1"
+
+    import analyzer
+    import packing
+    import pdf_generator
+    from streamlit import config as streamlit_config, logger as streamlit_logger
+    # Streamlit warns about running outside `streamlit run` and the missing script context on st.* calls
+    streamlit_config.set_option("global.showWarningOnDirectExecution", False)
+    streamlit_logger.set_log_level(logging.ERROR)
+    from extractor import extract_text_from_file
+    from fixtures import make_fixtures, resume_text, JOB_DESCRIPTION
+    from bench_json_extraction import build_corpus
+
+    analyzer.initialize_analyzer(os.environ["GROQ_API_KEY"])
+    selected = set(args.only or [])
+    results = {}
+
+    def wanted(group):
+        return not selected or group in selected
+
+    def record(name, result):
+        results[name] = result
+        print(f"{name:<44} p50 {result['p50_ms']:>10.3f} ms  p95 {result['p95_ms']:>10.3f} ms  "
+              f"{result['ops_per_second']:>9.2f} ops/s  {result['peak_memory_kb']:>9.1f} KB  errors {result['errors']}",
+              file=sys.stderr)
+
+    if wanted("extraction"):
+        fixtures = make_fixtures(tmp_dir, args.pages)
+        for name, path in fixtures.items():
+            record(f"extract_text_from_file[{name}]",
+                   measure(lambda i, path=path: bool(extract_text_from_file(path)), args.iterations))
+
+    if wanted("json"):
+        for shape, raw in build_corpus().items():
+            record(f"extract_json_from_text[{shape}]",
+                   measure(lambda i, raw=raw: analyzer.extract_json_from_text(raw) is not None, args.iterations * 20))
+
+    def unique_resume(i):
+        # A distinct resume per call so every analysis misses the cache
+        return f"{resume_text(1)}\nReference: {uuid.uuid4().hex} {i}"
+
+    def analyze(i):
+        return not analyzer.analyze_resume(unique_resume(i), JOB_DESCRIPTION).get("error")
+
+    def analyze_stream(i):
+        events = list(analyzer.analyze_resume_stream(unique_resume(i), JOB_DESCRIPTION))
+        return not events[-1][2].get("error")
+
+    if wanted("analysis"):
+        record("analyze_resume", measure(analyze, args.iterations))
+        record("analyze_resume[concurrent]", measure(analyze, args.iterations * args.concurrency, args.concurrency))
+        record("analyze_resume_stream", measure(analyze_stream, args.iterations))
+        # Four resumes per call: two requests (profiles, then matches) instead of eight
+        record("analyze_resumes_packed[x4]", measure(
+            lambda i: not any(r.get("error") for r in packing.analyze_resumes_packed(
+                [unique_resume(f"{i}-{j}") for j in range(4)], JOB_DESCRIPTION
+            )),
+            args.iterations
+        ))
+        record("analyze_resume[long]", measure(
+            lambda i: not analyzer.analyze_resume(resume_text(12) + f"\n{uuid.uuid4().hex}", JOB_DESCRIPTION).get("error"),
+            max(1, args.iterations // 2)
+        ))
+
+    if wanted("generation"):
+        suggestions = [{"category": "Summary", "current": "Hard-working developer",
+                        "suggested_improvement": "Backend engineer with 5 years building APIs"}]
+        record("generate_improved_resume", measure(
+            lambda i: pdf_generator.generate_improved_resume(unique_resume(i), suggestions, JOB_DESCRIPTION) is not None,
+            args.iterations
+        ))
+
+    server.shutdown()
+    # Per-stage breakdown (rate-limit wait, Groq call, JSON parse, render...) from the app's own spans
+    from metrics import get_registry
+    return results, config.stats(), get_registry().snapshot()["stages"]
+
+def compare_reports(baseline, current, threshold):
+    """
+    Compare p50/p95 latency and peak memory of two reports.
+
+    Returns:
+        list: Regression descriptions (empty if none exceeds the threshold)
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms", "peak_memory_kb"):
+            before, after = previous.get(metric) or 0, result.get(metric) or 0
+            change = (after - before) / before if before else 0.0
+            marker = "REGRESSION" if change > threshold else ""
+            print(f"{name:<44} {metric:<15} {before:>12.3f} -> {after:>12.3f} ({change:+.1%}) {marker}")
+            if marker:
+                regressions.append(f"{name} {metric} {change:+.1%}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default="benchmark_report.json", help="Where to write the JSON report")
+    parser.add_argument("--compare", help="Earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown reported as a regression")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10], help="Fixture sizes in pages")
+    parser.add_argument("--only", nargs="+", choices=["extraction", "json", "analysis", "generation"])
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake server response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of fake responses that are HTTP 429")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of fake analyses with malformed JSON")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Share of fake responses in the slow tail")
+    parser.add_argument("--slow-latency", type=float, default=2.0, help="Extra seconds for slow fake responses")
+    parser.add_argument("--no-hedging", action="store_true", help="Disable hedged requests (baseline for --compare)")
+    parser.add_argument("--requests-per-minute", type=int, default=100000, help="Client-side rate limit during the run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results, server_stats, stages = run_suite(args, tmp_dir)
+
+    report = {
+        "version": REPORT_VERSION,
+        "metadata": {
+            "git_revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "fake_server": server_stats,
+        "results": results,
+        "stages": stages,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_reports(baseline, report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,430 @@
+import os
+import re
+import json
+import time
+import uuid
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from result_model import AnalysisResult
+
+# Local on-disk cache location (override with ANALYSIS_CACHE_PATH)
+DEFAULT_CACHE_PATH = os.path.join(".cache", "analysis_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+# How long an in-flight lease is honoured if its owner dies without releasing it
+DEFAULT_LEASE_SECONDS = 300
+# Share of the lease after which a live holder renews it (see AnalysisCache.keep_lease)
+LEASE_RENEW_FRACTION = 1 / 3
+# Extracted-text cache limits; the disk tier is enabled by EXTRACTION_CACHE_DIR
+DEFAULT_EXTRACTION_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_EXTRACTION_DISK_BYTES = 512 * 1024 * 1024
+
+_whitespace_re = re.compile(r"\s+")
+
+def normalize_for_key(text):
+    """Collapse whitespace so trivially different extractions share a key."""
+    return _whitespace_re.sub(" ", text or "").strip()
+
+def make_cache_key(resume_text, job_description, prompt_version, model):
+    """
+    Build a content-addressed cache key.
+
+    Args:
+        resume_text (str): Full resume text
+        job_description (str): Full job description (may be empty)
+        prompt_version (str): Version of the prompt template used
+        model (str): Model name used for the analysis
+
+    Returns:
+        str: SHA-256 hex digest over all parts
+    """
+    digest = hashlib.sha256()
+    for part in (normalize_for_key(resume_text), normalize_for_key(job_description), str(prompt_version), str(model)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+def encode_value(value):
+    """Serialize a cached value: analysis results in their compact binary form, anything else as JSON."""
+    if isinstance(value, AnalysisResult):
+        return value.dumps()
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+def decode_value(payload):
+    """
+    Inverse of encode_value (entries written before results were typed are JSON text).
+
+    Raises:
+        ValueError: The payload was written in a format this version cannot read
+    """
+    if isinstance(payload, bytes):
+        return AnalysisResult.loads(payload)
+    return json.loads(payload)
+
+ANALYSIS_CACHE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS analysis_cache (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_analysis_cache_access ON analysis_cache (last_access)",
+    """
+    CREATE TABLE IF NOT EXISTS inflight_leases (
+        key TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+]
+
+def open_database(path, schema, name):
+    """
+    Open a SQLite database shared between threads and processes.
+
+    File databases use WAL mode and wait up to 30 s for other writers. If the
+    file cannot be created or opened, an in-memory database is used instead
+    so the caller keeps working within this process.
+
+    Args:
+        path (str): Database file, or ":memory:"
+        schema (list): CREATE statements to run on the new connection
+        name (str): What the database is for, used in the fallback message
+
+    Returns:
+        tuple: (path actually opened, sqlite3.Connection)
+    """
+    def connect(path):
+        conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        for statement in schema:
+            conn.execute(statement)
+        return conn
+
+    try:
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return path, connect(path)
+    except (OSError, sqlite3.Error) as e:
+        print(f"{name} unavailable at {path}: {str(e)}")
+        return ":memory:", connect(":memory:")
+
+class AnalysisCache:
+    """SQLite-backed analysis cache with TTL and size-bounded LRU eviction"""
+
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES,
+                 ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.path = path or os.getenv("ANALYSIS_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        # Identifies this process's leases; unique across processes and restarts
+        self.owner = uuid.uuid4().hex
+        # Falls back to a process-local cache rather than failing the analysis
+        self.path, self.conn = open_database(self.path, ANALYSIS_CACHE_SCHEMA, "Analysis cache")
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss or expired entry."""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value, created_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self.conn.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE analysis_cache SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        try:
+            return decode_value(value)
+        except ValueError:
+            self._discard(key, value)
+            with self.lock:
+                self.hits -= 1
+                self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Store an AnalysisResult or JSON-serializable value and evict old entries if over budget."""
+        payload = encode_value(value)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        if self.ttl_seconds:
+            cursor = self.conn.execute("DELETE FROM analysis_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            self.evictions += max(cursor.rowcount, 0)
+        count, total_size = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analysis_cache"
+        ).fetchone()
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+        # Drop least recently used entries until both limits are satisfied
+        rows = self.conn.execute("SELECT key, size FROM analysis_cache ORDER BY last_access ASC").fetchall()
+        stale = []
+        for key, size in rows:
+            if count <= self.max_entries and total_size <= self.max_bytes:
+                break
+            stale.append((key,))
+            count -= 1
+            total_size -= size
+        self.conn.executemany("DELETE FROM analysis_cache WHERE key = ?", stale)
+        self.evictions += len(stale)
+
+    def peek(self, key):
+        """Like get(), but without updating hit/miss counters or access times."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value, created_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (self.ttl_seconds and time.time() - row[1] > self.ttl_seconds):
+            return None
+        try:
+            return decode_value(row[0])
+        except ValueError:
+            self._discard(key, row[0])
+            return None
+
+    def _discard(self, key, payload):
+        # An entry this version cannot read (an older result format, or msgpack data
+        # without msgpack installed) is treated as a miss and recomputed; the value
+        # is matched so an entry rewritten meanwhile survives
+        with self.lock:
+            self.conn.execute("DELETE FROM analysis_cache WHERE key = ? AND value = ?", (key, payload))
+
+    def try_lease(self, key, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        Claim the right to compute key, across every process sharing the cache file.
+
+        Returns:
+            bool: True if this process now holds the lease (expired leases are taken over)
+        """
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute("DELETE FROM inflight_leases WHERE key = ? AND expires_at < ?", (key, now))
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO inflight_leases (key, owner, expires_at) VALUES (?, ?, ?)",
+                    (key, self.owner, now + lease_seconds)
+                )
+                self.conn.execute("COMMIT")
+            except sqlite3.Error:
+                self.conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount == 1
+
+    def renew_lease(self, key, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Extend this process's lease on key; returns False if it no longer holds it."""
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE inflight_leases SET expires_at = ? WHERE key = ? AND owner = ?",
+                (time.time() + lease_seconds, key, self.owner)
+            )
+        return cursor.rowcount == 1
+
+    def keep_lease(self, key, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        Renew a lease taken with try_lease until the returned event is set.
+
+        A long analysis (a map-reduce over many chunks, or one waiting on the
+        rate limit) would otherwise outlive the lease, and another process
+        would start the same work. Set the event before release_lease().
+
+        Returns:
+            threading.Event: Set it to stop renewing
+        """
+        finished = threading.Event()
+        thread = threading.Thread(target=self._heartbeat, args=(key, lease_seconds, finished), daemon=True)
+        thread.start()
+        return finished
+
+    def _heartbeat(self, key, lease_seconds, finished):
+        interval = lease_seconds * LEASE_RENEW_FRACTION
+        while not finished.wait(interval):
+            try:
+                if not self.renew_lease(key, lease_seconds):
+                    return
+            except sqlite3.Error as e:
+                print(f"Analysis lease renewal failed: {str(e)}")
+
+    def release_lease(self, key):
+        with self.lock:
+            self.conn.execute("DELETE FROM inflight_leases WHERE key = ? AND owner = ?", (key, self.owner))
+
+    def wait_for(self, key, timeout=DEFAULT_LEASE_SECONDS, poll_interval=0.25):
+        """
+        Wait while another process holds the lease for key.
+
+        Returns:
+            The cached value once it appears, or None if the lease was released
+            or expired without a value (the caller should compute it itself)
+        """
+        deadline = time.time() + timeout
+        while True:
+            value = self.peek(key)
+            if value is not None:
+                return value
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT expires_at FROM inflight_leases WHERE key = ?", (key,)
+                ).fetchone()
+            if row is None or row[0] < time.time() or time.time() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+    def __contains__(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT created_at FROM analysis_cache WHERE key = ?", (key,)).fetchone()
+        return row is not None and not (self.ttl_seconds and time.time() - row[0] > self.ttl_seconds)
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM analysis_cache")
+
+    def stats(self):
+        """Return hit/miss counters and current size of the cache."""
+        with self.lock:
+            count, total_size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analysis_cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": count,
+            "size_bytes": total_size,
+        }
+
+class ExtractionCache:
+    """
+    Two-tier cache of extracted resume text keyed by a hash of the file bytes.
+
+    The memory tier is an LRU bounded by total text size. The optional disk
+    tier stores one file per key and evicts the least recently used files
+    once the directory exceeds its byte budget.
+    """
+
+    def __init__(self, disk_dir=None, max_memory_bytes=DEFAULT_EXTRACTION_MEMORY_BYTES,
+                 max_disk_bytes=DEFAULT_EXTRACTION_DISK_BYTES):
+        self.disk_dir = disk_dir or os.getenv("EXTRACTION_CACHE_DIR")
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+            except OSError as e:
+                print(f"Extraction disk cache unavailable at {self.disk_dir}: {str(e)}")
+                self.disk_dir = None
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.txt")
+
+    def _remember(self, key, text):
+        # Caller holds the lock
+        if key in self.memory:
+            self.memory_bytes -= len(self.memory.pop(key))
+        self.memory[key] = text
+        self.memory_bytes += len(text)
+        while self.memory_bytes > self.max_memory_bytes and len(self.memory) > 1:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+
+    def get(self, key):
+        """Return cached text for key, or None on a miss."""
+        with self.lock:
+            text = self.memory.get(key)
+            if text is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return text
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+                os.utime(path)
+            except OSError:
+                text = None
+            if text is not None:
+                with self.lock:
+                    self._remember(key, text)
+                    self.disk_hits += 1
+                return text
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, text):
+        with self.lock:
+            self._remember(key, text)
+        if self.disk_dir:
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(tmp_path, path)
+                self._evict_disk()
+            except OSError as e:
+                print(f"Could not write extraction cache entry: {str(e)}")
+
+    def _evict_disk(self):
+        entries = []
+        total = 0
+        with os.scandir(self.disk_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".txt"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= self.max_disk_bytes:
+            return
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self.memory),
+                "memory_bytes": self.memory_bytes,
+            }
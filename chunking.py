@@ -0,0 +1,254 @@
+import re
+import math
+from result_model import Score
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# llama3-8b-8192 context window and the completion budget reserved for the answer
+CONTEXT_WINDOW = 8192
+MAX_COMPLETION_TOKENS = 4000
+# Headroom for chat formatting tokens and tokenizer estimation error
+SAFETY_MARGIN = 256
+# Longest job description sent with each request; leaves room for a useful resume chunk
+JOB_DESCRIPTION_TOKEN_BUDGET = 1500
+
+_encoding = None
+_piece_re = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+# Newline-plus-indentation and runs of spaces cost about a token each in BPE tokenizers
+_whitespace_run_re = re.compile(r"[ \t]*\n\s*|[ \t]{2,}")
+# Characters before a boundary re-counted when joining units (merges stay local)
+_JOIN_CONTEXT = 32
+
+SECTION_HEADINGS = (
+    "summary", "professional summary", "profile", "objective", "about me",
+    "experience", "work experience", "professional experience", "employment history",
+    "education", "skills", "technical skills", "core competencies", "projects",
+    "certifications", "certificates", "awards", "achievements", "publications",
+    "languages", "interests", "volunteer experience", "leadership", "references",
+    "contact", "contact information", "training", "courses",
+)
+_heading_re = re.compile(
+    r"^\s*(?:%s)\s*:?\s*$" % "|".join(re.escape(h) for h in SECTION_HEADINGS),
+    re.IGNORECASE
+)
+
+def count_tokens(text):
+    """
+    Count tokens in text.
+
+    Uses tiktoken's cl100k encoding when installed (close to the llama3
+    tokenizer); otherwise a conservative pre-tokenizer estimate: letters in
+    ~4-character pieces, digits in 3-digit groups, one token per symbol and
+    one per line break or run of spaces.
+    """
+    global _encoding
+    if not text:
+        return 0
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        return len(_encoding.encode(text, disallowed_special=()))
+    tokens = 0
+    for piece in _piece_re.findall(text):
+        if piece[0].isalpha():
+            tokens += math.ceil(len(piece) / 4)
+        elif piece[0].isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        else:
+            tokens += 1
+    return tokens + len(_whitespace_run_re.findall(text))
+
+def input_budget(max_completion_tokens=MAX_COMPLETION_TOKENS, context_window=CONTEXT_WINDOW):
+    """Tokens available for the prompt once the completion budget is reserved."""
+    return context_window - max_completion_tokens - SAFETY_MARGIN
+
+def fit_job_description(job_description, max_tokens=JOB_DESCRIPTION_TOKEN_BUDGET):
+    """Trim a job description to max_tokens on a word boundary (unchanged if it fits)."""
+    if count_tokens(job_description) <= max_tokens:
+        return job_description
+    return _split_oversized(job_description, max_tokens)[0].rstrip()
+
+def is_heading(line):
+    """
+    Recognise a resume section heading: a known section name, a short ALL-CAPS
+    line or a short line ending with a colon (bullets never are). Used both to
+    split resumes into sections and to style headings in generated PDFs.
+    """
+    stripped = line.strip()
+    if not stripped or len(stripped) > 40 or stripped.startswith(("•", "-", "*")):
+        return False
+    if _heading_re.match(stripped):
+        return True
+    if stripped.endswith(":") and len(stripped) < 30:
+        return True
+    letters = [c for c in stripped if c.isalpha()]
+    return len(letters) >= 3 and stripped.isupper()
+
+def split_sections(text):
+    """
+    Split resume text into sections, each starting at a heading line.
+
+    Returns:
+        list: Section strings whose concatenation is exactly the input text
+    """
+    sections = []
+    current = []
+    for line in text.splitlines(keepends=True):
+        if is_heading(line) and any(l.strip() for l in current):
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+    return sections
+
+def _pack(units, budget):
+    # Greedily join consecutive units while they fit in the budget
+    pieces = []
+    current = ""
+    current_tokens = 0
+    for unit in units:
+        # Count the unit in context: a whitespace run or word can span the boundary
+        tail = current[-_JOIN_CONTEXT:]
+        unit_tokens = count_tokens(tail + unit) - count_tokens(tail)
+        if current and current_tokens + unit_tokens > budget:
+            pieces.append(current)
+            current = ""
+            current_tokens = 0
+            unit_tokens = count_tokens(unit)
+        current += unit
+        current_tokens += unit_tokens
+    if current:
+        pieces.append(current)
+    return pieces
+
+def _split_oversized(text, budget):
+    # Fall back from lines to words (and characters for absurdly long words)
+    units = []
+    for line in text.splitlines(keepends=True):
+        if count_tokens(line) <= budget:
+            units.append(line)
+            continue
+        for word in re.split(r"(?<=\s)", line):
+            if count_tokens(word) <= budget:
+                units.append(word)
+            else:
+                # At most one token per character, even for symbols
+                step = budget
+                units.extend(word[i:i + step] for i in range(0, len(word), step))
+    return _pack(units, budget)
+
+def plan_chunks(text, budget):
+    """
+    Pack resume sections into as few chunks as possible within a token budget.
+
+    Sections are kept whole when they fit; oversized sections are split on
+    line and then word boundaries. Nothing is dropped: the chunks concatenate
+    back to the original text.
+
+    Args:
+        text (str): Full resume text
+        budget (int): Maximum tokens per chunk
+
+    Returns:
+        list: Chunk strings
+    """
+    if count_tokens(text) <= budget:
+        return [text]
+    pieces = []
+    for section in split_sections(text):
+        if count_tokens(section) <= budget:
+            pieces.append(section)
+        else:
+            pieces.extend(_split_oversized(section, budget))
+    return _pack(pieces, budget)
+
+def _item_key(item):
+    for field in ("category", "keyword", "skill", "title"):
+        if item.get(field):
+            return (field, str(item[field]).strip().lower())
+    return ("item", str(sorted(item.items())))
+
+def merge_analysis_results(results, weights, resume_text="", job_description=""):
+    """
+    Reduce per-chunk analyses into one result with the analyze_resume schema.
+
+    List sections are concatenated and de-duplicated by their title field,
+    scores are averaged weighted by chunk size, and summaries are joined.
+    Keywords reported missing by one chunk but present elsewhere in the
+    resume are dropped.
+
+    Args:
+        results (list): Per-chunk analysis dicts (error results are skipped)
+        weights (list): Token count of each chunk
+        resume_text (str): Full resume text used to re-check missing keywords
+        job_description (str): Job description the chunks were analyzed against
+
+    Returns:
+        dict: Merged analysis, or the first error if every chunk failed
+    """
+    valid = [(r, w) for r, w in zip(results, weights) if not r.get("error")]
+    if not valid:
+        return results[0] if results else {"error": True, "message": "No analysis results"}
+
+    merged = {}
+    lowered_resume = resume_text.lower()
+    for result, _ in valid:
+        for key, value in result.items():
+            if not isinstance(value, list):
+                continue
+            items = merged.setdefault(key, [])
+            seen = {_item_key(i) for i in items if isinstance(i, dict)}
+            for item in value:
+                if not isinstance(item, dict):
+                    continue
+                if key == "missing_keywords" and str(item.get("keyword", "")).lower() in lowered_resume and item.get("keyword"):
+                    continue
+                item_key = _item_key(item)
+                if item_key not in seen:
+                    seen.add(item_key)
+                    items.append(item)
+
+    for score_key in ("overall_score", "job_match_score"):
+        scored = [(Score.parse(r.get(score_key)).out_of_ten, w) for r, w in valid if r.get(score_key) is not None]
+        scored = [(s, w) for s, w in scored if s is not None]
+        if scored:
+            total_weight = sum(w for _, w in scored) or 1
+            average = sum(s * w for s, w in scored) / total_weight
+            merged[score_key] = f"{round(average, 1):g} out of 10"
+
+    for text_key in ("summary_feedback", "job_match_summary"):
+        parts = []
+        for result, _ in valid:
+            part = result.get(text_key)
+            if isinstance(part, str) and part and part not in parts:
+                parts.append(part)
+        if parts:
+            merged[text_key] = " ".join(parts)
+
+    profiles = [r["profile"] for r, _ in valid if isinstance(r.get("profile"), dict)]
+    if profiles:
+        merged["profile"] = _merge_profiles(profiles)
+
+    if not job_description.strip():
+        merged.pop("missing_keywords", None)
+    return merged
+
+def _merge_profiles(profiles):
+    # Scalars come from the first chunk that has them; lists are concatenated without duplicates
+    merged = {}
+    for profile in profiles:
+        for key, value in profile.items():
+            if isinstance(value, list):
+                items = merged.setdefault(key, [])
+                seen = {str(i).lower() for i in items}
+                for item in value:
+                    if str(item).lower() not in seen:
+                        seen.add(str(item).lower())
+                        items.append(item)
+            elif value and not merged.get(key):
+                merged[key] = value
+    return merged
@@ -0,0 +1,441 @@
+import io
+import os
+import hashlib
+import threading
+import zipfile
+import posixpath
+import multiprocessing
+from xml.parsers import expat
+from xml.etree import ElementTree
+from concurrent.futures import ProcessPoolExecutor
+from cache import ExtractionCache
+from metrics import span, increment
+from normalization import normalize_text
+
+# Documents with at least this many pages are decoded on a process pool
+PARALLEL_PAGE_THRESHOLD = 24
+# Pages handed to one worker at a time (each worker reopens the document once per range)
+PAGES_PER_TASK = 8
+
+# Bump when extraction output changes so cached text is not reused
+EXTRACTOR_VERSION = "3"
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+_extraction_cache = None
+_extraction_cache_lock = threading.Lock()
+
+def _get_process_pool():
+    # Created once and reused; forkserver avoids forking the threaded Streamlit server
+    # (under a lock, so concurrent sessions do not each start a pool of workers)
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=min(os.cpu_count() or 1, 8),
+                    mp_context=multiprocessing.get_context(method)
+                )
+    return _process_pool
+
+# The PDF backends are imported on first use so the app and job workers start without them
+
+def _open_fitz(source):
+    # source is either a file path or the raw PDF bytes
+    import fitz  # PyMuPDF
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+def _open_plumber(source):
+    import pdfplumber
+    if isinstance(source, (bytes, bytearray)):
+        return pdfplumber.open(io.BytesIO(source))
+    return pdfplumber.open(source)
+
+# DOCX parts are streamed through expat in chunks of this size instead of building
+# python-docx's object model of the whole document
+DOCX_READ_SIZE = 64 * 1024
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main "
+_MC_FALLBACK = "http://schemas.openxmlformats.org/markup-compatibility/2006 Fallback"
+_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+# Characters emitted for empty run elements
+_DOCX_RUN_CHARS = {"tab": "\t", "br": "\n", "cr": "\n", "noBreakHyphen": "-"}
+
+class _DocxTextHandler:
+    """
+    expat callbacks collecting the text of one WordprocessingML part in reading order.
+
+    Each paragraph becomes one line. Table rows whose cells hold a single
+    line each become "cell | cell"; other rows are emitted cell by cell.
+    Text boxes follow the paragraph they are anchored in, and the
+    mc:Fallback copy Word writes next to each text box is skipped, as are
+    paragraph properties (whose tab stops are not text).
+    """
+
+    def __init__(self):
+        self.lines = []
+        # Innermost open body, table cell or text box (its lines)
+        self.containers = [self.lines]
+        # Open paragraphs: (text pieces, lines of text boxes anchored in it)
+        self.paragraphs = []
+        # Open table rows: lines of each closed cell
+        self.rows = []
+        self.in_text = False
+        # Open pPr / mc:Fallback elements; nothing inside them is read
+        self.skipped = 0
+        # Only these elements matter; every other start or end tag is a single dict miss
+        self.starts = {_W + "t": self.start_text, _W + "p": self.start_paragraph, _W + "tc": self.start_container,
+                       _W + "txbxContent": self.start_container, _W + "tr": self.start_row,
+                       _W + "pPr": self.start_skip, _MC_FALLBACK: self.start_skip}
+        self.starts.update({_W + name: self.run_char for name in _DOCX_RUN_CHARS})
+        self.ends = {_W + "t": self.end_text, _W + "p": self.end_paragraph, _W + "tc": self.end_cell,
+                     _W + "txbxContent": self.end_text_box, _W + "tr": self.end_row,
+                     _W + "pPr": self.end_skip, _MC_FALLBACK: self.end_skip}
+
+    def start(self, name, attributes):
+        handler = self.starts.get(name)
+        if handler is not None:
+            handler(name)
+
+    def end(self, name):
+        handler = self.ends.get(name)
+        if handler is not None:
+            handler()
+
+    def text(self, data):
+        if self.in_text:
+            self.paragraphs[-1][0].append(data)
+
+    def start_skip(self, name):
+        self.skipped += 1
+
+    def end_skip(self):
+        self.skipped -= 1
+
+    def start_text(self, name):
+        self.in_text = not self.skipped and bool(self.paragraphs)
+
+    def end_text(self):
+        self.in_text = False
+
+    def run_char(self, name):
+        if not self.skipped and self.paragraphs:
+            self.paragraphs[-1][0].append(_DOCX_RUN_CHARS[name[len(_W):]])
+
+    def start_paragraph(self, name):
+        if not self.skipped:
+            self.paragraphs.append(([], []))
+
+    def end_paragraph(self):
+        if not self.skipped:
+            pieces, boxes = self.paragraphs.pop()
+            self.containers[-1].append("".join(pieces))
+            self.containers[-1].extend(boxes)
+
+    def start_container(self, name):
+        if not self.skipped:
+            self.containers.append([])
+
+    def end_cell(self):
+        if not self.skipped:
+            lines = [line for line in self.containers.pop() if line.strip()]
+            if self.rows:
+                self.rows[-1].append(lines)
+            else:
+                self.containers[-1].extend(lines)
+
+    def end_text_box(self):
+        if not self.skipped:
+            lines = [line for line in self.containers.pop() if line.strip()]
+            (self.paragraphs[-1][1] if self.paragraphs else self.containers[-1]).extend(lines)
+
+    def start_row(self, name):
+        if not self.skipped:
+            self.rows.append([])
+
+    def end_row(self):
+        if self.skipped:
+            return
+        cells = [lines for lines in self.rows.pop() if lines]
+        if all(len(lines) == 1 and "\n" not in lines[0] for lines in cells):
+            if cells:
+                self.containers[-1].append(" | ".join(lines[0] for lines in cells))
+        else:
+            for lines in cells:
+                self.containers[-1].extend(lines)
+
+def _docx_part_lines(archive, name):
+    handler = _DocxTextHandler()
+    parser = expat.ParserCreate(namespace_separator=" ")
+    parser.buffer_text = True
+    parser.ordered_attributes = True
+    parser.StartElementHandler = handler.start
+    parser.EndElementHandler = handler.end
+    parser.CharacterDataHandler = handler.text
+    with archive.open(name) as part:
+        while True:
+            chunk = part.read(DOCX_READ_SIZE)
+            if not chunk:
+                break
+            parser.Parse(chunk, False)
+    parser.Parse(b"", True)
+    return handler.lines
+
+def _docx_relationships(archive, name):
+    # Relationship files are small; returns (type suffix, target part name) pairs
+    directory, base = posixpath.split(name)
+    rels_name = posixpath.join(directory, "_rels", base + ".rels")
+    try:
+        root = ElementTree.fromstring(archive.read(rels_name))
+    except KeyError:
+        return []
+    return [
+        (rel.get("Type", "").rsplit("/", 1)[-1],
+         posixpath.normpath(posixpath.join(directory, rel.get("Target", ""))).lstrip("/"))
+        for rel in root.iter(_REL) if rel.get("TargetMode") != "External"
+    ]
+
+def _part_order(name):
+    # header2.xml after header1.xml, header10.xml after header9.xml
+    digits = "".join(c for c in posixpath.basename(name) if c.isdigit())
+    return int(digits or 0), name
+
+def _docx_text(source):
+    """
+    Extract the text of a DOCX file (path or file object) in reading order.
+
+    The main document part and its header and footer parts are streamed
+    from the zip through an incremental XML parser, so memory stays
+    proportional to the text rather than the document. Unlike python-docx's
+    paragraph list, this includes tables, text boxes, headers and footers.
+    Headers come first and footers last; a header or footer repeated across
+    sections is kept once.
+    """
+    with zipfile.ZipFile(source) as archive:
+        main = next((target for kind, target in _docx_relationships(archive, "")
+                     if kind == "officeDocument"), "word/document.xml")
+        related = _docx_relationships(archive, main)
+        headers = sorted((target for kind, target in related if kind == "header"), key=_part_order)
+        footers = sorted((target for kind, target in related if kind == "footer"), key=_part_order)
+
+        def section_lines(parts):
+            lines, seen = [], set()
+            for name in parts:
+                try:
+                    text = "\n".join(_docx_part_lines(archive, name)).strip()
+                except KeyError:
+                    # A relationship to a part missing from the zip; Word ignores it too
+                    continue
+                if text and text not in seen:
+                    seen.add(text)
+                    lines.append(text)
+            return lines
+
+        return "\n".join(section_lines(headers) + _docx_part_lines(archive, main) + section_lines(footers))
+
+def _plumber_page_text(source, page_number):
+    with _open_plumber(source) as pdf:
+        return pdf.pages[page_number].extract_text() or ""
+
+def _page_text(doc, source, page_number):
+    # Fall back to pdfplumber for this page only if PyMuPDF cannot decode it
+    try:
+        return doc[page_number].get_text()
+    except Exception:
+        try:
+            return _plumber_page_text(source, page_number)
+        except Exception as e:
+            print(f"Text extraction error on page {page_number + 1}: {str(e)}")
+            return ""
+
+def _extract_page_range(source, start, stop):
+    with _open_fitz(source) as doc:
+        return [_page_text(doc, source, i) for i in range(start, stop)]
+
+def _iter_plumber_pages(source):
+    with _open_plumber(source) as pdf:
+        for page in pdf.pages:
+            yield page.extract_text() or ""
+
+def iter_pdf_pages(source, parallel=None):
+    """
+    Yield the text of each PDF page in order, as soon as it is decoded.
+
+    Large documents are split into page ranges and decoded on a process pool.
+    Pages PyMuPDF fails on are retried with pdfplumber individually; if the
+    document cannot be opened by PyMuPDF at all, pdfplumber handles all pages.
+
+    Args:
+        source (str or bytes): Path to the PDF file, or its contents
+        parallel (bool, optional): Force (True) or disable (False) the process pool.
+            By default it is used for documents with PARALLEL_PAGE_THRESHOLD pages or
+            more when more than one CPU is available.
+
+    Yields:
+        str: Text of one page
+    """
+    try:
+        doc = _open_fitz(source)
+    except Exception:
+        yield from _iter_plumber_pages(source)
+        return
+
+    with doc:
+        page_count = doc.page_count
+        if parallel is None:
+            parallel = page_count >= PARALLEL_PAGE_THRESHOLD and (os.cpu_count() or 1) > 1
+        if not parallel or page_count <= PAGES_PER_TASK:
+            for i in range(page_count):
+                yield _page_text(doc, source, i)
+            return
+
+    pool = _get_process_pool()
+    futures = [
+        pool.submit(_extract_page_range, source, start, min(start + PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PAGES_PER_TASK)
+    ]
+    for future in futures:
+        yield from future.result()
+
+def extract_text_from_pdf(source, parallel=None):
+    """Extract all text from a PDF path or PDF bytes (see iter_pdf_pages)."""
+    return "".join(iter_pdf_pages(source, parallel))
+
+SUPPORTED_EXTENSIONS = ("pdf", "docx", "txt")
+
+def find_resumes(directory):
+    """
+    Recursively collect resume files under a directory.
+
+    Args:
+        directory (str): Folder to scan (e.g. resumes/)
+
+    Returns:
+        list: Sorted list of file paths with a supported extension
+    """
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.split('.')[-1].lower() in SUPPORTED_EXTENSIONS:
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+def extract_text_from_file(file_path):
+    file_extension = file_path.split('.')[-1].lower()
+    try:
+        if file_extension == 'pdf':
+            return normalize_text(extract_text_from_pdf(file_path))
+        elif file_extension == 'docx':
+            return normalize_text(_docx_text(file_path))
+        elif file_extension == 'txt':
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                return normalize_text(f.read())
+        else:
+            return None
+    except Exception as e:
+        print(f"Text extraction error: {str(e)}")
+        return None
+
+def detect_format(data):
+    """
+    Identify a document format from its leading bytes rather than its file name.
+
+    Args:
+        data (bytes or memoryview): File contents
+
+    Returns:
+        str: 'pdf', 'docx' or 'txt', or None if the content is not supported
+    """
+    head = bytes(data[:1024])
+    # The PDF header may be preceded by a few junk bytes
+    if b"%PDF-" in head:
+        return 'pdf'
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                archive.getinfo("word/document.xml")
+            return 'docx'
+        except (KeyError, zipfile.BadZipFile):
+            return None
+    # Plain text: no NUL bytes (UTF-16 BOMs are handled when decoding)
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")) or b"\x00" not in head:
+        return 'txt'
+    return None
+
+def _decode_text(data):
+    raw = bytes(data)
+    if raw.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return raw.decode('utf-16', errors='replace')
+    return raw.decode('utf-8-sig', errors='replace')
+
+def extract_text_from_bytes(data, file_extension=None):
+    """
+    Extract text from an in-memory document without writing it to disk.
+
+    The format is sniffed from the content; file_extension is only used when
+    the content is not recognised.
+
+    Args:
+        data (bytes or memoryview): File contents
+        file_extension (str, optional): Fallback format (pdf, docx or txt)
+
+    Returns:
+        str: Extracted text (see normalization.normalize_text), or None if the
+            format is unsupported or parsing failed
+    """
+    file_format = detect_format(data) or (file_extension or "").lower().lstrip('.')
+    try:
+        if file_format == 'pdf':
+            # PyMuPDF needs a bytes-like object it can keep a reference to
+            return normalize_text(extract_text_from_pdf(data if isinstance(data, (bytes, bytearray)) else bytes(data)))
+        elif file_format == 'docx':
+            return normalize_text(_docx_text(io.BytesIO(data)))
+        elif file_format == 'txt':
+            return normalize_text(_decode_text(data))
+        else:
+            return None
+    except Exception as e:
+        print(f"Text extraction error: {str(e)}")
+        return None
+
+def get_extraction_cache():
+    """Return the process-wide extracted-text cache (created on first use)."""
+    global _extraction_cache
+    if _extraction_cache is None:
+        with _extraction_cache_lock:
+            if _extraction_cache is None:
+                _extraction_cache = ExtractionCache()
+    return _extraction_cache
+
+def extract_text_from_upload(data, filename=None):
+    """
+    Extract text from uploaded file bytes, parsing each distinct file only once.
+
+    Results are cached by a hash of the file contents, so Streamlit reruns
+    (widget changes, job description edits) reuse the extracted text.
+
+    Args:
+        data (bytes or memoryview): Uploaded file contents (e.g. uploaded_file.getvalue())
+        filename (str, optional): Original file name, only used if the format cannot be sniffed
+
+    Returns:
+        str: Extracted text, or None if extraction failed
+    """
+    file_extension = filename.split('.')[-1].lower() if filename and '.' in filename else None
+    file_format = detect_format(data) or file_extension
+    digest = hashlib.sha256(f"{EXTRACTOR_VERSION}:{file_format}:".encode())
+    digest.update(data)
+    key = digest.hexdigest()
+
+    cache = get_extraction_cache()
+    text = cache.get(key)
+    increment("extraction_cache_total", result="hit" if text is not None else "miss")
+    if text is None:
+        with span("extraction", format=file_format or "unknown", size_bytes=len(data)):
+            text = extract_text_from_bytes(data, file_format)
+        if text:
+            cache.set(key, text)
+    return text
@@ -0,0 +1,218 @@
+import os
+import math
+import time
+import threading
+from collections import deque
+import streamlit as st
+from chunking import MAX_COMPLETION_TOKENS
+from metrics import increment, percentile
+from cache import open_database
+
+# Shared request log location (override with RATE_LIMIT_DB_PATH)
+DEFAULT_RATE_LIMIT_PATH = os.path.join(".cache", "rate_limit.sqlite3")
+DEFAULT_REQUESTS_PER_MINUTE = 30
+# Output caps: each kind of request reserves HEADROOM x the p99 of its recent completions
+# (at least MIN_COMPLETION_TOKENS), and the full MAX_COMPLETION_TOKENS until it has been seen enough
+MIN_COMPLETION_TOKENS = 512
+COMPLETION_HEADROOM = 1.5
+COMPLETION_PERCENTILE = 99
+MIN_COMPLETION_SAMPLES = 20
+COMPLETION_WINDOW = 200
+
+_clients = {}
+_clients_lock = threading.Lock()
+_governor = None
+_governor_lock = threading.Lock()
+_completion_budget = None
+_completion_budget_lock = threading.Lock()
+_environment_loaded = False
+
+def load_environment():
+    """Load variables from a .env file once per process (variables already set win)."""
+    global _environment_loaded
+    if not _environment_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _environment_loaded = True
+
+def get_api_key():
+    """Return the Groq API key from Streamlit secrets or the environment (None if unset)."""
+    load_environment()
+    try:
+        return st.secrets["GROQ_API_KEY"]
+    except Exception:
+        return os.getenv("GROQ_API_KEY")
+
+def get_client(api_key=None):
+    """
+    Return the process-wide Groq client for an API key.
+
+    The client is thread-safe and keeps its HTTP connection pool alive, so all
+    sessions and both analysis and resume generation reuse the same one. The
+    Groq SDK is imported on the first call rather than at startup.
+    """
+    api_key = api_key or get_api_key()
+    if not api_key:
+        raise ValueError("GROQ_API_KEY is not configured")
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            from groq import Groq
+            client = Groq(api_key=api_key)
+            _clients[api_key] = client
+        return client
+
+RATE_LIMIT_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS request_log (ts REAL NOT NULL, source TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_request_log_ts ON request_log (ts)",
+]
+
+class RateGovernor:
+    """
+    Sliding-window request limiter shared across threads and worker processes.
+
+    Every Groq call records a timestamp in a small SQLite database. Slots are
+    reserved inside an IMMEDIATE transaction, so concurrent processes on the
+    same machine serialize on the database lock and never overshoot the budget.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, path=None, window_seconds=60):
+        self.requests_per_minute = requests_per_minute
+        self.window_seconds = window_seconds
+        self.path = path or os.getenv("RATE_LIMIT_DB_PATH", DEFAULT_RATE_LIMIT_PATH)
+        self.lock = threading.Lock()
+        # Falls back to a per-process window rather than blocking all requests
+        self.path, self.conn = open_database(self.path, RATE_LIMIT_SCHEMA, "Shared rate limiter")
+
+    def try_acquire(self, source="analysis"):
+        """
+        Try to reserve one request slot.
+
+        Returns:
+            float: 0 if a slot was reserved, otherwise seconds until one frees up
+        """
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute("DELETE FROM request_log WHERE ts <= ?", (now - self.window_seconds,))
+                count, oldest = self.conn.execute("SELECT COUNT(*), MIN(ts) FROM request_log").fetchone()
+                if count < self.requests_per_minute:
+                    self.conn.execute("INSERT INTO request_log (ts, source) VALUES (?, ?)", (now, source))
+                    wait_time = 0.0
+                else:
+                    wait_time = max(oldest + self.window_seconds - now, 0.01)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return wait_time
+
+    def acquire(self, source="analysis", on_wait=None):
+        """
+        Block until a request slot is reserved.
+
+        Args:
+            source (str): Label recorded with the request (shown in usage())
+            on_wait (callable): Called with the wait time before each sleep
+        """
+        while True:
+            wait_time = self.try_acquire(source)
+            if wait_time <= 0:
+                return
+            if on_wait:
+                on_wait(wait_time)
+            time.sleep(wait_time)
+
+    def usage(self):
+        """Return current window usage, broken down by source."""
+        now = time.time()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT source, COUNT(*), MIN(ts) FROM request_log WHERE ts > ? GROUP BY source",
+                (now - self.window_seconds,)
+            ).fetchall()
+        used = sum(count for _, count, _ in rows)
+        oldest = min((ts for _, _, ts in rows), default=None)
+        return {
+            "limit": self.requests_per_minute,
+            "window_seconds": self.window_seconds,
+            "used": used,
+            "remaining": max(self.requests_per_minute - used, 0),
+            "resets_in_seconds": round(oldest + self.window_seconds - now, 1) if oldest else 0.0,
+            "by_source": {source: count for source, count, _ in rows},
+        }
+
+def get_governor():
+    """Return the process-wide RateGovernor (created on first use)."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = RateGovernor(int(os.getenv("GROQ_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)))
+        return _governor
+
+class CompletionBudget:
+    """
+    Per-kind max_tokens learned from the completion lengths seen so far.
+
+    Groq reserves max_tokens against the context window and the tokens/min
+    quota, so a fixed 4000 wastes most of it on answers that are a few
+    hundred tokens long. A truncated answer forgets what was learned for its
+    kind, so the next requests of that kind get the full cap again.
+    """
+
+    def __init__(self, ceiling=MAX_COMPLETION_TOKENS, adaptive=True):
+        self.ceiling = ceiling
+        self.adaptive = adaptive
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def max_tokens(self, kind, minimum=0):
+        """
+        Output cap for a request of this kind (None: always the full cap).
+
+        Args:
+            kind (str): Prompt name, e.g. "analysis" or "rewrite"
+            minimum (int): Lowest cap for this request, for answers that grow with the input
+        """
+        if not self.adaptive or kind is None:
+            return self.ceiling
+        with self.lock:
+            samples = list(self.samples.get(kind, ()))
+        if len(samples) < MIN_COMPLETION_SAMPLES:
+            return self.ceiling
+        cap = math.ceil(percentile(samples, COMPLETION_PERCENTILE) * COMPLETION_HEADROOM)
+        return min(self.ceiling, max(MIN_COMPLETION_TOKENS, minimum, cap))
+
+    def record(self, kind, completion_tokens, truncated=False):
+        """Record the completion length of a finished request."""
+        if kind is None:
+            return
+        if truncated:
+            increment("groq_truncated_responses_total", kind=kind)
+        with self.lock:
+            if truncated:
+                self.samples.pop(kind, None)
+            elif completion_tokens:
+                samples = self.samples.get(kind)
+                if samples is None:
+                    samples = self.samples[kind] = deque(maxlen=COMPLETION_WINDOW)
+                samples.append(completion_tokens)
+
+    def status(self):
+        """Samples and current cap per kind."""
+        with self.lock:
+            counts = {kind: len(samples) for kind, samples in self.samples.items()}
+        return {kind: {"samples": count, "max_tokens": self.max_tokens(kind)} for kind, count in sorted(counts.items())}
+
+def get_completion_budget():
+    """
+    Return the process-wide CompletionBudget (created on first use).
+
+    GROQ_ADAPTIVE_MAX_TOKENS=0 always reserves the full cap.
+    """
+    global _completion_budget
+    with _completion_budget_lock:
+        if _completion_budget is None:
+            _completion_budget = CompletionBudget(adaptive=os.getenv("GROQ_ADAPTIVE_MAX_TOKENS", "1") != "0")
+        return _completion_budget
@@ -0,0 +1,280 @@
+import os
+import json
+import time
+import uuid
+import base64
+import logging
+import sqlite3
+import threading
+from analyzer import analyze_resume_stream
+from pdf_generator import generate_improved_resume
+from metrics import span, increment, observe
+from cache import encode_value, decode_value, open_database
+
+# Job queue location (override with JOBS_DB_PATH); workers per server process (JOB_WORKERS)
+DEFAULT_JOBS_PATH = os.path.join(".cache", "jobs.sqlite3")
+DEFAULT_WORKERS = 2
+# A running job whose worker stops renewing its lease (process killed) is picked up again
+DEFAULT_LEASE_SECONDS = 600
+# Share of the lease after which a running job's lease is renewed, whether or not it reports progress
+LEASE_RENEW_FRACTION = 1 / 3
+MAX_ATTEMPTS = 3
+# Finished jobs are kept this long so results survive reruns and browser refreshes
+DEFAULT_RETENTION_SECONDS = 24 * 60 * 60
+POLL_INTERVAL = 1.0
+# Partial results are written at most this often
+PARTIAL_UPDATE_INTERVAL = 0.5
+
+ACTIVE_STATUSES = ("queued", "running")
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def run_analysis_job(payload, progress):
+    """Run a streamed analysis, publishing sections as partial results."""
+    job_description = payload.get("job_description", "")
+    partial = {}
+    result = None
+    with span("analysis_stream", job_specific=bool(job_description)):
+        for event, key, value in analyze_resume_stream(payload["resume_text"], job_description):
+            if event == "result":
+                result = value
+                break
+            if event == "item":
+                partial.setdefault(key, []).append(value)
+            elif event == "field":
+                partial[key] = value
+            else:
+                continue
+            progress(partial)
+    if not result or result.get("error"):
+        raise RuntimeError((result or {}).get("message", "Analysis failed"))
+    return result
+
+def run_resume_generation_job(payload, progress):
+    """Generate the improved resume PDF; the bytes are returned base64-encoded."""
+    with span("resume_generation"):
+        pdf_data = generate_improved_resume(
+            payload["resume_text"],
+            payload.get("suggestions", []),
+            payload.get("job_description", "")
+        )
+    if not pdf_data:
+        raise RuntimeError("Failed to generate improved resume.")
+    return {"pdf": base64.b64encode(pdf_data).decode("ascii")}
+
+JOB_HANDLERS = {
+    "analysis": run_analysis_job,
+    "resume_generation": run_resume_generation_job,
+}
+
+JOBS_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        status TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        partial TEXT,
+        result TEXT,
+        error TEXT,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        owner TEXT,
+        lease_expires_at REAL,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)",
+]
+
+class JobQueue:
+    """
+    SQLite-backed job queue with a local pool of worker threads.
+
+    Every Streamlit server process sharing the database file runs its own
+    workers; a job is claimed by exactly one of them. Submitting returns a
+    job ID immediately, and status, partial results and the final result are
+    read back with get() from any rerun, session or process.
+    """
+
+    def __init__(self, path=None, workers=None, lease_seconds=DEFAULT_LEASE_SECONDS,
+                 retention_seconds=DEFAULT_RETENTION_SECONDS):
+        self.path = path or os.getenv("JOBS_DB_PATH", DEFAULT_JOBS_PATH)
+        self.workers = workers or int(os.getenv("JOB_WORKERS", DEFAULT_WORKERS))
+        self.lease_seconds = lease_seconds
+        self.retention_seconds = retention_seconds
+        self.owner = uuid.uuid4().hex
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.threads = []
+        # Falls back to memory, so jobs then only survive reruns of this process, not restarts
+        self.path, self.conn = open_database(self.path, JOBS_SCHEMA, "Job queue")
+
+    def start(self):
+        """Start the worker threads (once)."""
+        if self.threads:
+            return
+        # Workers call the same code as the UI; st.* calls without a session are expected there
+        logging.getLogger("streamlit.runtime.scriptrunner.script_run_context").setLevel(logging.ERROR)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, kind, payload):
+        """
+        Queue a job.
+
+        Args:
+            kind (str): One of JOB_HANDLERS
+            payload (dict): JSON-serializable job arguments
+
+        Returns:
+            str: The job ID
+        """
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(payload, ensure_ascii=False), now, now)
+            )
+            self.conn.execute(
+                "DELETE FROM jobs WHERE status NOT IN ('queued', 'running') AND updated_at < ?",
+                (now - self.retention_seconds,)
+            )
+        increment("jobs_submitted_total", kind=kind)
+        self.wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        """
+        Look up a job.
+
+        Returns:
+            dict: id, kind, status ("queued", "running", "done" or "failed"),
+                payload, partial, result, error, created_at and updated_at;
+                None if the job does not exist (or has expired)
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT id, kind, status, payload, partial, result, error, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(("id", "kind", "status", "payload", "partial", "result", "error", "created_at", "updated_at"), row))
+        for field in ("payload", "partial"):
+            job[field] = json.loads(job[field]) if job[field] else None
+        # Analysis results are stored in their compact binary form
+        try:
+            job["result"] = decode_value(job["result"]) if job["result"] else None
+        except ValueError as e:
+            # Written by an incompatible version; report it rather than fail every poll
+            job.update(status="failed", result=None, error=f"Stored result could not be read: {e}")
+        return job
+
+    def _claim(self):
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose worker died mid-run are retried a limited number of times
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'Job was interrupted too many times', updated_at = ? "
+                    "WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?",
+                    (now, now, MAX_ATTEMPTS)
+                )
+                row = self.conn.execute(
+                    "SELECT id, kind, payload, created_at FROM jobs "
+                    "WHERE status = 'queued' OR (status = 'running' AND lease_expires_at < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is not None:
+                    # One token per claim: a worker whose lease was taken over cannot write,
+                    # even if the new holder is another thread of this process
+                    token = f"{self.owner}:{uuid.uuid4().hex}"
+                    self.conn.execute(
+                        "UPDATE jobs SET status = 'running', owner = ?, attempts = attempts + 1, "
+                        "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                        (token, now + self.lease_seconds, now, row[0])
+                    )
+                    row = (*row, token)
+                self.conn.execute("COMMIT")
+            except sqlite3.Error:
+                self.conn.execute("ROLLBACK")
+                raise
+        return row
+
+    def _update(self, job_id, token, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self.lock:
+            # Only the worker that holds the job may write to it
+            self.conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND owner = ? AND status = 'running'",
+                (*fields.values(), job_id, token)
+            )
+
+    def _work(self):
+        while True:
+            try:
+                row = self._claim()
+            except sqlite3.Error as e:
+                print(f"Job queue error: {str(e)}")
+                row = None
+            if row is None:
+                self.wakeup.wait(POLL_INTERVAL)
+                self.wakeup.clear()
+                continue
+            self._run(*row)
+
+    def _heartbeat(self, job_id, token, finished):
+        # Renews the lease while the handler runs, e.g. a rewrite waiting on the rate limit
+        interval = self.lease_seconds * LEASE_RENEW_FRACTION
+        while not finished.wait(interval):
+            try:
+                self._update(job_id, token, lease_expires_at=time.time() + self.lease_seconds)
+            except sqlite3.Error as e:
+                print(f"Job lease renewal failed: {str(e)}")
+
+    def _run(self, job_id, kind, payload, created_at, token):
+        observe("job_queue_wait_seconds", time.time() - created_at, kind=kind)
+        last_update = [0.0]
+
+        def progress(partial):
+            # Publishing partial results also renews the lease
+            now = time.time()
+            if now - last_update[0] >= PARTIAL_UPDATE_INTERVAL:
+                last_update[0] = now
+                self._update(job_id, token, partial=json.dumps(partial, ensure_ascii=False),
+                             lease_expires_at=now + self.lease_seconds)
+
+        finished = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, token, finished), daemon=True)
+        heartbeat.start()
+        try:
+            with span("job", kind=kind):
+                result = JOB_HANDLERS[kind](json.loads(payload), progress)
+            self._update(job_id, token, status="done", result=encode_value(result))
+            increment("jobs_total", kind=kind, status="done")
+        except Exception as e:
+            self._update(job_id, token, status="failed", error=str(e))
+            increment("jobs_total", kind=kind, status="failed")
+        finally:
+            finished.set()
+
+def get_job_queue():
+    """Return the process-wide job queue, starting its workers on first use."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                queue = JobQueue()
+                queue.start()
+                _queue = queue
+    return _queue
@@ -0,0 +1,426 @@
+import re
+import json
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    Characters are fed as they arrive from the model. Whenever an element of a
+    top-level array (e.g. one entry of "strengths") or a top-level scalar
+    field closes, an event is emitted so the UI can render it immediately.
+    Leading prose or code fences before the first '{' are skipped.
+
+    Events are (event, key, value) tuples:
+        ("item", key, element)   an element of the top-level array `key` closed
+        ("field", key, value)    a top-level scalar or object field closed
+        ("end", key, None)       the top-level array `key` closed
+    """
+
+    def __init__(self):
+        self.stack = []
+        self.in_string = False
+        self.escape = False
+        self.finished = False
+        # Raw text of the current depth-1 string (a key or a scalar value)
+        self.token = None
+        # Raw text of the element/value currently being captured, and its parent depth
+        self.capture = None
+        self.capture_depth = None
+        # Raw text of a bare depth-1 scalar (number, true/false/null)
+        self.scalar = None
+        self.last_key = None
+        self.expect_value = False
+        self.result = {}
+
+    def feed(self, chunk):
+        """Consume a chunk of text and return the list of events it completed."""
+        events = []
+        for c in chunk:
+            if self.finished:
+                break
+            self._consume(c, events)
+        return events
+
+    def _emit(self, events, event, key, value):
+        if event == "item":
+            self.result.setdefault(key, []).append(value)
+        elif event == "field":
+            self.result[key] = value
+        events.append((event, key, value))
+
+    def _finish_capture(self, events):
+        raw = "".join(self.capture)
+        depth = self.capture_depth
+        self.capture = None
+        self.capture_depth = None
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        if depth == 1:
+            self.expect_value = False
+            self._emit(events, "field", self.last_key, value)
+        else:
+            self._emit(events, "item", self.last_key, value)
+
+    def _flush_scalar(self, events):
+        if self.scalar:
+            try:
+                self._emit(events, "field", self.last_key, json.loads("".join(self.scalar)))
+            except json.JSONDecodeError:
+                pass
+        self.scalar = None
+        self.expect_value = False
+
+    def _consume(self, c, events):
+        depth = len(self.stack)
+        if self.capture is not None:
+            self.capture.append(c)
+
+        if self.in_string:
+            if self.token is not None:
+                self.token.append(c)
+            if self.escape:
+                self.escape = False
+            elif c == "\\":
+                self.escape = True
+            elif c == '"':
+                self.in_string = False
+                if self.token is not None:
+                    value = json.loads("".join(self.token))
+                    self.token = None
+                    if self.expect_value:
+                        self.expect_value = False
+                        self._emit(events, "field", self.last_key, value)
+                    else:
+                        self.last_key = value
+                elif self.capture is not None and self.capture_depth == depth:
+                    self._finish_capture(events)
+            return
+
+        if depth == 0:
+            if c == "{":
+                self.stack.append(c)
+            return
+
+        if c == '"':
+            self.in_string = True
+            if depth == 1:
+                self.token = ['"']
+            elif depth == 2 and self.stack[-1] == "[" and self.capture is None:
+                self.capture = ['"']
+                self.capture_depth = 2
+            return
+
+        if c in "{[":
+            if depth == 1 and c == "{" and self.expect_value:
+                # Object-valued top-level field: emit it once it closes
+                self.capture = [c]
+                self.capture_depth = 1
+            elif depth == 1 and c == "[":
+                self.expect_value = False
+                self.result.setdefault(self.last_key, [])
+            elif depth == 2 and self.stack[-1] == "[" and self.capture is None:
+                self.capture = [c]
+                self.capture_depth = 2
+            self.stack.append(c)
+            return
+
+        if c in "}]":
+            if depth == 1:
+                self._flush_scalar(events)
+                self.stack.pop()
+                self.finished = True
+                return
+            if self.capture is not None and self.capture_depth == depth:
+                # Bare scalar element terminated by the closing bracket
+                self.capture.pop()
+                self._finish_capture(events)
+            self.stack.pop()
+            if self.capture is not None and self.capture_depth == depth - 1:
+                self._finish_capture(events)
+            elif depth == 2 and c == "]":
+                events.append(("end", self.last_key, None))
+            return
+
+        if depth == 1:
+            if c == ":":
+                self.expect_value = True
+                self.scalar = []
+            elif c == ",":
+                self._flush_scalar(events)
+            elif self.expect_value and not c.isspace():
+                self.scalar.append(c)
+        elif depth == 2 and self.stack[-1] == "[" and self.capture is None and c not in ", \t\r\n":
+            # Bare scalar elements (numbers, booleans) inside a top-level array
+            self.capture = [c]
+            self.capture_depth = 2
+        elif self.capture is not None and self.capture_depth == depth and c in ", \t\r\n" and depth == 2:
+            self.capture.pop()
+            self._finish_capture(events)
+
+# Expected top-level fields of an analysis response: list fields hold objects
+ANALYSIS_SCHEMA = {
+    "job_match_score": str,
+    "job_match_summary": str,
+    "strengths": list,
+    "weaknesses": list,
+    "improvement_suggestions": list,
+    "missing_keywords": list,
+    "skills_to_develop": list,
+    "job_recommendations": list,
+    "overall_score": str,
+    "summary_feedback": str,
+    "profile": dict,
+}
+
+_structural_re = re.compile(r'[{}\[\]"\\]')
+
+_PARTIAL_LITERALS = {"t": "true", "tr": "true", "tru": "true", "f": "false", "fa": "false",
+                     "fal": "false", "fals": "false", "n": "null", "nu": "null", "nul": "null"}
+
+def find_json_objects(text):
+    """
+    Locate top-level JSON objects in free text in a single pass.
+
+    Braces inside strings are ignored, and anything outside an object (prose,
+    code fences) is skipped. An object that is still open at the end of the
+    text (a truncated response) is returned with complete=False.
+
+    Returns:
+        list: (start, end, complete) spans, end being exclusive
+    """
+    spans = []
+    depth = 0
+    start = None
+    in_string = False
+    escaped_until = -1
+    # Only structural characters matter, so jump between them with a regex
+    for match in _structural_re.finditer(text):
+        i = match.start()
+        if i < escaped_until:
+            continue
+        c = text[i]
+        if in_string:
+            if c == "\\":
+                escaped_until = i + 2
+            elif c == '"':
+                in_string = False
+        elif depth == 0:
+            if c == "{":
+                start = i
+                depth = 1
+        elif c == '"':
+            in_string = True
+        elif c in "{[":
+            depth += 1
+        elif c in "}]":
+            depth -= 1
+            if depth == 0:
+                spans.append((start, i + 1, True))
+    if depth > 0:
+        spans.append((start, len(text), False))
+    return spans
+
+def repair_json(fragment):
+    """
+    Fix common LLM JSON defects without another API call.
+
+    Removes trailing commas, completes a truncated string or literal, drops a
+    dangling key without a value and closes any unbalanced arrays/objects.
+
+    Args:
+        fragment (str): Text of a single JSON object, possibly malformed
+
+    Returns:
+        str: Repaired JSON text (not guaranteed to be valid)
+    """
+    out = []
+    stack = []
+    in_string = False
+    escape = False
+    # Per open object: index in out where the current key began, and whether a value followed
+    key_start = []
+    for c in fragment:
+        if in_string:
+            out.append(c)
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+            continue
+        if c == '"':
+            if stack and stack[-1] == "{" and key_start[-1] is None:
+                key_start[-1] = len(out)
+            in_string = True
+            out.append(c)
+        elif c in "{[":
+            stack.append(c)
+            key_start.append(None)
+            out.append(c)
+        elif c in "}]":
+            if not stack:
+                continue
+            _strip_trailing_comma(out)
+            stack.pop()
+            key_start.pop()
+            out.append(c)
+            if stack and stack[-1] == "{":
+                key_start[-1] = None
+        elif c == ",":
+            out.append(c)
+            if stack and stack[-1] == "{":
+                key_start[-1] = None
+        else:
+            out.append(c)
+
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+    # Complete or drop a literal/number cut off mid-token
+    tail = _trailing_token(out)
+    if tail in _PARTIAL_LITERALS:
+        del out[len(out) - len(tail):]
+        out.extend(_PARTIAL_LITERALS[tail])
+    elif tail and tail[-1] in ".eE+-":
+        del out[len(out) - len(tail):]
+        out.extend(tail.rstrip(".eE+-") or "null")
+
+    while stack:
+        _strip_whitespace(out)
+        if stack[-1] == "{" and key_start[-1] is not None:
+            # The last key in this object has no complete value: "key" or "key":
+            text = "".join(out[key_start[-1]:])
+            if not _has_value(text):
+                del out[key_start[-1]:]
+        _strip_trailing_comma(out)
+        out.append("}" if stack.pop() == "{" else "]")
+        key_start.pop()
+    return "".join(out)
+
+def _strip_whitespace(out):
+    while out and out[-1].isspace():
+        out.pop()
+
+def _strip_trailing_comma(out):
+    _strip_whitespace(out)
+    if out and out[-1] == ",":
+        out.pop()
+        _strip_whitespace(out)
+
+def _trailing_token(out):
+    i = len(out)
+    while i > 0 and (out[i - 1].isalnum() or out[i - 1] in ".+-"):
+        i -= 1
+    token = "".join(out[i:])
+    # Only bare tokens directly after a separator count (not the end of a string)
+    if token and (i == 0 or out[i - 1] in ":,[ \t\r\n"):
+        return token
+    return ""
+
+def _has_value(key_text):
+    try:
+        json.loads("{" + key_text + "}")
+        return True
+    except json.JSONDecodeError:
+        return False
+
+def _is_blank(item):
+    # True for {} and objects whose every field is empty ("", null, [] or {})
+    return not any(
+        value.strip() if isinstance(value, str) else value not in (None, [], {})
+        for value in item.values()
+    )
+
+def validate_schema(obj, schema=ANALYSIS_SCHEMA):
+    """
+    Check and coerce a parsed object against an expected top-level schema.
+
+    Scalars are converted to strings where a string is expected; a single
+    object where a list is expected is wrapped in a list, and non-object or
+    blank list elements (e.g. the {} left by repairing an item cut off
+    before its first value) are dropped. A non-object where an object is expected is removed.
+    Unknown keys are kept as-is.
+
+    Returns:
+        tuple: (coerced dict or None, number of schema fields present)
+    """
+    if not isinstance(obj, dict):
+        return None, 0
+    matched = 0
+    for key, expected in schema.items():
+        if key not in obj:
+            continue
+        value = obj[key]
+        if expected is list:
+            if isinstance(value, dict):
+                value = [value]
+            elif not isinstance(value, list):
+                del obj[key]
+                continue
+            obj[key] = [item for item in value if isinstance(item, dict) and not _is_blank(item)]
+        elif expected is dict and not isinstance(value, dict):
+            del obj[key]
+            continue
+        elif expected is str and not isinstance(value, str):
+            if value is None or isinstance(value, (dict, list)):
+                del obj[key]
+                continue
+            obj[key] = str(value)
+        matched += 1
+    return obj, matched
+
+def extract_json_object(text, schema=ANALYSIS_SCHEMA):
+    """
+    Extract the outermost JSON object from a model response.
+
+    Handles code fences, surrounding prose, trailing commas and truncated
+    output in linear time. When several objects are present, the one that
+    matches the most schema fields wins (then the longest).
+
+    Args:
+        text (str): Raw model response
+        schema (dict, optional): Expected top-level fields; None disables validation
+
+    Returns:
+        dict: Parsed (and coerced) object, or None if nothing usable was found
+    """
+    if not text:
+        return None
+    try:
+        obj = json.loads(text)
+        if isinstance(obj, dict):
+            return validate_schema(obj, schema)[0] if schema else obj
+    except json.JSONDecodeError:
+        pass
+
+    best = None
+    best_rank = None
+    for start, end, complete in find_json_objects(text):
+        fragment = text[start:end]
+        obj = None
+        if complete:
+            try:
+                obj = json.loads(fragment)
+            except json.JSONDecodeError:
+                pass
+        if obj is None:
+            try:
+                obj = json.loads(repair_json(fragment))
+            except json.JSONDecodeError:
+                continue
+        if schema:
+            obj, matched = validate_schema(obj, schema)
+            if obj is None:
+                continue
+        else:
+            matched = 0
+        rank = (matched, end - start)
+        if best_rank is None or rank > best_rank:
+            best, best_rank = obj, rank
+    if schema and best is not None and best_rank[0] == 0:
+        return None
+    return best
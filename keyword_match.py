@@ -0,0 +1,289 @@
+import re
+from collections import Counter
+
+# Canonical skill name -> alternative spellings found in resumes and job descriptions
+SKILLS = {
+    # Languages
+    "Python": ["python3"],
+    "Java": [],
+    "JavaScript": ["js", "ecmascript"],
+    "TypeScript": ["ts"],
+    "C": [],
+    "C++": ["cpp"],
+    "C#": ["csharp", "c sharp"],
+    "Go": ["golang"],
+    "Rust": [],
+    "Ruby": [],
+    "PHP": [],
+    "Kotlin": [],
+    "Swift": [],
+    "Scala": [],
+    "R": [],
+    "MATLAB": [],
+    "Bash": ["shell scripting", "shell script"],
+    "SQL": [],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    # Frameworks and libraries
+    "React": ["react.js", "reactjs"],
+    "Angular": ["angularjs", "angular.js"],
+    "Vue.js": ["vue", "vuejs"],
+    "Next.js": ["nextjs"],
+    "Node.js": ["nodejs"],
+    "Express": ["express.js", "expressjs"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": [],
+    "Spring Boot": ["spring framework"],
+    "Ruby on Rails": ["rails"],
+    ".NET": ["dotnet", "asp.net"],
+    "Pandas": [],
+    "NumPy": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "TensorFlow": [],
+    "PyTorch": ["torch"],
+    "Keras": [],
+    "Spark": ["apache spark", "pyspark"],
+    "Hadoop": [],
+    "Airflow": ["apache airflow"],
+    "Kafka": ["apache kafka"],
+    "GraphQL": [],
+    "REST APIs": ["restful", "rest api", "restful apis"],
+    "gRPC": [],
+    "Streamlit": [],
+    # Data stores
+    "PostgreSQL": ["postgres"],
+    "MySQL": [],
+    "SQLite": [],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Elasticsearch": ["elastic search"],
+    "Cassandra": [],
+    "DynamoDB": [],
+    "Snowflake": [],
+    "BigQuery": [],
+    # Cloud and infrastructure
+    "AWS": ["amazon web services"],
+    "Azure": ["microsoft azure"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "Terraform": [],
+    "Ansible": [],
+    "Jenkins": [],
+    "CI/CD": ["continuous integration", "continuous delivery", "continuous deployment"],
+    "GitHub Actions": [],
+    "Git": ["github", "gitlab"],
+    "Linux": ["unix"],
+    "Microservices": ["microservice"],
+    "Serverless": ["aws lambda", "lambda"],
+    "Prometheus": [],
+    "Grafana": [],
+    # Data and AI
+    "Machine Learning": ["ml"],
+    "Deep Learning": [],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": [],
+    "Large Language Models": ["llm", "llms"],
+    "Data Analysis": ["data analytics"],
+    "Data Visualization": [],
+    "Statistics": ["statistical analysis"],
+    "ETL": ["data pipelines", "data pipeline"],
+    "Data Warehousing": ["data warehouse"],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Excel": ["microsoft excel"],
+    # Practices and roles
+    "Agile": ["scrum", "kanban"],
+    "Test-Driven Development": ["tdd"],
+    "Unit Testing": ["pytest", "junit", "jest"],
+    "System Design": ["distributed systems"],
+    "Object-Oriented Programming": ["oop", "object oriented"],
+    "Security": ["cybersecurity", "information security"],
+    "Project Management": ["pmp"],
+    "Product Management": [],
+    "UI/UX Design": ["ui/ux", "ux design", "ui design", "figma"],
+    "Technical Writing": ["documentation"],
+    "Leadership": ["team lead", "mentoring", "mentored"],
+    "Communication": ["communication skills"],
+    "Stakeholder Management": ["stakeholders"],
+    "Problem Solving": ["problem-solving"],
+}
+
+# Names that are also ordinary words or letters ("go", "rust", "grade c") only
+# match with this exact capitalisation
+CASE_SENSITIVE_SKILLS = {"C", "R", "Go", "Rust", "Swift", "Spark", "Express", "Excel", "Agile"}
+
+_word_char_re = re.compile(r"\w")
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton for matching many phrases in a single pass.
+
+    Matching only accepts whole words, so "go" does not match inside "google"
+    and "c" does not match inside "cloud". It is case-insensitive unless
+    case_sensitive is set.
+    """
+
+    def __init__(self, case_sensitive=False):
+        self.case_sensitive = case_sensitive
+        self.goto = [{}]
+        self.fail = [0]
+        # Per state: (pattern length, value) of every pattern ending there
+        self.output = [[]]
+        self.built = False
+
+    def add(self, pattern, value):
+        """Add a phrase; value is reported whenever it matches."""
+        state = 0
+        for c in (pattern if self.case_sensitive else pattern.lower()):
+            next_state = self.goto[state].get(c)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][c] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append((len(pattern), value))
+        self.built = False
+
+    def build(self):
+        """Compute failure links breadth-first; called automatically before matching."""
+        queue = list(self.goto[0].values())
+        for state in queue:
+            self.fail[state] = 0
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for c, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and c not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(c, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+        self.built = True
+
+    def iter_matches(self, text):
+        """
+        Yield (start, end, value) for every whole-word phrase occurrence in text.
+
+        Overlapping matches are all reported (e.g. "apache spark" and "spark").
+        """
+        if not self.built:
+            self.build()
+        lowered = text if self.case_sensitive else text.lower()
+        length = len(lowered)
+        goto = self.goto
+        fail = self.fail
+        state = 0
+        for i, c in enumerate(lowered):
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            if not self.output[state]:
+                continue
+            end = i + 1
+            for pattern_length, value in self.output[state]:
+                start = end - pattern_length
+                # Whole words only: the pattern must not continue a word on either side
+                if start > 0 and _word_char_re.match(lowered[start - 1]) and _word_char_re.match(lowered[start]):
+                    continue
+                if end < length and _word_char_re.match(lowered[end]) and _word_char_re.match(lowered[end - 1]):
+                    continue
+                yield start, end, value
+
+class SkillMatcher:
+    """Compiled skill dictionary that extracts canonical skills from text"""
+
+    def __init__(self, skills=None, case_sensitive_skills=CASE_SENSITIVE_SKILLS):
+        self.automaton = AhoCorasick()
+        self.exact_automaton = AhoCorasick(case_sensitive=True)
+        for canonical, aliases in (skills or SKILLS).items():
+            phrases = {alias.lower() for alias in aliases}
+            if canonical in case_sensitive_skills:
+                self.exact_automaton.add(canonical, canonical)
+            else:
+                phrases.add(canonical.lower())
+            for phrase in phrases:
+                self.automaton.add(phrase, canonical)
+        self.automaton.build()
+        self.exact_automaton.build()
+
+    def count_skills(self, text):
+        """
+        Count skill mentions in text.
+
+        Returns:
+            Counter: Canonical skill name -> number of mentions
+        """
+        counts = Counter()
+        text = text or ""
+        matches = list(self.automaton.iter_matches(text)) + list(self.exact_automaton.iter_matches(text))
+        # Longest match wins: "apache kafka" counts once, "C" inside "C++" not at all
+        covered_until = 0
+        for start, end, canonical in sorted(matches, key=lambda m: (m[0], -m[1])):
+            if start < covered_until and end <= covered_until:
+                continue
+            covered_until = max(covered_until, end)
+            counts[canonical] += 1
+        return counts
+
+_matcher = None
+
+def get_skill_matcher():
+    """Return the process-wide matcher for the built-in SKILLS dictionary."""
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillMatcher()
+    return _matcher
+
+def match_keywords(resume_text, job_description, matcher=None):
+    """
+    Score a resume against a job description locally, without an API call.
+
+    Skills are weighted by how often the job description mentions them, so a
+    skill named three times counts more than one listed once.
+
+    Args:
+        resume_text (str): Full resume text
+        job_description (str): Job description to match against
+        matcher (SkillMatcher, optional): Custom dictionary; defaults to SKILLS
+
+    Returns:
+        dict: job_keywords, matched_keywords, missing_keywords (in the
+            analyze_resume format), coverage (0-1), score (0-10) and
+            job_match_score ("X out of 10"). coverage, score and
+            job_match_score are None when the job description names no
+            skill from the dictionary, since there is nothing to match.
+    """
+    matcher = matcher or get_skill_matcher()
+    job_counts = matcher.count_skills(job_description)
+    resume_counts = matcher.count_skills(resume_text)
+
+    # Most frequently mentioned first, ties in dictionary order of appearance in the JD
+    job_keywords = [skill for skill, _ in job_counts.most_common()]
+    matched = [skill for skill in job_keywords if resume_counts[skill]]
+    missing = [skill for skill in job_keywords if not resume_counts[skill]]
+
+    total_weight = sum(job_counts.values())
+    matched_weight = sum(job_counts[skill] for skill in matched)
+    coverage = round(matched_weight / total_weight, 4) if total_weight else None
+    score = round(coverage * 10, 1) if coverage is not None else None
+    return {
+        "job_keywords": job_keywords,
+        "matched_keywords": matched,
+        "missing_keywords": [
+            {
+                "keyword": skill,
+                "importance": f"Mentioned {job_counts[skill]} time{'s' if job_counts[skill] != 1 else ''} in the job description"
+            }
+            for skill in missing
+        ],
+        "coverage": coverage,
+        "score": score,
+        "job_match_score": f"{score:g} out of 10" if score is not None else None,
+    }
@@ -1,11 +1,20 @@
 import streamlit as st
-import os
-import tempfile
-from analyzer import extract_text_from_file, analyze_resume, initialize_analyzer
-from pdf_generator import generate_improved_resume
-from utils import setup_page, display_analysis_results, display_job_recommendations, display_job_match_results
+from analyzer import initialize_analyzer
+from extractor import extract_text_from_upload
+from jobs import get_job_queue, JOB_HANDLERS, ACTIVE_STATUSES, POLL_INTERVAL
+from utils import setup_page, display_analysis_results, display_job_recommendations, display_job_match_results, display_rate_limit_usage, display_partial_analysis, display_keyword_match
+from groq_client import get_governor, load_environment
+from chunking import count_tokens, JOB_DESCRIPTION_TOKEN_BUDGET
+from keyword_match import match_keywords
+from metrics import span
+from ranking import ResumeIndex, to_match_analysis, DEFAULT_INDEX_DIR
 import traceback
-import json
+import os
+import base64
+import time
+
+# Settings from a .env file (cache paths, rate limits, models...) apply before anything reads them
+load_environment()
 
 # Configure Groq API with Streamlit secrets
 try:
@@ -16,6 +25,154 @@ except Exception as e:
     st.session_state["api_key_configured"] = False
     st.session_state["api_key_error"] = str(e)
 
+def get_job_id(kind):
+    """Return the job this session is following, restored from the URL after a browser refresh."""
+    key = f"{kind}_job_id"
+    if key not in st.session_state:
+        st.session_state[key] = st.experimental_get_query_params().get(kind, [None])[0]
+    return st.session_state[key]
+
+def track_job(kind, job_id):
+    """Follow job_id (or stop following with None) in this session and in the page URL."""
+    st.session_state[f"{kind}_job_id"] = job_id
+    params = {name: get_job_id(name) for name in JOB_HANDLERS}
+    st.experimental_set_query_params(**{name: value for name, value in params.items() if value})
+
+def get_tracked_job(kind):
+    job_id = get_job_id(kind)
+    if job_id is None:
+        return None
+    job = get_job_queue().get(job_id)
+    if job is None:
+        # Expired or from another job database
+        track_job(kind, None)
+    return job
+
+def display_analysis_job():
+    """
+    Show the status, partial sections or final results of the session's analysis job.
+
+    Returns:
+        dict: The job, or None if the session has none
+    """
+    job = get_tracked_job("analysis")
+    if job is None:
+        return None
+    
+    if job["status"] in ACTIVE_STATUSES:
+        st.info("🤖 Analyzing your resume with AI... You can keep using the page; results appear here as they arrive.")
+        if job["partial"]:
+            display_partial_analysis(job["partial"])
+        return job
+    
+    if job["status"] == "failed":
+        st.error(f"❌ An error occurred during analysis: {job['error']}")
+        
+        # Show helpful tips
+        st.info("""
+        **Troubleshooting Tips:**
+        - Try with a smaller resume file
+        - Ensure your internet connection is stable
+        - If the error persists, try again in a few minutes
+        """)
+        return job
+    
+    # Save analysis result in session state
+    analysis_result = job["result"]
+    st.session_state["analysis_result"] = analysis_result
+    st.session_state["resume_text"] = job["payload"]["resume_text"]
+    st.session_state["job_description"] = job["payload"]["job_description"]
+    st.session_state["analysis_type"] = job["payload"]["analysis_type"]
+    
+    # Display results based on analysis type
+    with span("render_results"):
+        if job["payload"]["job_description"]:
+            # Display job-specific results
+            display_job_match_results(analysis_result)
+        else:
+            # Display general analysis results
+            display_analysis_results(analysis_result)
+            
+            # Display job recommendations for general analysis
+            if "job_recommendations" in analysis_result:
+                display_job_recommendations(analysis_result["job_recommendations"])
+    return job
+
+def display_resume_generation_job():
+    """
+    Offer improved-resume generation for a finished analysis and show its job.
+
+    Returns:
+        dict: The generation job, or None if none was started
+    """
+    if st.session_state.get("analysis_result") is None:
+        return None
+    
+    st.divider()
+    st.subheader("📝 Generate Improved Resume")
+    
+    # Show different options based on analysis type
+    if st.session_state.get("analysis_type") == "Job-Specific Analysis (with job description)":
+        st.write("Generate an improved resume tailored specifically for the job you're targeting")
+    else:
+        st.write("Generate an improved version of your resume based on general best practices")
+    
+    if st.button("✨ Generate Improved Resume", use_container_width=True):
+        job_id = get_job_queue().submit("resume_generation", {
+            "resume_text": st.session_state["resume_text"],
+            "suggestions": st.session_state["analysis_result"].get("improvement_suggestions", []),
+            # Pass job description for targeted improvements
+            "job_description": st.session_state.get("job_description", ""),
+        })
+        track_job("resume_generation", job_id)
+    
+    job = get_tracked_job("resume_generation")
+    if job is None:
+        return None
+    
+    if job["status"] in ACTIVE_STATUSES:
+        st.info("📝 Generating improved resume...")
+    elif job["status"] == "failed":
+        st.error(f"❌ An error occurred while generating the improved resume: {job['error']}")
+    else:
+        st.success("✅ Improved resume generated successfully!")
+        
+        # Create filename based on analysis type
+        filename = "improved_resume_job_targeted.pdf" if job["payload"]["job_description"] else "improved_resume.pdf"
+        
+        st.download_button(
+            label="📥 Download Improved Resume",
+            data=base64.b64decode(job["result"]["pdf"]),
+            file_name=filename,
+            mime="application/pdf",
+            use_container_width=True
+        )
+    return job
+
+def display_ranked_resumes(job_description, top_k=5):
+    """
+    Rank the locally indexed resumes (built with `python ranking.py build`)
+    against the job description, without any API call.
+    """
+    index = ResumeIndex.load(DEFAULT_INDEX_DIR)
+    if index is None or not len(index):
+        return
+    
+    st.divider()
+    st.subheader("📚 Rank Stored Resumes")
+    st.write(f"Rank the {len(index)} indexed resumes against this job description (local BM25, no API call)")
+    if not st.button("🏆 Rank Indexed Resumes", use_container_width=True):
+        return
+    
+    hits = index.rank(job_description, top_k)
+    if not hits:
+        st.warning("No indexed resume shares any terms with this job description.")
+        return
+    tabs = st.tabs([f"#{i + 1} {os.path.basename(hit['doc_id'])}" for i, hit in enumerate(hits)])
+    for tab, hit in zip(tabs, hits):
+        with tab:
+            display_job_match_results(to_match_analysis(hit))
+
 def main():
     # Setup page configuration
     setup_page()
@@ -26,6 +183,9 @@ def main():
         st.info("Please check your secrets.toml file and ensure GROQ_API_KEY is properly set.")
         return
     
+    # Shared API budget across all sessions and workers
+    display_rate_limit_usage(get_governor().usage())
+    
     st.title("🤖 AI Resume Analyzer")
     st.write("Upload your resume and optionally add a job description for targeted analysis")
     
@@ -44,10 +204,10 @@ def main():
             placeholder="Copy and paste the job description you want to match your resume against..."
         )
         
-        # Show character count
+        # Show token count (the resume itself is never truncated; long ones are analyzed in parts)
         if job_description:
-            char_count = len(job_description)
-            st.caption(f"Characters: {char_count}/2000 {'⚠️ (truncated)' if char_count > 2000 else '✅'}")
+            token_count = count_tokens(job_description)
+            st.caption(f"Tokens: ~{token_count}/{JOB_DESCRIPTION_TOKEN_BUDGET} {'⚠️ (truncated)' if token_count > JOB_DESCRIPTION_TOKEN_BUDGET else '✅'}")
     
     # Analysis type selection
     analysis_type = st.radio(
@@ -56,22 +216,17 @@ def main():
         help="Job-specific analysis provides targeted feedback when you include a job description"
     )
     
+    if analysis_type == "Job-Specific Analysis (with job description)" and job_description.strip():
+        display_ranked_resumes(job_description)
+    
     if uploaded_file is not None:
         # Show file info
         st.success(f"✅ File uploaded: {uploaded_file.name} ({uploaded_file.size} bytes)")
         
-        # Create a temporary file to store the uploaded resume
-        try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_filepath = tmp_file.name
-        except Exception as e:
-            st.error(f"Error saving uploaded file: {str(e)}")
-            return
-        
+        # Extract straight from the upload buffer; unchanged files hit the extraction cache
         with st.spinner("📖 Extracting text from your resume..."):
             try:
-                resume_text = extract_text_from_file(tmp_filepath)
+                resume_text = extract_text_from_upload(uploaded_file.getbuffer(), uploaded_file.name)
             except Exception as e:
                 st.error(f"Error extracting text: {str(e)}")
                 st.error(traceback.format_exc())
@@ -79,10 +234,6 @@ def main():
             
         if not resume_text:
             st.error("❌ Failed to extract text from the uploaded file. Please try another file.")
-            try:
-                os.unlink(tmp_filepath)
-            except:
-                pass
             return
         
         # Show a preview of the extracted text
@@ -95,6 +246,8 @@ def main():
             if not job_description.strip():
                 st.warning("⚠️ Please add a job description for job-specific analysis, or switch to general analysis.")
                 return
+            # Local skill match, available before any API call
+            display_keyword_match(match_keywords(resume_text, job_description))
         
         # Use a form to ensure proper state management with the button
         with st.form(key="analysis_form"):
@@ -108,104 +261,17 @@ def main():
             # Determine which analysis to run
             job_desc_for_analysis = job_description if analysis_type == "Job-Specific Analysis (with job description)" else ""
             
-            with st.spinner("🤖 Analyzing your resume with AI... This may take a moment."):
-                try:
-                    analysis_result = analyze_resume(resume_text, job_desc_for_analysis)
-                    
-                    # Save analysis result in session state
-                    st.session_state["analysis_result"] = analysis_result
-                    st.session_state["resume_text"] = resume_text
-                    st.session_state["job_description"] = job_desc_for_analysis
-                    st.session_state["analysis_type"] = analysis_type
-                    
-                    # Display results based on analysis type
-                    if job_desc_for_analysis:
-                        # Display job-specific results
-                        display_job_match_results(analysis_result)
-                    else:
-                        # Display general analysis results
-                        display_analysis_results(analysis_result)
-                        
-                        # Display job recommendations for general analysis
-                        if "job_recommendations" in analysis_result:
-                            display_job_recommendations(analysis_result["job_recommendations"])
-                    
-                except Exception as e:
-                    st.error(f"❌ An error occurred during analysis: {str(e)}")
-                    st.error("**Debug Info:**")
-                    st.code(traceback.format_exc())
-                    
-                    # Show helpful tips
-                    st.info("""
-                    **Troubleshooting Tips:**
-                    - Try with a smaller resume file
-                    - Ensure your internet connection is stable
-                    - If the error persists, try again in a few minutes
-                    """)
+            # Runs on a background worker so reruns (and refreshes) don't interrupt it
+            job_id = get_job_queue().submit("analysis", {
+                "resume_text": resume_text,
+                "job_description": job_desc_for_analysis,
+                "analysis_type": analysis_type,
+            })
+            track_job("analysis", job_id)
+            track_job("resume_generation", None)
+            st.session_state.pop("analysis_result", None)
         
-        # Option to generate improved resume (outside form)
-        if st.session_state.get("analysis_result") is not None:
-            st.divider()
-            st.subheader("📝 Generate Improved Resume")
-            
-            # Show different options based on analysis type
-            if st.session_state.get("analysis_type") == "Job-Specific Analysis (with job description)":
-                st.write("Generate an improved resume tailored specifically for the job you're targeting")
-            else:
-                st.write("Generate an improved version of your resume based on general best practices")
-            
-            if st.button("✨ Generate Improved Resume", use_container_width=True):
-                with st.spinner("📝 Generating improved resume..."):
-                    try:
-                        # Get analysis result and resume text from session state
-                        analysis_result = st.session_state["analysis_result"]
-                        resume_text = st.session_state["resume_text"]
-                        job_description = st.session_state.get("job_description", "")
-                        
-                        # Check improvement suggestions
-                        suggestions = analysis_result.get("improvement_suggestions", [])
-                        
-                        # Generate improved resume
-                        improved_resume_path = generate_improved_resume(
-                            resume_text, 
-                            suggestions,
-                            job_description  # Pass job description for targeted improvements
-                        )
-                        
-                        if improved_resume_path:
-                            st.success("✅ Improved resume generated successfully!")
-                            with open(improved_resume_path, "rb") as file:
-                                pdf_data = file.read()
-                                
-                            # Create filename based on analysis type
-                            filename = "improved_resume_job_targeted.pdf" if job_description else "improved_resume.pdf"
-                            
-                            st.download_button(
-                                label="📥 Download Improved Resume",
-                                data=pdf_data,
-                                file_name=filename,
-                                mime="application/pdf",
-                                use_container_width=True
-                            )
-                            
-                            # Clean up temporary file
-                            try:
-                                os.unlink(improved_resume_path)
-                            except Exception:
-                                pass
-                        else:
-                            st.error("❌ Failed to generate improved resume.")
-                    except Exception as e:
-                        st.error(f"❌ An error occurred while generating the improved resume: {str(e)}")
-                        st.error(traceback.format_exc())
-        
-        # Clean up temporary file
-        try:
-            os.unlink(tmp_filepath)
-        except:
-            pass
-    
-    else:
+    elif get_job_id("analysis") is None:
         # Show helpful instructions when no file is uploaded
         st.info("""
         **How to use:**
@@ -238,6 +304,14 @@ Requirements:
 - Experience with CI/CD pipelines
 - Excellent communication skills
             """)
+    
+    analysis_job = display_analysis_job()
+    generation_job = display_resume_generation_job()
+    
+    # Poll while a job is still running; interacting with the page reruns sooner
+    if any(job and job["status"] in ACTIVE_STATUSES for job in (analysis_job, generation_job)):
+        time.sleep(POLL_INTERVAL)
+        st.rerun()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
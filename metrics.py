@@ -0,0 +1,310 @@
+import os
+import time
+import uuid
+import math
+import threading
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Samples kept per histogram for rolling percentiles, and recent spans kept for the admin page
+ROLLING_WINDOW = 1000
+RECENT_SPANS = 200
+# Cumulative Prometheus histogram buckets (seconds)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Buckets for histograms of token counts (metrics named *_tokens)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192)
+DEFAULT_EXPORT_INTERVAL = 15
+
+_registry = None
+_registry_lock = threading.Lock()
+_local = threading.local()
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _format_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (f'{k}="{_escape(v)}"' for k, v in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def _bucket_bounds(name):
+    return TOKEN_BUCKETS if name.endswith("_tokens") else DURATION_BUCKETS
+
+class _Histogram:
+    def __init__(self, bounds=DURATION_BUCKETS):
+        self.bounds = bounds
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(bounds)
+        self.recent = deque(maxlen=ROLLING_WINDOW)
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.recent.append(value)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.buckets[i] += 1
+
+class MetricsRegistry:
+    """
+    Process-wide counters, duration histograms and recent timing spans.
+
+    Counters and histograms are cumulative (Prometheus semantics); each
+    histogram also keeps its last ROLLING_WINDOW samples for the rolling
+    percentiles shown on the admin page.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.spans = deque(maxlen=RECENT_SPANS)
+        self.started_at = time.time()
+
+    def increment(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = _Histogram(_bucket_bounds(name))
+            histogram.observe(value)
+
+    def record_span(self, span):
+        self.observe("stage_duration_seconds", span["duration"], stage=span["name"])
+        with self.lock:
+            self.spans.append(span)
+
+    def snapshot(self):
+        """
+        Summarise current metrics for display.
+
+        Returns:
+            dict: stages (per-stage count, mean and rolling p50/p95/p99 in ms,
+                for duration histograms), sizes (the same for token-count
+                histograms, in tokens), counters (name -> {labels -> value})
+                and recent spans
+        """
+        with self.lock:
+            histograms = [(name, dict(labels), h.count, h.total, list(h.recent))
+                          for (name, labels), h in self.histograms.items()]
+            counters = {}
+            for (name, labels), value in self.counters.items():
+                label_text = ", ".join(f"{k}={v}" for k, v in labels) or "total"
+                counters.setdefault(name, {})[label_text] = value
+            spans = list(self.spans)
+        stages = []
+        sizes = []
+        for name, labels, count, total, recent in histograms:
+            label_text = ", ".join(f"{k}={v}" for k, v in labels.items())
+            if name.endswith("_tokens"):
+                sizes.append({
+                    "metric": name,
+                    "labels": label_text,
+                    "count": count,
+                    "mean": round(total / count, 1) if count else 0.0,
+                    "p50": percentile(recent, 50),
+                    "p95": percentile(recent, 95),
+                    "p99": percentile(recent, 99),
+                })
+                continue
+            stages.append({
+                "metric": name,
+                "stage": labels.get("stage", label_text),
+                "count": count,
+                "mean_ms": round(total / count * 1000, 2) if count else 0.0,
+                "p50_ms": round(percentile(recent, 50) * 1000, 2),
+                "p95_ms": round(percentile(recent, 95) * 1000, 2),
+                "p99_ms": round(percentile(recent, 99) * 1000, 2),
+            })
+        stages.sort(key=lambda s: (s["metric"], s["stage"]))
+        sizes.sort(key=lambda s: (s["metric"], s["labels"]))
+        return {"uptime_seconds": round(time.time() - self.started_at, 1),
+                "stages": stages, "sizes": sizes, "counters": counters, "spans": spans}
+
+    def render_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(
+                ((key, h.count, h.total, h.bounds, list(h.buckets)) for key, h in self.histograms.items()),
+                key=lambda item: item[0]
+            )
+        seen = set()
+        for (name, labels), value in counters:
+            metric = f"resume_analyzer_{name}"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+        for (name, labels), count, total, bounds, buckets in histograms:
+            metric = f"resume_analyzer_{name}"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            for bound, bucket_count in zip(bounds, buckets):
+                lines.append(f"{metric}_bucket{_format_labels(labels, [('le', bound)])} {bucket_count}")
+            lines.append(f"{metric}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.spans.clear()
+            self.started_at = time.time()
+
+def get_registry():
+    """
+    Return the process-wide registry, starting the configured exporters once.
+
+    METRICS_PORT serves Prometheus text on http://0.0.0.0:<port>/metrics;
+    METRICS_FILE rewrites that text to a file every METRICS_EXPORT_INTERVAL seconds.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                registry = MetricsRegistry()
+                port = os.getenv("METRICS_PORT")
+                if port:
+                    start_http_exporter(registry, int(port))
+                path = os.getenv("METRICS_FILE")
+                if path:
+                    interval = float(os.getenv("METRICS_EXPORT_INTERVAL", DEFAULT_EXPORT_INTERVAL))
+                    start_file_exporter(registry, path, interval)
+                _registry = registry
+    return _registry
+
+def increment(name, value=1, **labels):
+    """Add value to a counter (e.g. increment("analysis_cache_total", result="hit"))."""
+    get_registry().increment(name, value, **labels)
+
+def observe(name, value, **labels):
+    """Record one sample of a histogram measured in seconds."""
+    get_registry().observe(name, value, **labels)
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time a pipeline stage.
+
+    The duration is recorded in the stage_duration_seconds histogram and the
+    span is kept for the admin page together with its parent span and the
+    trace it belongs to (one trace per top-level span on a thread).
+    Exceptions are recorded in the span and re-raised.
+    """
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    parent = stack[-1] if stack else None
+    record = {
+        "name": name,
+        "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex[:16],
+        "parent": parent["name"] if parent else None,
+        "start": time.time(),
+        "attributes": attributes,
+        "error": None,
+    }
+    stack.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        record["duration"] = time.perf_counter() - start
+        # A span held open by a suspended generator may close after spans opened later
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i] is record:
+                del stack[i]
+                break
+        get_registry().record_span(record)
+
+def record_token_usage(usage, source):
+    """
+    Record the prompt/completion token counts of one call from its usage object.
+
+    Totals go to groq_tokens_total, and each call is also observed in the
+    groq_prompt_tokens / groq_completion_tokens histograms.
+
+    Returns:
+        tuple: (prompt_tokens, completion_tokens), None where usage does not say
+    """
+    counts = []
+    for kind in ("prompt_tokens", "completion_tokens"):
+        value = getattr(usage, kind, None)
+        if value is None and isinstance(usage, dict):
+            value = usage.get(kind)
+        if value:
+            increment("groq_tokens_total", value, kind=kind.split("_")[0], source=source)
+            observe(f"groq_{kind}", value, source=source)
+        counts.append(value)
+    return tuple(counts)
+
+def start_http_exporter(registry, port, host="0.0.0.0"):
+    """Serve registry.render_prometheus() at /metrics on a daemon thread."""
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_response(404)
+                self.end_headers()
+                return
+            payload = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        # Another process (e.g. a second Streamlit worker) already serves this port
+        print(f"Metrics endpoint unavailable on port {port}: {str(e)}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def start_file_exporter(registry, path, interval=DEFAULT_EXPORT_INTERVAL):
+    """Rewrite path with the Prometheus text every interval seconds (node_exporter textfile format)."""
+    def run():
+        while True:
+            time.sleep(interval)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(registry.render_prometheus())
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"Could not write metrics file {path}: {str(e)}")
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,106 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+# Soft hyphen, zero-width characters and byte-order mark
+_INVISIBLE = "\xad\u200b\u200c\u200d\u2060\ufeff"
+# Includes the private-use bullets Word's Symbol and Wingdings fonts leave in PDFs
+_BULLETS = "\u25aa\u25cf\u25e6\u2023\u2043\u2219\u25a0\u25a1\u25c6\u25c7\u25ba\u27a2\u2713\u2714\uf0b7\uf0a7\uf076\uf0d8\uf0fc"
+_LIGATURES = {
+    "\ufb00": "ff", "\ufb01": "fi", "\ufb02": "fl", "\ufb03": "ffi", "\ufb04": "ffl", "\ufb05": "st", "\ufb06": "st",
+}
+_LINE_BREAKS = "\r\u2028\u2029\x85"
+
+NORMALIZE_TABLE = str.maketrans({
+    **{c: None for c in _INVISIBLE},
+    **{c: "•" for c in _BULLETS},
+    **{c: "\n" for c in _LINE_BREAKS},
+    **_LIGATURES,
+})
+
+# Typographic punctuation that core PDF fonts cannot show, and letters NFKD does not decompose
+ASCII_TABLE = str.maketrans({
+    "‘": "'", "’": "'", "‚": "'", "‛": "'", "′": "'",
+    "“": '"', "”": '"', "„": '"', "‟": '"', "″": '"',
+    "‐": "-", "‑": "-", "‒": "-", "–": "-", "—": "-", "―": "-", "−": "-",
+    "•": "*", "…": "...", "€": "EUR", "™": "(TM)",
+    "Ł": "L", "ł": "l", "Đ": "D", "đ": "d", "ı": "i", "Œ": "OE", "œ": "oe",
+    "Ħ": "H", "ħ": "h", "Ŧ": "T", "ŧ": "t", "Ŋ": "N", "ŋ": "n",
+})
+
+# str.translate looks up every character in a dict once the text is not pure
+# ASCII, so the tables are only applied to the (rare) runs of characters they change
+_NORMALIZE_RE = re.compile("[" + re.escape("".join(chr(c) for c in NORMALIZE_TABLE)) + "]+")
+_NON_LATIN1_RE = re.compile(r"[^\x00-\xff]+")
+
+def _translate_run(match):
+    return match.group().translate(NORMALIZE_TABLE)
+
+def normalize_text(text):
+    """
+    Normalize extracted or generated resume text.
+
+    Invisible characters and soft hyphens are dropped, ligatures are
+    expanded, bullet glyphs become "•" and non-ASCII text is
+    NFKC-normalized (accents are kept). A single pass over the lines then
+    collapses runs of whitespace (including Unicode spaces), re-joins words
+    hyphenated across a line break and limits blank lines to one.
+
+    Args:
+        text (str): Raw text (None is returned unchanged)
+
+    Returns:
+        str: Normalized text
+    """
+    if not text:
+        return text
+    if "\r" in text:
+        text = text.replace("\r\n", "\n")
+    text = _NORMALIZE_RE.sub(_translate_run, text)
+    if not text.isascii() and not unicodedata.is_normalized("NFKC", text):
+        text = unicodedata.normalize("NFKC", text)
+
+    lines = []
+    blank = False
+    for line in text.split("\n"):
+        line = " ".join(line.split())
+        if not line:
+            blank = bool(lines)
+            continue
+        if blank:
+            lines.append("")
+            blank = False
+        elif lines:
+            # "engi-" + "neering" -> "engineering"; "Jean-" + "Pierre" stays hyphenated
+            previous = lines[-1]
+            if previous[-1] == "-" and len(previous) > 1 and previous[-2].isalpha() and line[0].islower():
+                lines[-1] = previous[:-1] + line
+                continue
+        lines.append(line)
+    return "\n".join(lines)
+
+@lru_cache(maxsize=4096)
+def _transliterate_char(char):
+    decomposed = unicodedata.normalize("NFKD", char)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    try:
+        stripped.encode("latin-1")
+        return stripped
+    except UnicodeEncodeError:
+        return ""
+
+def _latin1_run(match):
+    run = match.group().translate(ASCII_TABLE)
+    if run.isascii():
+        return run
+    return "".join(c if c <= "\xff" else _transliterate_char(c) for c in run)
+
+def to_latin1(text):
+    """
+    Make text printable with Latin-1 core PDF fonts without losing names.
+
+    Typographic quotes, dashes and bullets become ASCII, letters outside
+    Latin-1 lose their accents ("Łukasz Dvořák" -> "Lukasz Dvorák")
+    while Latin-1 letters such as "é" are kept, and anything else is dropped.
+    """
+    return _NON_LATIN1_RE.sub(_latin1_run, text)
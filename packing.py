@@ -0,0 +1,230 @@
+from concurrent.futures import ThreadPoolExecutor
+import analyzer
+from analyzer import (SYSTEM_PROMPT, plan_analysis, finalize_analysis_result, summarize_profile,
+                      combine_profile_and_match, get_resume_profile, analyze_resume)
+from chunking import count_tokens, input_budget, fit_job_description, MAX_COMPLETION_TOKENS
+from json_parsing import ANALYSIS_SCHEMA, extract_json_object, validate_schema
+from metrics import span, increment
+from prompts import PACKED_ANALYSIS_TEMPLATE, PACKED_MATCH_TEMPLATE, GENERAL_FIELDS, MATCH_FIELDS, schema_spec
+
+# Most analyses sent in one request
+DEFAULT_PACK_SIZE = 4
+# Typical completion size of one entry, so a pack's answer fits in MAX_COMPLETION_TOKENS
+ANALYSIS_COMPLETION_TOKENS = 900
+MATCH_COMPLETION_TOKENS = 450
+# An entry with fewer analysis fields than this (e.g. cut off at the end) is re-analyzed on its own
+MIN_ENTRY_FIELDS = 3
+
+PACKED_SCHEMA = {"results": list}
+
+def build_packed_analysis_prompt(resume_texts):
+    """Build one general-analysis prompt for several resumes (see build_analysis_prompt)."""
+    resumes = "\n".join(f"RESUME {i}:\n{text}" for i, text in enumerate(resume_texts, 1))
+    return PACKED_ANALYSIS_TEMPLATE.format(resumes=resumes, count=len(resume_texts),
+                                           schema=schema_spec("index", *GENERAL_FIELDS))
+
+def build_packed_match_prompt(pairs):
+    """
+    Build one job-match prompt for several (profile summary, job description) pairs.
+
+    A profile or job description shared by every pair is sent once, so this
+    covers both many resumes against one job and one resume against many jobs.
+    """
+    summaries = [summary for summary, _ in pairs]
+    descriptions = [description for _, description in pairs]
+    if len(set(descriptions)) == 1:
+        sections = "\n".join(f"CANDIDATE {i} PROFILE:\n{summary}" for i, summary in enumerate(summaries, 1))
+        sections += f"\nJOB DESCRIPTION (for every candidate):\n{descriptions[0]}"
+    elif len(set(summaries)) == 1:
+        sections = f"CANDIDATE PROFILE (for every job):\n{summaries[0]}\n"
+        sections += "\n".join(f"JOB DESCRIPTION {i}:\n{description}" for i, description in enumerate(descriptions, 1))
+    else:
+        sections = "\n".join(
+            f"CANDIDATE {i} PROFILE:\n{summary}\nJOB DESCRIPTION {i}:\n{description}"
+            for i, (summary, description) in enumerate(pairs, 1)
+        )
+    return PACKED_MATCH_TEMPLATE.format(sections=sections, count=len(pairs), schema=schema_spec("index", *MATCH_FIELDS))
+
+def plan_packs(sizes, overhead, completion_tokens, max_pack=DEFAULT_PACK_SIZE):
+    """
+    Group items into packs whose prompt and combined answer fit the model's context.
+
+    Args:
+        sizes (list): Prompt tokens each item adds
+        overhead (int): Prompt tokens of the pack itself
+        completion_tokens (int): Expected answer tokens per item
+        max_pack (int): Most items per pack
+
+    Returns:
+        list: Packs as lists of item indexes, in order
+    """
+    budget = input_budget() - overhead
+    max_items = max(1, min(max_pack, MAX_COMPLETION_TOKENS // completion_tokens))
+    packs = []
+    current = []
+    used = 0
+    for i, size in enumerate(sizes):
+        if current and (used + size > budget or len(current) >= max_items):
+            packs.append(current)
+            current = []
+            used = 0
+        current.append(i)
+        used += size
+    if current:
+        packs.append(current)
+    return packs
+
+def parse_packed_response(response_text, count):
+    """
+    Split a packed response into per-item objects.
+
+    Entries are matched by their "index" (or position), and coerced to the
+    analysis schema.
+
+    Returns:
+        list: count objects, None where an entry is missing or incomplete
+    """
+    entries = [None] * count
+    results = None
+    if response_text:
+        with span("json_parse"):
+            packed = extract_json_object(response_text, PACKED_SCHEMA)
+        results = packed.get("results") if packed else None
+    if not results:
+        increment("json_parse_failures_total")
+        return entries
+    for position, entry in enumerate(results):
+        index = entry.pop("index", None)
+        try:
+            index = int(index) - 1
+        except (TypeError, ValueError):
+            index = position
+        if not 0 <= index < count or entries[index] is not None:
+            continue
+        entry, matched = validate_schema(entry, ANALYSIS_SCHEMA)
+        if matched >= MIN_ENTRY_FIELDS:
+            entries[index] = entry
+    return entries
+
+def _has_packed_json(text):
+    return bool(text) and extract_json_object(text, PACKED_SCHEMA) is not None
+
+def _safely(fn, *args):
+    try:
+        return fn(*args)
+    except Exception as e:
+        return {"error": True, "message": str(e)}
+
+def _run_packs(stage, items, sizes, build_prompt, completion_tokens, finish, fallback, max_pack, workers):
+    # Packs run concurrently; items a pack could not answer are analyzed one by one
+    overhead = count_tokens(SYSTEM_PROMPT) + count_tokens(build_prompt([]))
+    packs = plan_packs(sizes, overhead, completion_tokens, max_pack)
+
+    def run(pack):
+        if len(pack) == 1:
+            return [_safely(fallback, items[pack[0]])]
+        with span("packed_request", stage=stage, items=len(pack)):
+            try:
+                # No learned output cap: the answer grows with the number of items
+                response_text = analyzer.analyzer._make_groq_request(
+                    build_prompt([items[i] for i in pack]), validate=_has_packed_json, kind=None
+                )
+            except Exception as e:
+                print(f"Packed {stage} request failed, analyzing separately: {str(e)}")
+                response_text = None
+        results = []
+        for i, entry in zip(pack, parse_packed_response(response_text, len(pack))):
+            increment("packed_items_total", stage=stage, result="packed" if entry is not None else "fallback")
+            results.append(_safely(finish, items[i], entry) if entry is not None else _safely(fallback, items[i]))
+        return results
+
+    results = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(packs) or 1))) as executor:
+        for pack, pack_results in zip(packs, executor.map(run, packs)):
+            for i, result in zip(pack, pack_results):
+                results[i] = result
+    return results
+
+def analyze_packed(pairs, max_pack=DEFAULT_PACK_SIZE, workers=1):
+    """
+    Analyze (resume_text, job_description) pairs, several per API request.
+
+    Resumes are profiled in packs of up to max_pack (long resumes that need
+    chunking are analyzed on their own), then every pair with a job
+    description is matched in packs of profile summaries. Results are
+    cached exactly like analyze_resume's, and an item whose entry is
+    missing from a packed response falls back to a single request.
+
+    Args:
+        pairs (list): (resume_text, job_description) tuples; "" for a general analysis
+        max_pack (int): Most resumes or matches per request
+        workers (int): Packed requests sent concurrently
+
+    Returns:
+        list: One result per pair, in order, with the same schema as analyze_resume
+    """
+    cache = analyzer.analyzer.cache
+    results = [None] * len(pairs)
+    for i, (resume_text, job_description) in enumerate(pairs):
+        results[i] = cache.get(analyzer.analyzer._get_cache_key(resume_text, job_description))
+        increment("analysis_cache_total", result="hit" if results[i] is not None else "miss")
+
+    # Stage 1: job-independent profiles, one per distinct resume
+    profiles = {}
+    to_profile = []
+    for i, (resume_text, _) in enumerate(pairs):
+        if results[i] is not None or resume_text in profiles:
+            continue
+        profiles[resume_text] = cache.get(analyzer.analyzer._get_cache_key(resume_text, ""))
+        if profiles[resume_text] is None:
+            to_profile.append(resume_text)
+
+    def finish_profile(resume_text, entry):
+        result = finalize_analysis_result(entry)
+        cache.set(analyzer.analyzer._get_cache_key(resume_text, ""), result)
+        return result
+
+    packable = [text for text in to_profile if len(plan_analysis(text)[0]) == 1]
+    for text in to_profile:
+        if text not in packable:
+            profiles[text] = _safely(get_resume_profile, text)
+    profiled = _run_packs(
+        "profile", packable, [count_tokens(text) for text in packable], build_packed_analysis_prompt,
+        ANALYSIS_COMPLETION_TOKENS, finish_profile, get_resume_profile, max_pack, workers
+    )
+    profiles.update(zip(packable, profiled))
+
+    # Stage 2: job matches from compact profile summaries
+    matches = []
+    for i, (resume_text, job_description) in enumerate(pairs):
+        if results[i] is not None:
+            continue
+        profile = profiles[resume_text]
+        if profile.get("error") or not job_description.strip():
+            results[i] = profile
+        else:
+            matches.append((i, summarize_profile(profile, resume_text), fit_job_description(job_description)))
+
+    def finish_match(item, entry):
+        i, _, description = item
+        resume_text, job_description = pairs[i]
+        result = combine_profile_and_match(profiles[resume_text], entry, resume_text, description)
+        cache.set(analyzer.analyzer._get_cache_key(resume_text, job_description), result)
+        return result
+
+    matched = _run_packs(
+        "match", matches, [count_tokens(summary) + count_tokens(description) for _, summary, description in matches],
+        lambda items: build_packed_match_prompt([(summary, description) for _, summary, description in items]),
+        MATCH_COMPLETION_TOKENS, finish_match, lambda item: analyze_resume(*pairs[item[0]]), max_pack, workers
+    )
+    for (i, _, _), result in zip(matches, matched):
+        results[i] = result
+    return results
+
+def analyze_resumes_packed(resume_texts, job_description="", max_pack=DEFAULT_PACK_SIZE, workers=1):
+    """Analyze several resumes, optionally against one job description, packing requests."""
+    return analyze_packed([(text, job_description) for text in resume_texts], max_pack, workers)
+
+def analyze_resume_against_jobs(resume_text, job_descriptions, max_pack=DEFAULT_PACK_SIZE, workers=1):
+    """Match one resume against several job descriptions, packing requests."""
+    return analyze_packed([(resume_text, description) for description in job_descriptions], max_pack, workers)
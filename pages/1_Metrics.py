@@ -0,0 +1,128 @@
+import os
+import hmac
+import time
+import streamlit as st
+from metrics import get_registry
+from groq_client import get_governor, get_completion_budget, load_environment
+from routing import get_router
+from utils import setup_page, display_rate_limit_usage
+
+def check_admin_access():
+    """
+    Ask for METRICS_ADMIN_PASSWORD (secrets or environment).
+
+    The page shows model and circuit state and can reset the metrics, so it
+    stays closed until a password is configured.
+    """
+    try:
+        password = st.secrets.get("METRICS_ADMIN_PASSWORD")
+    except Exception:
+        password = None
+    password = password or os.getenv("METRICS_ADMIN_PASSWORD")
+    if not password:
+        st.info("🔒 Set METRICS_ADMIN_PASSWORD (in the environment or Streamlit secrets) to enable this page.")
+        return False
+    entered = st.text_input("Admin password", type="password")
+    if entered and not hmac.compare_digest(entered, password):
+        st.error("❌ Incorrect password")
+        return False
+    return bool(entered)
+
+def main():
+    load_environment()
+    setup_page()
+    st.title("📈 Performance Metrics")
+    st.write("Per-stage latency and counters for this server process since it started")
+
+    if not check_admin_access():
+        return
+
+    registry = get_registry()
+    snapshot = registry.snapshot()
+    display_rate_limit_usage(get_governor().usage())
+
+    col1, col2, col3, col4 = st.columns(4)
+    counters = snapshot["counters"]
+    cache = counters.get("analysis_cache_total", {})
+    hits, misses = cache.get("result=hit", 0), cache.get("result=miss", 0)
+    col1.metric("Uptime", f"{int(snapshot['uptime_seconds'] // 60)} min")
+    col2.metric("Analysis cache hit rate", f"{hits / (hits + misses):.0%}" if hits + misses else "n/a")
+    col3.metric("Groq retries", sum(counters.get("groq_retries_total", {}).values()))
+    col4.metric("Rate-limit waits", sum(counters.get("rate_limit_waits_total", {}).values()))
+
+    st.subheader("⏱️ Stage Latency (rolling window)")
+    stages = [s for s in snapshot["stages"] if s["metric"] == "stage_duration_seconds"]
+    if stages:
+        st.dataframe(
+            [{k: v for k, v in s.items() if k != "metric"} for s in stages],
+            use_container_width=True, hide_index=True
+        )
+    else:
+        st.info("No requests recorded yet. Analyze a resume to populate the metrics.")
+    other = [s for s in snapshot["stages"] if s["metric"] != "stage_duration_seconds"]
+    if other:
+        st.dataframe(other, use_container_width=True, hide_index=True)
+
+    st.subheader("🔤 Tokens per Call (rolling window)")
+    if snapshot["sizes"]:
+        st.dataframe(snapshot["sizes"], use_container_width=True, hide_index=True)
+    caps = get_completion_budget().status()
+    if caps:
+        st.caption("Output caps learned per prompt kind")
+        st.dataframe(
+            [{"kind": kind, **status} for kind, status in caps.items()],
+            use_container_width=True, hide_index=True
+        )
+    if not snapshot["sizes"] and not caps:
+        st.info("No model calls recorded yet.")
+
+    st.subheader("🔀 Model Routing")
+    routes = get_router().status()
+    if routes:
+        st.dataframe(
+            [{"model": model, **status} for model, status in sorted(routes.items())],
+            use_container_width=True, hide_index=True
+        )
+    else:
+        st.info("No model calls recorded yet.")
+
+    st.subheader("🔢 Counters")
+    if counters:
+        st.dataframe(
+            [{"counter": name, "labels": labels, "value": value}
+             for name, by_label in sorted(counters.items()) for labels, value in sorted(by_label.items())],
+            use_container_width=True, hide_index=True
+        )
+
+    st.subheader("🧵 Recent Spans")
+    spans = snapshot["spans"][-50:][::-1]
+    if spans:
+        st.dataframe(
+            [{
+                "time": time.strftime("%H:%M:%S", time.localtime(s["start"])),
+                "stage": s["name"],
+                "parent": s["parent"] or "",
+                "duration_ms": round(s["duration"] * 1000, 1),
+                "error": s["error"] or "",
+                "trace": s["trace_id"],
+                "attributes": ", ".join(f"{k}={v}" for k, v in s["attributes"].items()),
+            } for s in spans],
+            use_container_width=True, hide_index=True
+        )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="📥 Download Prometheus Metrics",
+            data=registry.render_prometheus(),
+            file_name="metrics.prom",
+            mime="text/plain",
+            use_container_width=True
+        )
+    with col2:
+        if st.button("🔄 Reset Metrics", use_container_width=True):
+            registry.reset()
+            st.rerun()
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,71 @@
 import os
-import tempfile
-from fpdf import FPDF
 import streamlit as st
 import traceback
 import json
 import re
-from groq import Groq
-
-
-
-class UTF8ResumePDF(FPDF):
-    """Custom PDF class for generating improved resumes with UTF-8 support"""
-    
-    def __init__(self):
-        super().__init__()
-        # Add a default font with UTF-8 support
-        self.add_font('DejaVu', '', 'DejaVuSansCondensed.ttf', uni=True)
-        self.add_font('DejaVu', 'B', 'DejaVuSansCondensed-Bold.ttf', uni=True)
-        self.add_font('DejaVu', 'I', 'DejaVuSansCondensed-Oblique.ttf', uni=True)
-    
-    def header(self):
-        """Add header to the PDF"""
-        self.set_font('Arial', 'B', 15)
-        self.cell(0, 10, 'Improved Resume', 0, 1, 'C')
-        self.ln(5)
-        
-    def footer(self):
-        """Add footer to the PDF"""
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-        
-    def chapter_title(self, title):
-        """Add a chapter title"""
-        self.set_font('Arial', 'B', 12)
-        self.set_fill_color(200, 220, 255)
-        self.cell(0, 6, title, 0, 1, 'L', 1)
-        self.ln(4)
-        
-    def chapter_body(self, body):
-        """Add chapter content"""
-        self.set_font('Arial', '', 11)
-        self.multi_cell(0, 5, body)
-        self.ln(5)
+from groq_client import get_api_key, get_client, get_governor, get_completion_budget
+from routing import get_router
+from metrics import span, increment, record_token_usage
+from chunking import count_tokens, input_budget, plan_chunks, fit_job_description, is_heading
+from pdf_render import render_resume_pdf
+from normalization import normalize_text, to_latin1
+from prompts import REWRITE_SYSTEM_PROMPT, REWRITE_TEMPLATE, REWRITE_FULL_SCOPE, REWRITE_PART_SCOPE
+
+
 
 def sanitize_text(text):
     """
-    Sanitize text for FPDF to handle special characters
+    Sanitize text for the FPDF fallback renderer, whose core fonts only cover Latin-1
+    """
+    return to_latin1(text)
+
+def pdf_to_bytes(pdf):
+    """Render an FPDF document in memory (fpdf 1.7 returns a latin-1 str for dest='S')."""
+    output = pdf.output(dest='S')
+    return output.encode('latin-1') if isinstance(output, str) else bytes(output)
+
+def render_pdf_fpdf(text):
     """
-    # Replace common problematic characters
-    replacements = {
-        '\u2013': '-',  # en-dash
-        '\u2014': '-',  # em-dash
-        '\u2018': "'",  # left single quote
-        '\u2019': "'",  # right single quote
-        '\u201c': '"',  # left double quote
-        '\u201d': '"',  # right double quote
-        '\u2022': '*',  # bullet
-        '\u2026': '...',  # ellipsis
-        '\u00a0': ' ',  # non-breaking space
-    }
-    
-    for char, replacement in replacements.items():
-        text = text.replace(char, replacement)
-    
-    # Replace any other non-Latin1 characters with their closest ASCII equivalent or remove them
-    return re.sub(r'[^\x00-\x7F]+', '', text)
+    Render resume text with FPDF core fonts (Latin-1 only).
+
+    Fallback for when the native renderer in pdf_render fails; pass text
+    through sanitize_text first.
+    """
+    from fpdf import FPDF  # Only used when the native renderer fails
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=11)
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.set_font("Arial", 'B', size=16)
+    pdf.cell(0, 10, "Improved Resume", ln=True, align='C')
+    pdf.ln(5)
+    pdf.set_font("Arial", size=11)
+    pdf_text = text.encode('latin-1', 'replace').decode('latin-1')
+    for line in pdf_text.split('\n'):
+        if is_heading(line):
+            pdf.set_font("Arial", 'B', size=12)
+            pdf.ln(3)
+            pdf.cell(0, 6, line, ln=True)
+            pdf.set_font("Arial", size=11)
+            pdf.ln(2)
+        else:
+            if line.strip().startswith('•') or line.strip().startswith('-') or line.strip().startswith('*'):
+                indent = 5
+                pdf.set_x(pdf.get_x() + indent)
+                width = pdf.w - pdf.l_margin - pdf.r_margin - indent
+                pdf.multi_cell(width, 5, line)
+            else:
+                pdf.multi_cell(0, 5, line)
+    return pdf_to_bytes(pdf)
+
+def build_rewrite_prompt(resume_text, formatted_suggestions, job_desc_section="", part=None, total_parts=None):
+    """Build the rewrite prompt for a whole resume or one part of a long resume."""
+    if part is not None and total_parts and total_parts > 1:
+        scope = REWRITE_PART_SCOPE.format(part=part, total_parts=total_parts)
+    else:
+        scope = REWRITE_FULL_SCOPE
+    return REWRITE_TEMPLATE.format(job_section=job_desc_section, resume=resume_text,
+                                   suggestions=formatted_suggestions.strip(), scope=scope)
 
 def generate_improved_resume(original_resume_text, improvement_suggestions, job_description=None):
     """
@@ -75,7 +75,7 @@ def generate_improved_resume(original_resume_text, improvement_suggestions, job_
         improvement_suggestions (list): List of improvement suggestions from AI analysis
         job_description (str, optional): Job description for targeted improvements
     Returns:
-        str: Path to the generated PDF file
+        bytes: The generated PDF document, or None on failure
     """
     try:
         # Format improvement suggestions for the prompt
@@ -85,60 +85,96 @@ def generate_improved_resume(original_resume_text, improvement_suggestions, job_
                 category = suggestion.get("category", f"Suggestion {i+1}")
                 current = suggestion.get("current", "")
                 suggested = suggestion.get("suggested_improvement", "")
-                formatted_suggestions += f"- {category}:\n  Current: {current}\n  Suggested: {suggested}\n\n"
+                formatted_suggestions += f"- {category}\n  Current: {current}\n  Suggested: {suggested}\n"
         else:
-            formatted_suggestions = "No specific suggestions provided. Please improve the general formatting, clarity, and professionalism of the resume."
+            formatted_suggestions = "None given; improve the general formatting, clarity and professionalism."
 
-        # Create a prompt for Groq API to rewrite the resume
+        # Long resumes are rewritten part by part so nothing is cut off
+        if job_description:
+            job_description = fit_job_description(job_description)
         job_desc_section = f"\nJOB DESCRIPTION:\n{job_description}" if job_description else ""
-        prompt = f"""
-        You are an expert resume writer. Rewrite the following resume by implementing these specific improvements:
-        {job_desc_section}
-        ORIGINAL RESUME:
-        {original_resume_text}
-        IMPROVEMENTS TO IMPLEMENT:
-        {formatted_suggestions}
-        Please rewrite the entire resume with these improvements while maintaining the same core information.
-        Structure the resume in standard sections: Contact Information, Summary, Experience, Education, Skills.
-        Use bullet points for accomplishments and make them quantifiable where possible.
-        Focus on clarity, conciseness, and professional formatting.
-        Return ONLY the improved resume text with section headers, no additional explanations.
-        Use only ASCII characters (no special quotes, dashes, etc.) to ensure compatibility with all systems.
-        """
-
-        # Get API key from Streamlit secrets
+        overhead = count_tokens(REWRITE_SYSTEM_PROMPT) + count_tokens(
+            build_rewrite_prompt("", formatted_suggestions, job_desc_section, 1, 2)
+        )
+        chunks = plan_chunks(original_resume_text, max(input_budget() - overhead, 500))
+
+        # Reuse the shared client (API key from Streamlit secrets or environment)
         try:
-            api_key = st.secrets["GROQ_API_KEY"]
-            client = Groq(api_key=api_key)
+            client = get_client(get_api_key())
         except Exception as e:
             st.error(f"Error accessing Groq API key: {str(e)}")
             return None
 
         # Generate improved resume content using Groq API
         try:
-            chat_completion = client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert resume writer. Always respond with only the improved resume text, no additional text or formatting."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model="llama3-8b-8192",
-                temperature=0.3,
-                max_tokens=4000,
-                top_p=0.9,
-                stream=False
-            )
-            improved_resume_text = chat_completion.choices[0].message.content
+            router = get_router()
+            budget = get_completion_budget()
+            rewritten = []
+            for i, chunk in enumerate(chunks):
+                if len(chunks) == 1:
+                    prompt = build_rewrite_prompt(chunk, formatted_suggestions, job_desc_section)
+                else:
+                    prompt = build_rewrite_prompt(chunk, formatted_suggestions, job_desc_section, i + 1, len(chunks))
+                with span("rate_limit_wait", source="resume_generation"):
+                    get_governor().acquire(
+                        "resume_generation",
+                        on_wait=lambda wait_time: st.info(f"Rate limit reached. Waiting {int(wait_time) + 1} seconds...")
+                    )
+
+                def request(model, prompt=prompt, chunk=chunk, kind="rewrite"):
+                    # The rewrite is about as long as the part it rewrites
+                    max_tokens = budget.max_tokens(kind, minimum=2 * count_tokens(chunk))
+                    chat_completion = client.chat.completions.create(
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": REWRITE_SYSTEM_PROMPT
+                            },
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ],
+                        model=model,
+                        temperature=0.3,
+                        max_tokens=max_tokens,
+                        top_p=0.9,
+                        stream=False
+                    )
+                    _, completion_tokens = record_token_usage(getattr(chat_completion, "usage", None), "resume_generation")
+                    choice = chat_completion.choices[0]
+                    truncated = choice.finish_reason == "length"
+                    budget.record(kind, completion_tokens, truncated)
+                    if truncated and max_tokens < budget.ceiling:
+                        # A cut-off resume is unusable; ask again with the full cap
+                        get_governor().acquire("resume_generation")
+                        return request(model, prompt, chunk, None)
+                    return choice.message.content
+
+                # Rewrites go to the larger model, with hedging and failover to the next one
+                with span("groq_request", source="resume_generation", part=i + 1, model=router.primary("rewrite")):
+                    content = router.call(
+                        "rewrite", request, validate=lambda text: bool(text and text.strip()), source="resume_generation"
+                    )
+                increment("groq_requests_total", source="resume_generation", status="ok")
+                rewritten.append(content.strip())
+            improved_resume_text = "\n\n".join(rewritten)
         except Exception as e:
+            increment("groq_requests_total", source="resume_generation", status="error")
             st.error(f"Error generating content with Groq API: {str(e)}")
             st.error(traceback.format_exc())
             return None
 
+        # Same cleanup as extracted text: whitespace, ligatures, bullets, hyphenation
+        improved_resume_text = normalize_text(improved_resume_text)
+
+        # Native renderer: Unicode text, fonts parsed once per process
+        try:
+            with span("pdf_render", renderer="native"):
+                return render_resume_pdf(improved_resume_text)
+        except Exception as e:
+            print(f"Native PDF rendering failed, falling back to FPDF: {str(e)}")
+
         # Sanitize the text to handle problematic characters
         try:
             improved_resume_text = sanitize_text(improved_resume_text)
@@ -149,39 +185,13 @@ def generate_improved_resume(original_resume_text, improvement_suggestions, job_
 
         # Use simpler approach with plain text
         try:
-            # Create a simple single-section PDF
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_font("Arial", size=11)
-            pdf.set_auto_page_break(auto=True, margin=15)
-            pdf.set_font("Arial", 'B', size=16)
-            pdf.cell(0, 10, "Improved Resume", ln=True, align='C')
-            pdf.ln(5)
-            pdf.set_font("Arial", size=11)
-            pdf_text = improved_resume_text.encode('latin-1', 'replace').decode('latin-1')
-            for line in pdf_text.split('\n'):
-                if line.isupper() or (line.strip().endswith(':') and len(line) < 30):
-                    pdf.set_font("Arial", 'B', size=12)
-                    pdf.ln(3)
-                    pdf.cell(0, 6, line, ln=True)
-                    pdf.set_font("Arial", size=11)
-                    pdf.ln(2)
-                else:
-                    if line.strip().startswith('•') or line.strip().startswith('-') or line.strip().startswith('*'):
-                        indent = 5
-                        pdf.set_x(pdf.get_x() + indent)
-                        width = pdf.w - pdf.l_margin - pdf.r_margin - indent
-                        pdf.multi_cell(width, 5, line)
-                    else:
-                        pdf.multi_cell(0, 5, line)
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                tmp_filepath = tmp_file.name
-            pdf.output(tmp_filepath)
-            return tmp_filepath
+            with span("pdf_render", renderer="fpdf"):
+                return render_pdf_fpdf(improved_resume_text)
         except Exception as e:
             st.error(f"Error generating PDF: {str(e)}")
             st.error(traceback.format_exc())
             try:
+                from fpdf import FPDF
                 pdf = FPDF()
                 pdf.add_page()
                 pdf.set_font("Arial", size=11)
@@ -192,11 +202,9 @@ def generate_improved_resume(original_resume_text, improvement_suggestions, job_
                         pdf.cell(0, 5, chunk, ln=True)
                     except:
                         continue
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                    tmp_filepath = tmp_file.name
-                pdf.output(tmp_filepath)
+                pdf_bytes = pdf_to_bytes(pdf)
                 st.warning("Could only generate a simplified version of the resume due to character encoding issues.")
-                return tmp_filepath
+                return pdf_bytes
             except Exception as final_e:
                 st.error("Failed to generate PDF.")
                 return None
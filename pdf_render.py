@@ -0,0 +1,536 @@
+import os
+import re
+import zlib
+import struct
+import hashlib
+import threading
+from collections import OrderedDict
+from chunking import is_heading
+
+# A4 page geometry in points, matching the previous FPDF layout (1 cm margins, 1.5 cm page-break margin)
+MM = 72 / 25.4
+PAGE_WIDTH = 210 * MM
+PAGE_HEIGHT = 297 * MM
+MARGIN = 10 * MM
+BOTTOM_MARGIN = 15 * MM
+CELL_MARGIN = 1 * MM
+
+# Unicode TrueType fonts looked up in order (override with PDF_FONT_REGULAR / PDF_FONT_BOLD or PDF_FONT_DIR)
+FONT_FILES = {
+    "regular": ("DejaVuSansCondensed.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf", "Arial.ttf", "arial.ttf"),
+    "bold": ("DejaVuSansCondensed-Bold.ttf", "DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf", "Arial Bold.ttf", "arialbd.ttf"),
+}
+FONT_DIRS = (
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts"),
+    "/usr/share/fonts/truetype/dejavu",
+    "/usr/share/fonts/dejavu",
+    "/usr/share/fonts/TTF",
+    "/usr/share/fonts/truetype/liberation",
+    "/Library/Fonts",
+    "C:\\Windows\\Fonts",
+)
+# Standard PDF fonts used when no TrueType font is available (Windows-1252 characters only)
+STANDARD_FONTS = {"regular": ("Helvetica", "helvetica"), "bold": ("Helvetica-Bold", "helveticaB")}
+RESOURCE_NAMES = {"regular": "F1", "bold": "F2"}
+# Tables a PDF viewer needs from an embedded TrueType font
+EMBEDDED_TABLES = ("head", "hhea", "maxp", "hmtx", "loca", "glyf", "cvt ", "fpgm", "prep")
+# Always embedded, so documents in plain English share one cached font subset
+BASE_CHARS = frozenset(chr(c) for c in range(32, 127))
+MAX_CACHED_SUBSETS = 64
+
+_fonts = None
+_fonts_lock = threading.Lock()
+
+def _checksum(data):
+    data += b"\0" * (-len(data) % 4)
+    return sum(struct.unpack(f">{len(data) // 4}I", data)) & 0xFFFFFFFF
+
+class TrueTypeFont:
+    """
+    Metrics and outlines of a TrueType font, parsed once per process.
+
+    Text is written as the font's own 2-byte glyph IDs (Identity-H); each
+    document embeds a renumbered subset with a CIDToGIDMap, and subsets are
+    cached by glyph set.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        self.path = path
+        self.name = re.sub(r"[^A-Za-z0-9-]", "", os.path.splitext(os.path.basename(path))[0]) or "Font"
+        version, num_tables = struct.unpack(">IH", data[:6])
+        if version not in (0x00010000, 0x74727565):
+            raise ValueError(f"{path} is not a TrueType font with glyf outlines")
+        self.tables = {}
+        for i in range(num_tables):
+            tag, _, offset, length = struct.unpack(">4sIII", data[12 + 16 * i:28 + 16 * i])
+            self.tables[tag.decode("latin-1")] = data[offset:offset + length]
+        missing = [tag for tag in ("head", "hhea", "maxp", "hmtx", "loca", "glyf", "cmap") if tag not in self.tables]
+        if missing:
+            raise ValueError(f"{path} is missing font tables: {', '.join(missing)}")
+
+        head = self.tables["head"]
+        units_per_em = struct.unpack(">H", head[18:20])[0]
+        scale = 1000 / units_per_em
+        self.bbox = [round(v * scale) for v in struct.unpack(">hhhh", head[36:44])]
+        long_loca = struct.unpack(">h", head[50:52])[0] == 1
+
+        hhea = self.tables["hhea"]
+        ascender, descender = struct.unpack(">hh", hhea[4:8])
+        num_hmetrics = struct.unpack(">H", hhea[34:36])[0]
+        self.ascent, self.descent = round(ascender * scale), round(descender * scale)
+        os2 = self.tables.get("OS/2")
+        if os2 and len(os2) >= 90 and struct.unpack(">H", os2[:2])[0] >= 2:
+            self.cap_height = round(struct.unpack(">h", os2[88:90])[0] * scale)
+        else:
+            self.cap_height = self.ascent
+
+        self.num_glyphs = struct.unpack(">H", self.tables["maxp"][4:6])[0]
+        hmtx = self.tables["hmtx"]
+        metrics = struct.unpack(">" + "Hh" * num_hmetrics, hmtx[:4 * num_hmetrics])
+        advances = list(metrics[0::2])
+        advances += advances[-1:] * (self.num_glyphs - num_hmetrics)
+        extra = self.num_glyphs - num_hmetrics
+        self.bearings = list(metrics[1::2]) + list(struct.unpack(f">{extra}h", hmtx[4 * num_hmetrics:4 * num_hmetrics + 2 * extra]))
+        self.advances = advances
+        self.glyph_widths = [round(a * scale) for a in advances]
+
+        count = self.num_glyphs + 1
+        loca = self.tables["loca"]
+        if long_loca:
+            self.loca = struct.unpack(f">{count}I", loca[:4 * count])
+        else:
+            self.loca = [o * 2 for o in struct.unpack(f">{count}H", loca[:2 * count])]
+        self.glyf = self.tables["glyf"]
+
+        self.cmap = self._parse_cmap(self.tables["cmap"])
+        # Per-character lookups used on every line of every document
+        self.widths = {chr(c): self.glyph_widths[g] for c, g in self.cmap.items()}
+        self.codes = {chr(c): f"{g:04X}" for c, g in self.cmap.items()}
+        self.missing_width = self.glyph_widths[0]
+        self.glyph_chars = {}
+        for c, g in sorted(self.cmap.items()):
+            self.glyph_chars.setdefault(g, chr(c))
+        self.lock = threading.Lock()
+        self.subsets = OrderedDict()
+
+    @staticmethod
+    def _parse_cmap(cmap):
+        """Map code points to glyph IDs from a format 12 or format 4 Unicode subtable."""
+        subtables = {}
+        for i in range(struct.unpack(">H", cmap[2:4])[0]):
+            platform, encoding, offset = struct.unpack(">HHI", cmap[4 + 8 * i:12 + 8 * i])
+            subtables[(platform, encoding)] = offset
+        for key in ((3, 10), (0, 4), (3, 1), (0, 3)):
+            offset = subtables.get(key)
+            if offset is None:
+                continue
+            fmt = struct.unpack(">H", cmap[offset:offset + 2])[0]
+            mapping = {}
+            if fmt == 12:
+                groups = struct.unpack(">I", cmap[offset + 12:offset + 16])[0]
+                for i in range(groups):
+                    start, end, glyph = struct.unpack(">III", cmap[offset + 16 + 12 * i:offset + 28 + 12 * i])
+                    for c in range(start, end + 1):
+                        mapping[c] = glyph + c - start
+                return mapping
+            if fmt == 4:
+                segments = struct.unpack(">H", cmap[offset + 6:offset + 8])[0] // 2
+                ends = struct.unpack(f">{segments}H", cmap[offset + 14:offset + 14 + 2 * segments])
+                starts = struct.unpack(f">{segments}H", cmap[offset + 16 + 2 * segments:offset + 16 + 4 * segments])
+                deltas = struct.unpack(f">{segments}H", cmap[offset + 16 + 4 * segments:offset + 16 + 6 * segments])
+                range_pos = offset + 16 + 6 * segments
+                range_offsets = struct.unpack(f">{segments}H", cmap[range_pos:range_pos + 2 * segments])
+                for i in range(segments):
+                    for c in range(starts[i], ends[i] + 1):
+                        if c == 0xFFFF:
+                            continue
+                        if range_offsets[i] == 0:
+                            glyph = (c + deltas[i]) & 0xFFFF
+                        else:
+                            address = range_pos + 2 * i + range_offsets[i] + 2 * (c - starts[i])
+                            glyph = struct.unpack(">H", cmap[address:address + 2])[0]
+                            glyph = (glyph + deltas[i]) & 0xFFFF if glyph else 0
+                        if glyph:
+                            mapping[c] = glyph
+                return mapping
+        raise ValueError("Font has no Unicode character map")
+
+    def width(self, text, size):
+        """Width of text in points at the given font size."""
+        widths, missing = self.widths, self.missing_width
+        return sum([widths.get(c, missing) for c in text]) * size / 1000
+
+    def encode(self, text):
+        """Hex string operand for a text-showing operator."""
+        codes = self.codes
+        return "".join([codes.get(c, "0000") for c in text])
+
+    def _components(self, glyph):
+        """(offset, glyph ID) of each component of a composite glyph."""
+        data = self.glyf[self.loca[glyph]:self.loca[glyph + 1]]
+        if len(data) < 10 or struct.unpack(">h", data[:2])[0] >= 0:
+            return []
+        components = []
+        pos = 10
+        while True:
+            flags, component = struct.unpack(">HH", data[pos:pos + 4])
+            components.append((pos + 2, component))
+            pos += 4 + (4 if flags & 0x0001 else 2)
+            if flags & 0x0008:
+                pos += 2
+            elif flags & 0x0040:
+                pos += 4
+            elif flags & 0x0080:
+                pos += 8
+            if not flags & 0x0020:
+                return components
+
+    def subset(self, glyphs):
+        """
+        Build a font file containing only the given glyphs (and their components).
+
+        Returns:
+            tuple: (TrueType font bytes, {original glyph ID: glyph ID in the subset})
+        """
+        keep = set(glyphs) | {0}
+        pending = list(keep)
+        while pending:
+            for _, component in self._components(pending.pop()):
+                if component not in keep:
+                    keep.add(component)
+                    pending.append(component)
+        order = sorted(keep)
+        new_ids = {glyph: i for i, glyph in enumerate(order)}
+
+        glyf = bytearray()
+        loca = []
+        for glyph in order:
+            loca.append(len(glyf))
+            data = bytearray(self.glyf[self.loca[glyph]:self.loca[glyph + 1]])
+            for offset, component in self._components(glyph):
+                data[offset:offset + 2] = struct.pack(">H", new_ids[component])
+            glyf += data + b"\0" * (-len(data) % 4)
+        loca.append(len(glyf))
+
+        head = bytearray(self.tables["head"])
+        head[8:12] = b"\0\0\0\0"
+        head[50:52] = struct.pack(">h", 1)
+        hhea = bytearray(self.tables["hhea"])
+        hhea[34:36] = struct.pack(">H", len(order))
+        maxp = bytearray(self.tables["maxp"])
+        maxp[4:6] = struct.pack(">H", len(order))
+        hmtx = b"".join(struct.pack(">Hh", self.advances[glyph], self.bearings[glyph]) for glyph in order)
+        tables = {tag: self.tables[tag] for tag in EMBEDDED_TABLES if tag in self.tables}
+        tables.update(head=bytes(head), hhea=bytes(hhea), maxp=bytes(maxp), hmtx=hmtx, glyf=bytes(glyf),
+                      loca=struct.pack(f">{len(loca)}I", *loca))
+
+        count = len(tables)
+        entry_selector = count.bit_length() - 1
+        search_range = 16 * (1 << entry_selector)
+        header = struct.pack(">IHHHH", 0x00010000, count, search_range, entry_selector, count * 16 - search_range)
+        directory = bytearray()
+        body = bytearray()
+        offset = len(header) + 16 * count
+        head_offset = 0
+        for tag in sorted(tables):
+            data = tables[tag]
+            if tag == "head":
+                head_offset = offset + len(body)
+            directory += struct.pack(">4sIII", tag.encode("latin-1"), _checksum(data), offset + len(body), len(data))
+            body += data + b"\0" * (-len(data) % 4)
+        font = bytearray(header + directory + body)
+        font[head_offset + 8:head_offset + 12] = struct.pack(">I", (0xB1B0AFBA - _checksum(bytes(font))) & 0xFFFFFFFF)
+        return bytes(font), new_ids
+
+    def embedding(self, chars):
+        """
+        Compressed font file and PDF font data for a document that uses chars.
+
+        Returns:
+            dict: name, glyphs (CIDs used), font_file, length1, cid_to_gid and to_unicode
+        """
+        cmap = self.cmap
+        glyphs = frozenset(g for g in (cmap.get(ord(c)) for c in BASE_CHARS.union(chars)) if g)
+        with self.lock:
+            cached = self.subsets.get(glyphs)
+            if cached is not None:
+                self.subsets.move_to_end(glyphs)
+                return cached
+
+        order = sorted(glyphs)
+        font_data, new_ids = self.subset(order)
+        cid_to_gid = bytearray(2 * (order[-1] + 1) if order else 2)
+        for glyph, new_id in new_ids.items():
+            cid_to_gid[2 * glyph:2 * glyph + 2] = struct.pack(">H", new_id)
+        # Subset fonts are named with a tag derived from their glyph set
+        digest = hashlib.md5(",".join(map(str, order)).encode("ascii")).digest()
+        mappings = [f"<{glyph:04X}> <{self.glyph_chars[glyph].encode('utf-16-be').hex().upper()}>"
+                    for glyph in order if glyph in self.glyph_chars]
+        blocks = "".join(
+            f"{len(mappings[i:i + 100])} beginbfchar\n" + "\n".join(mappings[i:i + 100]) + "\nendbfchar\n"
+            for i in range(0, len(mappings), 100)
+        )
+        to_unicode = (
+            "/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n"
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+            "/CMapName /Adobe-Identity-UCS def\n/CMapType 2 def\n"
+            "1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n"
+            f"{blocks}endcmap\nCMapName currentdict /CMap defineresource pop\nend\nend"
+        )
+        embedded = {
+            "name": "".join(chr(65 + b % 26) for b in digest[:6]) + "+" + self.name,
+            "glyphs": order,
+            "font_file": zlib.compress(font_data),
+            "length1": len(font_data),
+            "cid_to_gid": zlib.compress(bytes(cid_to_gid)),
+            "to_unicode": zlib.compress(to_unicode.encode("latin-1")),
+        }
+        with self.lock:
+            self.subsets[glyphs] = embedded
+            while len(self.subsets) > MAX_CACHED_SUBSETS:
+                self.subsets.popitem(last=False)
+        return embedded
+
+class StandardFont:
+    """One of the standard PDF fonts; needs no embedding but only covers Windows-1252"""
+
+    def __init__(self, name, metrics):
+        # Only needed without a TrueType font, so fpdf is not imported up front
+        from fpdf.fonts import fpdf_charwidths
+        self.name = name
+        table = fpdf_charwidths[metrics]
+        self.widths = {}
+        for byte in range(256):
+            try:
+                self.widths[bytes([byte]).decode("cp1252")] = table[chr(byte)]
+            except UnicodeDecodeError:
+                continue
+        self.missing_width = table["?"]
+
+    def width(self, text, size):
+        widths, missing = self.widths, self.missing_width
+        return sum([widths.get(c, missing) for c in text]) * size / 1000
+
+    def encode(self, text):
+        return text.encode("cp1252", "replace").hex().upper()
+
+def find_font_file(names):
+    directories = [os.getenv("PDF_FONT_DIR")] + list(FONT_DIRS)
+    for directory in directories:
+        if not directory:
+            continue
+        for name in names:
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                return path
+    return None
+
+def load_fonts():
+    """
+    Load the regular and bold fonts.
+
+    Returns:
+        dict: "regular" and "bold" -> TrueTypeFont, or StandardFont when no
+            usable TrueType font is found
+    """
+    fonts = {}
+    for style, names in FONT_FILES.items():
+        path = os.getenv(f"PDF_FONT_{style.upper()}") or find_font_file(names)
+        if path:
+            try:
+                fonts[style] = TrueTypeFont(path)
+                continue
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Could not load PDF font {path}: {str(e)}")
+        fonts[style] = None
+    if fonts["bold"] is None and isinstance(fonts["regular"], TrueTypeFont):
+        # Non-Latin text matters more than bold headings
+        fonts["bold"] = fonts["regular"]
+    for style, font in fonts.items():
+        if font is None:
+            print(f"No Unicode {style} font found for PDFs; using {STANDARD_FONTS[style][0]}")
+            fonts[style] = StandardFont(*STANDARD_FONTS[style])
+    return fonts
+
+def get_fonts():
+    """Return the process-wide fonts, parsing the font files on first use."""
+    global _fonts
+    if _fonts is None:
+        with _fonts_lock:
+            if _fonts is None:
+                _fonts = load_fonts()
+    return _fonts
+
+def wrap_text(text, font, size, max_width):
+    """Break text into lines no wider than max_width, at spaces where possible."""
+    lines = []
+    space = font.width(" ", size)
+    line, line_width = [], 0.0
+    for word in text.split(" "):
+        word_width = font.width(word, size)
+        if word_width > max_width:
+            # Split a word that does not fit on a line of its own
+            if line:
+                lines.append(" ".join(line))
+            piece = ""
+            for char in word:
+                if piece and font.width(piece + char, size) > max_width:
+                    lines.append(piece)
+                    piece = ""
+                piece += char
+            line, line_width = [piece], font.width(piece, size)
+            continue
+        needed = line_width + space + word_width if line else word_width
+        if line and needed > max_width:
+            lines.append(" ".join(line))
+            line, line_width = [word], word_width
+        else:
+            line.append(word)
+            line_width = needed
+    lines.append(" ".join(line))
+    return lines
+
+class _Document:
+    def __init__(self, fonts):
+        self.fonts = fonts
+        self.pages = []
+        self.used = {style: set() for style in fonts}
+        self._new_page()
+
+    def _new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+        self.y = MARGIN
+
+    def ln(self, height):
+        self.y += height
+
+    def line(self, text, style, size, height, x=MARGIN + CELL_MARGIN, center=False):
+        if self.y + height > PAGE_HEIGHT - BOTTOM_MARGIN and self.y > MARGIN:
+            self._new_page()
+        if text.strip():
+            font = self.fonts[style]
+            if center:
+                x = (PAGE_WIDTH - font.width(text, size)) / 2
+            # Same baseline as an FPDF cell: middle of the cell plus 30% of the font size
+            baseline = PAGE_HEIGHT - (self.y + 0.5 * height + 0.3 * size)
+            self.used[style].update(text)
+            self.ops.append(f"BT /{RESOURCE_NAMES[style]} {size} Tf {x:.2f} {baseline:.2f} Td <{font.encode(text)}> Tj ET")
+        self.y += height
+
+    def paragraph(self, text, style, size, height, indent=0.0):
+        width = PAGE_WIDTH - 2 * MARGIN - indent - 2 * CELL_MARGIN
+        for line in wrap_text(text, self.fonts[style], size, width):
+            self.line(line, style, size, height, x=MARGIN + indent + CELL_MARGIN)
+
+    def output(self):
+        writer = _PDFWriter()
+        catalog, pages = writer.reserve(), writer.reserve()
+        font_refs = {}
+        for style, font in self.fonts.items():
+            if self.used[style]:
+                font_refs[style] = writer.add_font(font, self.used[style])
+        resources = " ".join(f"/{RESOURCE_NAMES[style]} {ref} 0 R" for style, ref in font_refs.items())
+        page_refs = []
+        for ops in self.pages:
+            contents = writer.add_stream("", "\n".join(ops).encode("latin-1"))
+            page_refs.append(writer.add(
+                f"<< /Type /Page /Parent {pages} 0 R /MediaBox [0 0 {PAGE_WIDTH:.2f} {PAGE_HEIGHT:.2f}] "
+                f"/Resources << /Font << {resources} >> >> /Contents {contents} 0 R >>"
+            ))
+        writer.set(pages, f"<< /Type /Pages /Kids [{' '.join(f'{ref} 0 R' for ref in page_refs)}] /Count {len(page_refs)} >>")
+        writer.set(catalog, f"<< /Type /Catalog /Pages {pages} 0 R >>")
+        return writer.to_bytes(catalog)
+
+class _PDFWriter:
+    def __init__(self):
+        self.objects = []
+
+    def reserve(self):
+        self.objects.append(None)
+        return len(self.objects)
+
+    def set(self, ref, body):
+        self.objects[ref - 1] = body.encode("latin-1") if isinstance(body, str) else body
+
+    def add(self, body):
+        ref = self.reserve()
+        self.set(ref, body)
+        return ref
+
+    def add_stream(self, entries, data, compressed=False):
+        if not compressed:
+            data = zlib.compress(data)
+        return self.add(f"<< {entries} /Filter /FlateDecode /Length {len(data)} >>\nstream\n".encode("latin-1")
+                        + data + b"\nendstream")
+
+    def add_font(self, font, chars):
+        if isinstance(font, StandardFont):
+            return self.add(f"<< /Type /Font /Subtype /Type1 /BaseFont /{font.name} /Encoding /WinAnsiEncoding >>")
+
+        embedded = font.embedding(chars)
+        name = embedded["name"]
+        font_file = self.add_stream(f"/Length1 {embedded['length1']}", embedded["font_file"], compressed=True)
+        descriptor = self.add(
+            f"<< /Type /FontDescriptor /FontName /{name} /Flags 32 /FontBBox [{' '.join(map(str, font.bbox))}] "
+            f"/ItalicAngle 0 /Ascent {font.ascent} /Descent {font.descent} /CapHeight {font.cap_height} "
+            f"/StemV 80 /FontFile2 {font_file} 0 R >>"
+        )
+        cid_to_gid = self.add_stream("", embedded["cid_to_gid"], compressed=True)
+        widths = " ".join(f"{glyph} [{font.glyph_widths[glyph]}]" for glyph in embedded["glyphs"])
+        cid_font = self.add(
+            f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{name} "
+            f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+            f"/FontDescriptor {descriptor} 0 R /DW {font.missing_width} /W [{widths}] /CIDToGIDMap {cid_to_gid} 0 R >>"
+        )
+        # Lets viewers (and our own extractor) copy the text back out
+        to_unicode = self.add_stream("", embedded["to_unicode"], compressed=True)
+        return self.add(
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /{name} /Encoding /Identity-H "
+            f"/DescendantFonts [{cid_font} 0 R] /ToUnicode {to_unicode} 0 R >>"
+        )
+
+    def to_bytes(self, root):
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for ref, body in enumerate(self.objects, 1):
+            offsets.append(len(out))
+            out += f"{ref} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+        xref = len(out)
+        out += f"xref\n0 {len(self.objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+        out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+        out += f"trailer\n<< /Size {len(self.objects) + 1} /Root {root} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+        return bytes(out)
+
+def render_resume_pdf(text, title="Improved Resume"):
+    """
+    Lay out resume text as a PDF in a single pass.
+
+    Uses the same layout as the previous FPDF renderer: a centred title,
+    bold section headings and indented bullet points, with long lines
+    wrapped at word boundaries. Text is kept as Unicode when a TrueType
+    font is available.
+
+    Args:
+        text (str): Resume text with one paragraph or bullet per line
+        title (str): Title printed at the top of the first page
+
+    Returns:
+        bytes: The PDF document
+    """
+    document = _Document(get_fonts())
+    document.line(title, "bold", 16, 10 * MM, center=True)
+    document.ln(5 * MM)
+    for line in text.replace("\r", "").replace("\t", "    ").split("\n"):
+        if is_heading(line):
+            document.ln(3 * MM)
+            document.paragraph(line, "bold", 12, 6 * MM)
+            document.ln(2 * MM)
+        elif line.strip().startswith(("•", "-", "*")):
+            document.paragraph(line, "regular", 11, 5 * MM, indent=5 * MM)
+        else:
+            document.paragraph(line, "regular", 11, 5 * MM)
+    return document.output()
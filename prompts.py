@@ -0,0 +1,79 @@
+# Prompt templates for every Groq call. Templates carry no indentation or blank lines, the
+# role is stated once in the system message, and the expected JSON is given as a one-line
+# schema instead of a filled-in example. Every token here is sent (and billed) per request.
+
+# Bump whenever a template or schema changes so stale cached analyses are not reused
+PROMPT_VERSION = "4"
+
+SYSTEM_PROMPT = "You are an expert resume analyzer and career coach. Respond with one valid JSON object only, no other text."
+REWRITE_SYSTEM_PROMPT = "You are an expert resume writer. Respond with only the improved resume text, no other text or formatting."
+
+# Minimal schema notation: key: type, where [{a, b}] is a list of objects with string fields a and b
+SCHEMA_FIELDS = {
+    "index": "N",
+    "job_match_score": '"N out of 10"',
+    "job_match_summary": "str",
+    "strengths": "[{category, details}]",
+    "weaknesses": "[{category, details}]",
+    "improvement_suggestions": "[{category, current, suggested_improvement}]",
+    "missing_keywords": "[{keyword, importance}]",
+    "job_recommendations": "[{title, match_reason, required_skills: [str]}]",
+    "skills_to_develop": "[{skill, reason}]",
+    "overall_score": '"N out of 10"',
+    "summary_feedback": "str",
+    "profile": ('{headline: "role and seniority", years_experience, skills: [str], '
+                'experience: ["Title, Company (years): achievements with numbers"], education: [str], certifications: [str]}'),
+}
+
+def schema_spec(*fields):
+    """One-line schema for the given keys, e.g. {overall_score: "N out of 10", summary_feedback: str}."""
+    return "{" + ", ".join(f"{field}: {SCHEMA_FIELDS[field]}" for field in fields) + "}"
+
+GENERAL_FIELDS = ("strengths", "weaknesses", "improvement_suggestions", "job_recommendations", "skills_to_develop",
+                  "overall_score", "summary_feedback", "profile")
+JOB_FIELDS = ("job_match_score", "job_match_summary", "strengths", "weaknesses", "improvement_suggestions",
+              "missing_keywords", "skills_to_develop", "overall_score", "summary_feedback")
+MATCH_FIELDS = ("job_match_score", "job_match_summary", "improvement_suggestions", "missing_keywords",
+                "skills_to_develop", "summary_feedback")
+
+ANALYSIS_TEMPLATE = """Analyze this resume and give detailed, constructive feedback.{part_note}
+RESUME:
+{resume}
+Reply with JSON: {schema}"""
+
+JOB_ANALYSIS_TEMPLATE = """Analyze this resume against the job description and give detailed, constructive feedback.{part_note}
+RESUME:
+{resume}
+JOB DESCRIPTION:
+{job_description}
+Reply with JSON: {schema}"""
+
+PART_NOTE = "\nThis is part {part} of {total_parts} of a longer resume; analyze only this part."
+
+MATCH_TEMPLATE = """Compare this candidate profile (extracted from the full resume) with the job description and give detailed, constructive feedback.
+CANDIDATE PROFILE:
+{profile}
+JOB DESCRIPTION:
+{job_description}
+Reply with JSON: {schema}"""
+
+PACKED_ANALYSIS_TEMPLATE = """Analyze each resume below on its own and give detailed, constructive feedback for each.
+{resumes}
+Reply with JSON: {{"results": [...]}}, a "results" array of {count} entries, one per resume in the order given, each {schema}"""
+
+PACKED_MATCH_TEMPLATE = """For each numbered comparison below, compare the candidate profile (extracted from the full resume) with the job description and give detailed, constructive feedback.
+{sections}
+Reply with JSON: {{"results": [...]}}, a "results" array of {count} entries, one per comparison in the order given, each {schema}"""
+
+REWRITE_TEMPLATE = """Rewrite this resume, implementing the improvements below.{job_section}
+ORIGINAL RESUME:
+{resume}
+IMPROVEMENTS:
+{suggestions}
+{scope}
+Use quantified bullet points for accomplishments; be clear, concise and professional. Keep names, places and other proper nouns exactly as written, including accented letters. Return only the resume text with section headers."""
+
+REWRITE_FULL_SCOPE = ("Rewrite the entire resume, keeping its core information, in these sections: "
+                      "Contact Information, Summary, Experience, Education, Skills.")
+REWRITE_PART_SCOPE = ("This is part {part} of {total_parts} of a longer resume. Rewrite only this part, keeping its "
+                      "section headers; apply only the relevant improvements and add no sections it does not contain.")
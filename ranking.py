@@ -0,0 +1,376 @@
+"""
+Rank many stored resumes against one job description with a BM25 index.
+
+The index is an inverted file stored as compressed-sparse arrays (one row of
+postings per term), so a job description is scored against the whole corpus
+with a handful of vectorized NumPy operations instead of one LLM call per
+resume. Saved indexes are memory-mapped on load.
+
+Usage:
+    python ranking.py build resumes/ --index .cache/resume_index
+    python ranking.py rank job.txt --index .cache/resume_index --top 20 [--format analysis]
+"""
+import os
+import re
+import sys
+import json
+import argparse
+from collections import Counter
+import numpy as np
+
+# Bump when tokenization or the on-disk layout changes
+INDEX_VERSION = "1"
+DEFAULT_INDEX_DIR = os.path.join(".cache", "resume_index")
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_token_re = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+doing during each few for from further had has have having he her here hers him his how i if in
+into is it its itself just me more most my no nor not now of off on once only or other our ours out
+over own same she should so some such than that the their theirs them then there these they this
+those through to too under until up very was we were what when where which while who whom why will
+with would you your yours work working years year experience ability strong skills team role
+responsibilities requirements preferred required including etc using use new plus must need
+needed looking seeking candidate candidates ideal join
+""".split())
+
+def tokenize(text):
+    """Lowercase word tokens with stopwords removed ("c++", "node.js" and "c#" stay whole)."""
+    return [
+        t for t in _token_re.findall((text or "").lower())
+        if t not in STOPWORDS and (len(t) > 1 or t in ("c", "r"))
+    ]
+
+class ResumeIndex:
+    """
+    BM25 index over resume texts with incremental add/remove.
+
+    Documents are held in two parts: a compacted base segment of postings
+    arrays (memory-mapped when loaded from disk) and a small in-memory delta of
+    documents added since the last compaction. Removing a document only marks
+    it deleted; document-frequency statistics still include deleted
+    documents until compact() or save() rewrites the base segment.
+    """
+
+    def __init__(self, k1=BM25_K1, b=BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.vocabulary = {}
+        self.doc_ids = []
+        self.positions = {}
+        # Base segment: postings of term t are indices/tfs[indptr[t]:indptr[t + 1]]
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.tfs = np.zeros(0, dtype=np.float32)
+        # Per document (base and delta): token count and live flag
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        # Term counts of documents added since the last compaction
+        self.delta = {}
+        # Optional per-document version (e.g. file mtime and size) to detect changed sources
+        self.stamps = {}
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+    def __contains__(self, doc_id):
+        position = self.positions.get(doc_id)
+        return position is not None and bool(self.alive[position])
+
+    def add(self, doc_id, text, stamp=None):
+        """Add a document (replacing any live document with the same id), with an optional version stamp."""
+        if doc_id in self:
+            self.remove(doc_id)
+        counts = Counter(tokenize(text))
+        position = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.positions[doc_id] = position
+        self.doc_lengths = np.append(np.asarray(self.doc_lengths), np.float32(sum(counts.values())))
+        self.alive = np.append(np.asarray(self.alive), True)
+        self.delta[position] = counts
+        if stamp is not None:
+            self.stamps[doc_id] = stamp
+
+    def remove(self, doc_id):
+        """Mark a document as deleted; returns False if it was not indexed."""
+        position = self.positions.get(doc_id)
+        if position is None or not self.alive[position]:
+            return False
+        if not self.alive.flags.writeable:
+            self.alive = np.array(self.alive)
+        self.alive[position] = False
+        self.delta.pop(position, None)
+        self.stamps.pop(doc_id, None)
+        return True
+
+    def compact(self):
+        """Rebuild the base segment from live documents, dropping deleted ones."""
+        live = np.flatnonzero(np.asarray(self.alive))
+        remap = {int(old): new for new, old in enumerate(live)}
+        postings = {}
+        for term, term_id in self.vocabulary.items():
+            start, stop = self.indptr[term_id], self.indptr[term_id + 1]
+            for doc, tf in zip(self.indices[start:stop].tolist(), self.tfs[start:stop].tolist()):
+                if doc in remap:
+                    postings.setdefault(term, []).append((remap[doc], tf))
+        for position, counts in self.delta.items():
+            if position in remap:
+                for term, tf in counts.items():
+                    postings.setdefault(term, []).append((remap[position], tf))
+
+        terms = sorted(postings)
+        self.vocabulary = {term: i for i, term in enumerate(terms)}
+        lengths = [len(postings[term]) for term in terms]
+        self.indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        self.indices = np.empty(int(self.indptr[-1]), dtype=np.int32)
+        self.tfs = np.empty(int(self.indptr[-1]), dtype=np.float32)
+        for term_id, term in enumerate(terms):
+            entries = sorted(postings[term])
+            start = self.indptr[term_id]
+            self.indices[start:start + len(entries)] = [doc for doc, _ in entries]
+            self.tfs[start:start + len(entries)] = [tf for _, tf in entries]
+
+        self.doc_ids = [self.doc_ids[i] for i in live]
+        self.positions = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+        self.doc_lengths = np.asarray(self.doc_lengths)[live].astype(np.float32)
+        self.alive = np.ones(len(live), dtype=bool)
+        self.delta = {}
+
+    def _document_frequencies(self, terms):
+        base = np.array([
+            self.indptr[self.vocabulary[t] + 1] - self.indptr[self.vocabulary[t]] if t in self.vocabulary else 0
+            for t in terms
+        ], dtype=np.float64)
+        for counts in self.delta.values():
+            base += [1.0 if t in counts else 0.0 for t in terms]
+        return base
+
+    def score(self, job_description):
+        """
+        Score every indexed resume against a job description in one pass.
+
+        Returns:
+            tuple: (query terms, query-term weights, contributions matrix of shape
+                (documents, terms)); deleted documents have all-zero rows
+        """
+        query = Counter(tokenize(job_description))
+        terms = list(query)
+        n_docs = len(self.doc_ids)
+        contributions = np.zeros((n_docs, len(terms)), dtype=np.float32)
+        if not terms or not n_docs:
+            return terms, np.zeros(len(terms)), contributions
+
+        df = self._document_frequencies(terms)
+        total = len(self.doc_ids)
+        idf = np.log1p((total - df + 0.5) / (df + 0.5))
+        # Repeated JD terms matter more (saturating like document tf)
+        query_tf = np.array([query[t] for t in terms], dtype=np.float64)
+        query_weights = idf * 2 * query_tf / (query_tf + 1)
+        average_length = float(np.asarray(self.doc_lengths).mean()) or 1.0
+        norm = self.k1 * (1 - self.b + self.b * np.asarray(self.doc_lengths) / average_length)
+
+        # Base segment: gather each query term's postings and score them at once
+        for column, term in enumerate(terms):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, stop = self.indptr[term_id], self.indptr[term_id + 1]
+            docs = np.asarray(self.indices[start:stop])
+            tf = np.asarray(self.tfs[start:stop])
+            contributions[docs, column] = query_weights[column] * tf * (self.k1 + 1) / (tf + norm[docs])
+        # Delta documents are few; score them directly
+        for position, counts in self.delta.items():
+            tf = np.array([counts.get(t, 0) for t in terms], dtype=np.float32)
+            contributions[position] = query_weights * tf * (self.k1 + 1) / (tf + norm[position])
+
+        contributions[~np.asarray(self.alive)] = 0
+        return terms, query_weights, contributions
+
+    def rank(self, job_description, top_k=10):
+        """
+        Return the top_k resumes for a job description.
+
+        Returns:
+            list: Hits as dicts with doc_id, score, matched_terms (term ->
+                contribution, largest first), missing_terms (most
+                discriminative first) and coverage (share of job description
+                term occurrences found in the resume)
+        """
+        terms, query_weights, contributions = self.score(job_description)
+        if not terms or not len(self):
+            return []
+        query = Counter(tokenize(job_description))
+        query_tf = np.array([query[t] for t in terms], dtype=np.float64)
+        totals = contributions.sum(axis=1)
+        totals[~np.asarray(self.alive)] = -np.inf
+        top_k = min(top_k, len(self))
+        top = np.argpartition(-totals, top_k - 1)[:top_k]
+        top = top[np.argsort(-totals[top], kind="stable")]
+        by_weight = np.argsort(-query_weights, kind="stable")
+
+        hits = []
+        for position in top:
+            row = contributions[position]
+            matched = {terms[i]: round(float(row[i]), 4) for i in np.argsort(-row, kind="stable") if row[i] > 0}
+            hits.append({
+                "doc_id": self.doc_ids[position],
+                "score": round(float(totals[position]), 4),
+                "matched_terms": matched,
+                "missing_terms": [terms[i] for i in by_weight if row[i] <= 0],
+                "coverage": round(float(query_tf[row > 0].sum() / query_tf.sum()), 4),
+            })
+        return hits
+
+    def save(self, path=DEFAULT_INDEX_DIR):
+        """Compact and write the index to a directory (arrays as .npy, metadata as JSON)."""
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        arrays = {"indptr": self.indptr, "indices": self.indices, "tfs": self.tfs, "doc_lengths": self.doc_lengths}
+        for name, array in arrays.items():
+            tmp_path = os.path.join(path, f"{name}.{os.getpid()}.tmp.npy")
+            np.save(tmp_path, np.asarray(array))
+            os.replace(tmp_path, os.path.join(path, f"{name}.npy"))
+        meta = {
+            "version": INDEX_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "terms": sorted(self.vocabulary, key=self.vocabulary.get),
+            "doc_ids": self.doc_ids,
+            "stamps": self.stamps,
+        }
+        # Metadata is written last so a reader never sees it ahead of the arrays
+        tmp_path = os.path.join(path, f"meta.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(path, "meta.json"))
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_DIR, mmap=True):
+        """
+        Open a saved index; the postings arrays are memory-mapped by default.
+
+        Returns:
+            ResumeIndex: The loaded index, or None if path holds no compatible index
+        """
+        try:
+            with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != INDEX_VERSION:
+            return None
+        index = cls(meta["k1"], meta["b"])
+        mode = "r" if mmap else None
+        index.indptr = np.load(os.path.join(path, "indptr.npy"), mmap_mode=mode)
+        index.indices = np.load(os.path.join(path, "indices.npy"), mmap_mode=mode)
+        index.tfs = np.load(os.path.join(path, "tfs.npy"), mmap_mode=mode)
+        index.doc_lengths = np.load(os.path.join(path, "doc_lengths.npy"))
+        index.vocabulary = {term: i for i, term in enumerate(meta["terms"])}
+        index.doc_ids = meta["doc_ids"]
+        # Indexes saved without stamps re-index each file once on the next build
+        index.stamps = meta.get("stamps", {})
+        index.positions = {doc_id: i for i, doc_id in enumerate(index.doc_ids)}
+        index.alive = np.ones(len(index.doc_ids), dtype=bool)
+        return index
+
+def _file_stamp(file_path):
+    stat = os.stat(file_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def build_index(directory, index_path=DEFAULT_INDEX_DIR):
+    """
+    Index every resume under a directory, updating an existing index in place.
+
+    New files and files changed since they were indexed (by modification
+    time and size) are (re-)indexed, and files that no longer exist are
+    removed from the index.
+
+    Returns:
+        ResumeIndex: The saved index
+    """
+    from extractor import extract_text_from_file, find_resumes
+
+    index = ResumeIndex.load(index_path) or ResumeIndex()
+    file_paths = find_resumes(directory)
+    present = set(file_paths)
+    for doc_id in list(index.doc_ids):
+        if doc_id not in present:
+            index.remove(doc_id)
+    for file_path in file_paths:
+        stamp = _file_stamp(file_path)
+        if file_path in index and index.stamps.get(file_path) == stamp:
+            continue
+        text = extract_text_from_file(file_path)
+        if text:
+            index.add(file_path, text, stamp)
+        else:
+            # Drop any postings from an earlier, readable version of the file
+            index.remove(file_path)
+            print(f"Skipping {file_path}: failed to extract text", file=sys.stderr)
+    index.save(index_path)
+    return index
+
+def to_match_analysis(hit):
+    """
+    Convert a ranking hit into the analyze_resume job-match schema so it can be
+    shown with utils.display_job_match_results.
+    """
+    score = round(hit["coverage"] * 10, 1)
+    top_terms = list(hit["matched_terms"])[:5]
+    return {
+        "job_match_score": f"{score:g} out of 10",
+        "job_match_summary": (
+            f"BM25 relevance {hit['score']:.2f}; strongest matching terms: {', '.join(top_terms)}."
+            if top_terms else "No terms from the job description were found in this resume."
+        ),
+        "strengths": [
+            {"category": term, "details": f"Contributes {contribution:.2f} to the relevance score"}
+            for term, contribution in list(hit["matched_terms"].items())[:5]
+        ],
+        "weaknesses": [],
+        "improvement_suggestions": [],
+        "missing_keywords": [
+            {"keyword": term, "importance": "Appears in the job description but not in the resume"}
+            for term in hit["missing_terms"][:10]
+        ],
+        "skills_to_develop": [],
+        "overall_score": f"{score:g} out of 10",
+        "summary_feedback": f"Ranked by local BM25 similarity to the job description ({hit['doc_id']}).",
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank stored resumes against a job description without the LLM")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Index (or re-index) a folder of resumes")
+    build.add_argument("directory", nargs="?", default="resumes")
+    build.add_argument("--index", default=DEFAULT_INDEX_DIR, help="Index directory")
+    rank = subparsers.add_parser("rank", help="Rank indexed resumes against a job description file")
+    rank.add_argument("job_description", help="Path to a text file with the job description")
+    rank.add_argument("--index", default=DEFAULT_INDEX_DIR, help="Index directory")
+    rank.add_argument("-k", "--top", type=int, default=10, help="Number of resumes to return")
+    rank.add_argument("--format", choices=["hits", "analysis"], default="hits",
+                      help="Print raw hits, or each hit in the job-match analysis schema")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = build_index(args.directory, args.index)
+        print(json.dumps({"documents": len(index), "terms": len(index.vocabulary), "index": args.index}))
+        return 0
+
+    index = ResumeIndex.load(args.index)
+    if index is None:
+        parser.error(f"No index found at {args.index}; run 'python ranking.py build' first")
+    with open(args.job_description, "r", encoding="utf-8") as f:
+        job_description = f.read()
+    for hit in index.rank(job_description, args.top):
+        print(json.dumps(to_match_analysis(hit) if args.format == "analysis" else hit, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+import re
+import json
+from collections.abc import Mapping
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# First byte of a serialized result; bump FORMAT_VERSION when the positional layout changes
+FORMAT_VERSION = 1
+_JSON_TAG = b"J"
+_MSGPACK_TAG = b"M"
+
+_score_re = re.compile(r"(-?\d+(?:\.\d+)?)\s*(%|/\s*(\d+(?:\.\d+)?)|out\s+of\s+(\d+(?:\.\d+)?))?", re.IGNORECASE)
+
+class Score:
+    """A model score such as "7 out of 10", parsed once into a number."""
+
+    __slots__ = ("text", "value", "scale")
+
+    def __init__(self, text, value=None, scale=10.0):
+        self.text = text
+        self.value = value
+        self.scale = scale
+
+    @classmethod
+    def parse(cls, text):
+        """Parse "7 out of 10", "7/10", "7.5" or "70%"; value is None if there is no number."""
+        text = str(text).strip() if text is not None else ""
+        match = _score_re.search(text)
+        if not match:
+            return cls(text)
+        value = float(match.group(1))
+        if match.group(2) == "%":
+            scale = 100.0
+        else:
+            scale = float(match.group(3) or match.group(4) or 10)
+        return cls(text, value, scale or 10.0)
+
+    @property
+    def out_of_ten(self):
+        """The score on a 0-10 scale (None if unparsed)."""
+        if self.value is None:
+            return None
+        return self.value * 10 / self.scale
+
+    @property
+    def band(self):
+        """"high" (7+), "medium" (5+), "low", or None if the score has no number."""
+        score = self.out_of_ten
+        if score is None:
+            return None
+        return "high" if score >= 7 else "medium" if score >= 5 else "low"
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"Score({self.text!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Score) and self.text == other.text
+
+class _Item:
+    # Subclasses list their fields (in constructor order); all are strings except LIST_FIELDS
+    __slots__ = ()
+    FIELDS = ()
+    LIST_FIELDS = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        values = []
+        for field in cls.FIELDS:
+            value = data.get(field)
+            if field in cls.LIST_FIELDS:
+                value = [str(v) for v in value] if isinstance(value, list) else []
+            else:
+                value = "" if value is None else value if isinstance(value, str) else str(value)
+            values.append(value)
+        return cls(*values)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def to_tuple(self):
+        return [getattr(self, field) for field in self.FIELDS]
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.to_tuple() == other.to_tuple()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(repr(v) for v in self.to_tuple())})"
+
+class Feedback(_Item):
+    __slots__ = FIELDS = ("category", "details")
+
+    def __init__(self, category, details):
+        self.category = category
+        self.details = details
+
+class Suggestion(_Item):
+    __slots__ = FIELDS = ("category", "current", "suggested_improvement")
+
+    def __init__(self, category, current, suggested_improvement):
+        self.category = category
+        self.current = current
+        self.suggested_improvement = suggested_improvement
+
+class Keyword(_Item):
+    __slots__ = FIELDS = ("keyword", "importance")
+
+    def __init__(self, keyword, importance):
+        self.keyword = keyword
+        self.importance = importance
+
+class SkillGap(_Item):
+    __slots__ = FIELDS = ("skill", "reason")
+
+    def __init__(self, skill, reason):
+        self.skill = skill
+        self.reason = reason
+
+class JobRecommendation(_Item):
+    __slots__ = FIELDS = ("title", "match_reason", "required_skills")
+    LIST_FIELDS = ("required_skills",)
+
+    def __init__(self, title, match_reason, required_skills):
+        self.title = title
+        self.match_reason = match_reason
+        self.required_skills = required_skills
+
+# Sections in serialization order; optional ones may be absent (None) rather than empty
+SECTIONS = (
+    ("strengths", Feedback, False),
+    ("weaknesses", Feedback, False),
+    ("improvement_suggestions", Suggestion, False),
+    ("missing_keywords", Keyword, True),
+    ("skills_to_develop", SkillGap, False),
+    ("job_recommendations", JobRecommendation, True),
+)
+_SECTION_NAMES = {name for name, _, _ in SECTIONS}
+
+DEFAULT_OVERALL_SCORE = "5 out of 10"
+DEFAULT_SUMMARY = "Analysis complete"
+
+class AnalysisResult(Mapping):
+    """
+    Validated analysis result with parsed scores and compact serialization.
+
+    Built once from the model's JSON at the parse boundary (from_dict); the
+    display code reads typed attributes such as overall_score.value, while
+    the rest of the app can keep reading it like the dict it replaces
+    (result.get("strengths") returns the same list of dicts as before).
+    """
+
+    __slots__ = ("job_match_score", "job_match_summary", "overall_score", "summary_feedback", "profile") \
+        + tuple(name for name, _, _ in SECTIONS)
+
+    def __init__(self, overall_score, summary_feedback, job_match_score=None, job_match_summary=None,
+                 profile=None, **sections):
+        self.overall_score = overall_score
+        self.summary_feedback = summary_feedback
+        self.job_match_score = job_match_score
+        self.job_match_summary = job_match_summary
+        self.profile = profile
+        for name, _, optional in SECTIONS:
+            items = sections.get(name)
+            setattr(self, name, tuple(items) if items is not None else (None if optional else ()))
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Validate a parsed (or legacy cached) analysis dict.
+
+        Sections keep only well-formed items, scores are parsed, and the
+        required fields get their defaults.
+        """
+        sections = {}
+        for name, item_class, _ in SECTIONS:
+            items = data.get(name)
+            if isinstance(items, dict):
+                items = [items]
+            if isinstance(items, list):
+                sections[name] = [item_class.from_dict(item) for item in items if isinstance(item, dict)]
+        job_match_score = data.get("job_match_score")
+        profile = data.get("profile")
+        return cls(
+            Score.parse(data.get("overall_score") or DEFAULT_OVERALL_SCORE),
+            _text(data.get("summary_feedback")) or DEFAULT_SUMMARY,
+            Score.parse(job_match_score) if job_match_score is not None else None,
+            _text(data.get("job_match_summary")),
+            profile if isinstance(profile, dict) else None,
+            **sections
+        )
+
+    # Read-only mapping in the previous dict format
+
+    def __getitem__(self, key):
+        if key in _SECTION_NAMES:
+            items = getattr(self, key)
+            if items is not None:
+                return [item.to_dict() for item in items]
+        elif key in self.__slots__:
+            value = getattr(self, key)
+            if value is not None:
+                return value.text if isinstance(value, Score) else value
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key in ("job_match_score", "job_match_summary") + tuple(name for name, _, _ in SECTIONS) \
+                + ("overall_score", "summary_feedback", "profile"):
+            if getattr(self, key) is not None:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self):
+        """The result as a plain JSON-serializable dict."""
+        return dict(self)
+
+    def __repr__(self):
+        return f"AnalysisResult(overall_score={self.overall_score.text!r}, job_match_score={self.job_match_score!r})"
+
+    # Compact serialization: positional fields instead of repeated keys
+
+    def to_tuple(self):
+        return [
+            FORMAT_VERSION,
+            _score_tuple(self.overall_score),
+            self.summary_feedback,
+            _score_tuple(self.job_match_score),
+            self.job_match_summary,
+            self.profile,
+        ] + [
+            [item.to_tuple() for item in items] if items is not None else None
+            for items in (getattr(self, name) for name, _, _ in SECTIONS)
+        ]
+
+    @classmethod
+    def from_tuple(cls, values):
+        if values[0] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported analysis result format {values[0]}")
+        sections = {}
+        for (name, item_class, _), items in zip(SECTIONS, values[6:]):
+            if items is not None:
+                sections[name] = [item_class(*item) for item in items]
+        return cls(_score_from_tuple(values[1]), values[2], _score_from_tuple(values[3]), values[4], values[5],
+                   **sections)
+
+    def dumps(self):
+        """Serialize to bytes (msgpack when installed, compact JSON otherwise)."""
+        if msgpack is not None:
+            return _MSGPACK_TAG + msgpack.packb(self.to_tuple(), use_bin_type=True)
+        return _JSON_TAG + json.dumps(self.to_tuple(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @classmethod
+    def loads(cls, data):
+        """
+        Deserialize bytes written by dumps().
+
+        Raises:
+            ValueError: Unknown format, or msgpack data without msgpack installed
+        """
+        data = bytes(data)
+        tag, payload = data[:1], data[1:]
+        if tag == _JSON_TAG:
+            return cls.from_tuple(json.loads(payload))
+        if tag == _MSGPACK_TAG and msgpack is not None:
+            return cls.from_tuple(msgpack.unpackb(payload, raw=False))
+        raise ValueError("Unreadable analysis result")
+
+def _text(value):
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    return value if isinstance(value, str) else str(value)
+
+def _score_tuple(score):
+    return [score.text, score.value, score.scale] if score is not None else None
+
+def _score_from_tuple(values):
+    return Score(*values) if values is not None else None
+
+def get_score(analysis, key):
+    """
+    Return a result's score as a Score.
+
+    Typed results already hold parsed scores; plain dicts (keyword matches,
+    ranking hits) are parsed here.
+
+    Returns:
+        Score: The score, or None if the result has none
+    """
+    if isinstance(analysis, AnalysisResult):
+        return getattr(analysis, key)
+    value = analysis.get(key)
+    return Score.parse(value) if value is not None else None
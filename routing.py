@@ -0,0 +1,297 @@
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from metrics import increment, observe, percentile
+from groq_client import get_governor
+
+# Models per task, first choice first (override with GROQ_ANALYSIS_MODELS / GROQ_REWRITE_MODELS,
+# comma-separated): a fast model for analysis, a larger one for rewriting the resume
+DEFAULT_ROUTES = {
+    "analysis": ("llama3-8b-8192", "llama-3.1-8b-instant"),
+    "rewrite": ("llama3-70b-8192", "llama3-8b-8192"),
+}
+# A model that fails this many times in a row is skipped for COOLDOWN_SECONDS, then tried again once
+FAILURE_THRESHOLD = 5
+COOLDOWN_SECONDS = 30
+# A second attempt is started once a call takes longer than this percentile of the model's recent calls
+HEDGE_PERCENTILE = 95
+MIN_HEDGE_SAMPLES = 10
+LATENCY_WINDOW = 200
+# Hedge delay until enough calls have been timed (override with GROQ_HEDGE_DELAY)
+DEFAULT_HEDGE_DELAY = 10.0
+MAX_PARALLEL_ATTEMPTS = 32
+
+_router = None
+_router_lock = threading.Lock()
+
+# Exception classes (matched by name, so the Groq SDK and httpx are not imported here) that mean
+# the model or its endpoint is unhealthy, as opposed to the account being rate limited
+_MODEL_FAILURE_ERRORS = frozenset(("APIConnectionError", "APITimeoutError", "TimeoutException", "TransportError"))
+
+class CircuitOpenError(Exception):
+    """Raised when every model configured for a task is temporarily switched off."""
+
+def is_model_failure(error):
+    """
+    Return True if an API error should count against the model's circuit breaker.
+
+    Only timeouts, connection errors and 5xx responses do. Rate-limit and
+    quota errors (429) and other 4xx responses are about the shared account
+    or the request, and would otherwise switch off every model at once.
+    """
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code >= 500
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return any(cls.__name__ in _MODEL_FAILURE_ERRORS for cls in type(error).__mro__)
+
+class CircuitBreaker:
+    """
+    Per-model circuit breaker.
+
+    Closed: calls go through. After FAILURE_THRESHOLD consecutive failures it
+    opens and calls are refused for the cooldown; then one trial call is let
+    through (half-open), whose outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, cooldown_seconds=COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started_at = None
+
+    @property
+    def state(self):
+        with self.lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.cooldown_seconds:
+                return "half_open"
+            return "open"
+
+    def allow(self):
+        """Return True if a call may be made now (reserving the trial call when half-open)."""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < self.cooldown_seconds:
+                return False
+            # A trial call that never reported back (abandoned stream) does not block the model forever
+            if self.trial_started_at is not None and now - self.trial_started_at < self.cooldown_seconds:
+                return False
+            self.trial_started_at = now
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_started_at = None
+
+    def release(self):
+        """End a half-open trial call without a verdict (e.g. it was rate limited)."""
+        with self.lock:
+            self.trial_started_at = None
+
+    def record_failure(self):
+        """Count a failure; returns True if this opened the circuit."""
+        with self.lock:
+            self.failures += 1
+            self.trial_started_at = None
+            now = time.monotonic()
+            if self.opened_at is not None and now - self.opened_at < self.cooldown_seconds:
+                # A call that started before the circuit opened
+                return False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = now
+                return True
+            return False
+
+class ModelRouter:
+    """
+    Chooses a model per task, hedges slow calls and switches off failing models.
+
+    call() runs a request on the first model whose circuit is closed. If it
+    has not answered after the model's recent p95 latency, the same request
+    is started on the next model (or again on the same one) and the first
+    valid response wins; the slower call is left to finish in the background.
+    """
+
+    def __init__(self, routes=None, hedging=True, hedge_delay=None, governor=None):
+        self.routes = {task: tuple(models) for task, models in (routes or DEFAULT_ROUTES).items()}
+        self.hedging = hedging
+        self.fixed_hedge_delay = hedge_delay
+        self.governor = governor
+        self.lock = threading.Lock()
+        self.breakers = {}
+        self.latencies = {}
+        self.executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_ATTEMPTS, thread_name_prefix="groq-attempt")
+
+    def models(self, task):
+        """All models configured for a task, in order of preference."""
+        return self.routes.get(task) or self.routes["analysis"]
+
+    def primary(self, task):
+        """The preferred model for a task (also part of analysis cache keys)."""
+        return self.models(task)[0]
+
+    def breaker(self, model):
+        with self.lock:
+            breaker = self.breakers.get(model)
+            if breaker is None:
+                breaker = self.breakers[model] = CircuitBreaker()
+            return breaker
+
+    def select(self, task):
+        """
+        Return the first model for a task whose circuit allows a call.
+
+        Raises:
+            CircuitOpenError: Every model for the task is switched off
+        """
+        for model in self.models(task):
+            if self.breaker(model).allow():
+                return model
+        raise CircuitOpenError(f"All models for {task} are temporarily unavailable")
+
+    def record_success(self, model, latency):
+        self.breaker(model).record_success()
+        observe("groq_model_latency_seconds", latency, model=model)
+        with self.lock:
+            samples = self.latencies.get(model)
+            if samples is None:
+                samples = self.latencies[model] = deque(maxlen=LATENCY_WINDOW)
+            samples.append(latency)
+
+    def record_failure(self, model, error=None):
+        """Count a failed call against the model, unless error is not the model's fault (see is_model_failure)."""
+        breaker = self.breaker(model)
+        if error is not None and not is_model_failure(error):
+            breaker.release()
+            return
+        if breaker.record_failure():
+            increment("circuit_breaker_opened_total", model=model)
+
+    def hedge_delay(self, model):
+        """Seconds to wait for a call to model before hedging it."""
+        if self.fixed_hedge_delay is not None:
+            return self.fixed_hedge_delay
+        with self.lock:
+            samples = list(self.latencies.get(model, ()))
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return DEFAULT_HEDGE_DELAY
+        return percentile(samples, HEDGE_PERCENTILE)
+
+    def status(self):
+        """Circuit state and hedge delay of every model used so far."""
+        with self.lock:
+            models = list(self.breakers)
+        return {model: {"state": self.breaker(model).state, "hedge_delay_seconds": round(self.hedge_delay(model), 3)}
+                for model in models}
+
+    def _attempt(self, model, request):
+        start = time.perf_counter()
+        try:
+            response = request(model)
+        except Exception as e:
+            self.record_failure(model, e)
+            raise
+        self.record_success(model, time.perf_counter() - start)
+        return response
+
+    def _hedge_model(self, task, primary):
+        # Prefer another model, since a slow model is often slow for everyone
+        for model in self.models(task):
+            if model != primary and self.breaker(model).allow():
+                return model
+        return primary
+
+    def call(self, task, request, validate=None, source=None):
+        """
+        Run request(model) with routing, hedging and circuit breaking.
+
+        The caller is expected to have reserved a rate-limit slot for the first
+        attempt; a hedge is only sent if a slot is free right away.
+
+        Args:
+            task (str): Route name ("analysis" or "rewrite")
+            request (callable): Makes one API call with the given model and returns its text
+            validate (callable): Returns True if a response is usable; invalid
+                responses lose to a valid one from the other attempt
+            source (str): Rate-limit label for hedged calls (defaults to the task)
+
+        Returns:
+            str: The first valid response (or the last invalid one if none was valid)
+
+        Raises:
+            CircuitOpenError: Every model for the task is switched off
+            Exception: The last attempt's error if no attempt returned a response
+        """
+        primary = self.select(task)
+        if not self.hedging:
+            return self._attempt(primary, request)
+
+        start = time.monotonic()
+        delay = self.hedge_delay(primary)
+        pending = {self.executor.submit(self._attempt, primary, request): "primary"}
+        hedged = False
+        invalid = None
+        error = None
+        while pending:
+            timeout = None if hedged else max(start + delay - time.monotonic(), 0)
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                if self.governor is None or self.governor.try_acquire(source or task) <= 0:
+                    model = self._hedge_model(task, primary)
+                    increment("groq_hedged_requests_total", task=task, model=model)
+                    pending[self.executor.submit(self._attempt, model, request)] = "hedge"
+                continue
+            for future in done:
+                attempt = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if validate is None or validate(response):
+                    if hedged:
+                        increment("groq_hedge_wins_total", task=task, winner=attempt)
+                    return response
+                invalid = response
+        if invalid is not None:
+            return invalid
+        raise error
+
+def _models_from_env(name, default):
+    value = os.getenv(name)
+    models = tuple(m.strip() for m in value.split(",") if m.strip()) if value else ()
+    return models or default
+
+def get_router():
+    """
+    Return the process-wide ModelRouter (created on first use).
+
+    GROQ_HEDGING=0 turns hedging off; GROQ_HEDGE_DELAY fixes the hedge delay in seconds.
+    """
+    global _router
+    with _router_lock:
+        if _router is None:
+            routes = {
+                "analysis": _models_from_env("GROQ_ANALYSIS_MODELS", DEFAULT_ROUTES["analysis"]),
+                "rewrite": _models_from_env("GROQ_REWRITE_MODELS", DEFAULT_ROUTES["rewrite"]),
+            }
+            hedge_delay = os.getenv("GROQ_HEDGE_DELAY")
+            _router = ModelRouter(
+                routes,
+                hedging=os.getenv("GROQ_HEDGING", "1") != "0",
+                hedge_delay=float(hedge_delay) if hedge_delay else None,
+                governor=get_governor()
+            )
+        return _router
@@ -0,0 +1,112 @@
+import threading
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key within a process.
+
+    The first caller for a key (the leader) runs the work; callers arriving
+    while it is in flight wait for and share its result instead of repeating
+    it. If the leader produces no result (None), a waiting caller takes over.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def begin(self, key):
+        """
+        Join the in-flight call for key, or start one.
+
+        Returns:
+            tuple: (call, leader) where leader is True if the caller must run the
+                work and then call finish()
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            if call is not None:
+                return call, False
+            call = _Call()
+            self.calls[key] = call
+            return call, True
+
+    def finish(self, key, call, result=None, error=None):
+        """Publish the leader's result (or exception) to every waiting caller."""
+        with self.lock:
+            if self.calls.get(key) is call:
+                del self.calls[key]
+        call.result = result
+        call.error = error
+        call.done.set()
+
+    def in_flight(self, key):
+        with self.lock:
+            return key in self.calls
+
+    def do(self, key, fn):
+        """
+        Run fn() once for all concurrent callers with the same key.
+
+        Returns:
+            tuple: (result, shared) where shared is True if another caller ran fn
+        """
+        while True:
+            call, leader = self.begin(key)
+            if leader:
+                try:
+                    result = fn()
+                except BaseException as e:
+                    self.finish(key, call, error=e)
+                    raise
+                self.finish(key, call, result)
+                return result, False
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            if call.result is not None:
+                return call.result, True
+
+def run_once(cache, key, compute, flights):
+    """
+    Compute a cacheable value at most once across threads and processes.
+
+    Threads in this process are coalesced by flights; other processes sharing
+    the cache file are coordinated through a lease in the cache database
+    (renewed while compute() runs), and wait for the lease holder's cached
+    result instead of repeating the work.
+    compute() is responsible for storing successful results in the cache.
+
+    Args:
+        cache (AnalysisCache): Shared cache holding results and leases
+        key (str): Cache key of the value
+        compute (callable): Produces the value when this caller is the leader
+        flights (SingleFlight): Per-process coalescing table
+
+    Returns:
+        tuple: (value, shared) where shared is True if the value was computed by
+            another thread or process
+    """
+    def lead():
+        while True:
+            if cache.try_lease(key):
+                renewing = cache.keep_lease(key)
+                try:
+                    # Another process may have finished between our cache miss and the lease
+                    value = cache.peek(key)
+                    if value is not None:
+                        return value, True
+                    return compute(), False
+                finally:
+                    renewing.set()
+                    cache.release_lease(key)
+            value = cache.wait_for(key)
+            if value is not None:
+                return value, True
+
+    (value, shared_by_process), shared_by_thread = flights.do(key, lead)
+    return value, shared_by_process or shared_by_thread
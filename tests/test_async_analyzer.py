@@ -0,0 +1,77 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import async_analyzer
+import groq_client
+from async_analyzer import AsyncSmartAnalyzer
+from cache import AnalysisCache
+from routing import ModelRouter, FAILURE_THRESHOLD
+
+class ServerError(Exception):
+    status_code = 503
+
+class RateLimitError(Exception):
+    status_code = 429
+
+class FakeCompletions:
+    """chat.completions stand-in: the listed models fail with the given error."""
+
+    def __init__(self, failing):
+        self.failing = failing
+        self.models = []
+
+    async def create(self, model, **kwargs):
+        self.models.append(model)
+        if model in self.failing:
+            raise self.failing[model]
+        message = SimpleNamespace(content='{"overall_score": "7 out of 10"}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")], usage=None)
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_DB_PATH", ":memory:")
+    monkeypatch.setattr(groq_client, "_governor", None)
+    router = ModelRouter({"analysis": ["primary", "fallback"], "rewrite": ["primary"]})
+    monkeypatch.setattr(async_analyzer, "get_router", lambda: router)
+
+    async def no_sleep(seconds):
+        pass
+    monkeypatch.setattr(async_analyzer.asyncio, "sleep", no_sleep)
+    engine = AsyncSmartAnalyzer("key", requests_per_minute=10 ** 6, tokens_per_minute=10 ** 9,
+                                cache=AnalysisCache(":memory:"))
+    return engine
+
+def use_client(engine, failing):
+    completions = FakeCompletions(failing)
+    engine.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return completions
+
+def request(engine):
+    return asyncio.run(engine._make_groq_request("prompt"))
+
+def test_failing_model_is_switched_off(engine):
+    completions = use_client(engine, {"primary": ServerError("upstream unavailable")})
+
+    for _ in range(FAILURE_THRESHOLD):
+        with pytest.raises(ServerError):
+            asyncio.run(engine._make_groq_request("prompt", max_retries=1))
+    assert request(engine) == '{"overall_score": "7 out of 10"}'
+    assert completions.models[-1] == "fallback"
+    assert engine.model == "primary"
+
+def test_rate_limits_do_not_open_the_circuit(engine):
+    completions = use_client(engine, {"primary": RateLimitError("rate limit reached")})
+
+    for _ in range(FAILURE_THRESHOLD + 1):
+        with pytest.raises(RateLimitError):
+            asyncio.run(engine._make_groq_request("prompt", max_retries=1))
+    assert set(completions.models) == {"primary"}
+    assert engine.router.breaker("primary").allow()
+
+def test_success_is_recorded(engine):
+    use_client(engine, {})
+
+    request(engine)
+    assert len(engine.router.latencies["primary"]) == 1
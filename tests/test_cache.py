@@ -0,0 +1,51 @@
+import result_model
+from cache import AnalysisCache
+from jobs import JobQueue
+from result_model import AnalysisResult
+
+RESULT = AnalysisResult.from_dict({
+    "overall_score": "7 out of 10",
+    "summary_feedback": "Solid backend resume.",
+    "strengths": [{"category": "Python", "details": "Eight years of production work"}],
+})
+
+def old_format(monkeypatch, result):
+    # A result written before a FORMAT_VERSION bump
+    monkeypatch.setattr(result_model, "FORMAT_VERSION", result_model.FORMAT_VERSION - 1)
+    payload = result.dumps()
+    monkeypatch.undo()
+    return payload
+
+def test_unreadable_entry_is_a_miss_and_removed(tmp_path, monkeypatch):
+    cache = AnalysisCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=None)
+    cache.set("key", RESULT)
+    payload = old_format(monkeypatch, RESULT)
+    cache.conn.execute("UPDATE analysis_cache SET value = ? WHERE key = ?", (payload, "key"))
+
+    assert cache.peek("key") is None
+    cache.conn.execute("INSERT INTO analysis_cache VALUES ('key', ?, 1, 0, 0)", (payload,))
+    assert cache.get("key") is None
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0] == 0
+
+    cache.set("key", RESULT)
+    assert cache.get("key") == RESULT
+
+def test_msgpack_entry_without_msgpack_is_a_miss(tmp_path, monkeypatch):
+    cache = AnalysisCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=None)
+    cache.conn.execute("INSERT INTO analysis_cache VALUES ('key', ?, 1, 0, 0)", (b"M\x93\x01\x02\x03",))
+    monkeypatch.setattr(result_model, "msgpack", None)
+
+    assert cache.get("key") is None
+    assert cache.conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0] == 0
+
+def test_job_with_unreadable_result_is_reported_failed(tmp_path, monkeypatch):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), workers=1)
+    job_id = queue.submit("analysis", {"resume_text": "text", "job_description": ""})
+    payload = old_format(monkeypatch, RESULT)
+    queue.conn.execute("UPDATE jobs SET status = 'done', result = ? WHERE id = ?", (payload, job_id))
+
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["result"] is None
+    assert "could not be read" in job["error"]
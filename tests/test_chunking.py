@@ -0,0 +1,56 @@
+import pytest
+
+import chunking
+from chunking import count_tokens, plan_chunks
+
+RESUME = """JOHN SMITH
+Senior Software Engineer
+
+EXPERIENCE
+Backend Engineer, Example Corp (2015-2023)
+    - Built payment APIs handling 12,000 requests/second
+    - Led a team of 6 engineers
+
+
+
+SKILLS
+Python      Go      SQL      Kubernetes
+Terraform   AWS     GCP      Kafka
+
+EDUCATION
+B.Sc. Computer Science, State University (2011-2015)
+"""
+
+@pytest.fixture(autouse=True)
+def fallback_tokenizer(monkeypatch):
+    monkeypatch.setattr(chunking, "tiktoken", None)
+
+def test_whitespace_runs_are_counted():
+    assert count_tokens("Python      Go\n\n\n    SQL") > count_tokens("Python Go SQL")
+
+@pytest.mark.parametrize("budget", [8, 20, 50, 120])
+def test_planned_chunks_stay_within_budget(budget):
+    text = RESUME * 5
+    chunks = plan_chunks(text, budget)
+    assert "".join(chunks) == text
+    assert all(count_tokens(chunk) <= budget for chunk in chunks)
+
+def test_long_symbol_run_is_split_within_budget():
+    text = "SKILLS\n" + "-" * 200 + "\n"
+    chunks = plan_chunks(text, 30)
+    assert "".join(chunks) == text
+    assert all(count_tokens(chunk) <= 30 for chunk in chunks)
+
+@pytest.mark.parametrize("line, expected", [
+    ("EXPERIENCE", True),
+    ("Work Experience", True),
+    ("  Skills:  ", True),
+    ("Key Achievements:", True),
+    ("JOHN SMITH", True),
+    ("Built payment APIs handling 12,000 requests/second", False),
+    ("Responsibilities included the following duties:", False),
+    ("- AWS", False),
+    ("", False),
+])
+def test_is_heading(line, expected):
+    assert chunking.is_heading(line) is expected
@@ -0,0 +1,31 @@
+import json
+from json_parsing import extract_json_object, repair_json
+
+COMPLETE = {
+    "strengths": [{"category": "Leadership", "details": "Led a team of four"}],
+    "weaknesses": [{"category": "Metrics", "details": "Few quantified results"}],
+    "overall_score": "7 out of 10",
+}
+
+def test_truncation_inside_array_item_drops_the_blank_item():
+    text = json.dumps(COMPLETE)
+    # Cut off right after the second weakness opened: repair closes it as {}
+    truncated = text[:text.index('{"category": "Metrics"')] + '{"category": "Metrics", "details": "Few"}, {"cat'
+    assert "{}" in repair_json(truncated)
+    result = extract_json_object(truncated)
+    assert result["strengths"] == COMPLETE["strengths"]
+    assert result["weaknesses"] == [{"category": "Metrics", "details": "Few"}]
+
+def test_truncation_before_first_value_of_only_item():
+    text = json.dumps(COMPLETE)
+    truncated = text[:text.index('"Metrics"')]
+    result = extract_json_object(truncated)
+    assert result["weaknesses"] == []
+    assert result["strengths"] == COMPLETE["strengths"]
+
+def test_all_default_items_are_dropped():
+    result = extract_json_object(json.dumps({
+        "strengths": [{"category": "", "details": " "}, {"category": None}, {"category": "Go", "details": ""}],
+        "overall_score": "6 out of 10",
+    }))
+    assert result["strengths"] == [{"category": "Go", "details": ""}]
@@ -0,0 +1,43 @@
+from json_parsing import validate_schema
+from ranking import ResumeIndex, to_match_analysis, main
+from result_model import Score
+
+JOB_DESCRIPTION = "Backend engineer with Python, Kafka and Terraform experience"
+
+def build_index():
+    index = ResumeIndex()
+    index.add("alice.pdf", "Python developer. Built Kafka pipelines on AWS.")
+    index.add("bob.pdf", "Sales manager with CRM and negotiation experience.")
+    return index
+
+def test_to_match_analysis_has_the_job_match_shape():
+    hit = build_index().rank(JOB_DESCRIPTION, 1)[0]
+    analysis = to_match_analysis(hit)
+
+    assert hit["doc_id"] == "alice.pdf"
+    coerced, matched = validate_schema(dict(analysis))
+    assert coerced == analysis
+    assert matched == len(analysis)
+    assert Score.parse(analysis["job_match_score"]).value == round(hit["coverage"] * 10, 1)
+    assert analysis["overall_score"] == analysis["job_match_score"]
+    assert [s["category"] for s in analysis["strengths"]] == list(hit["matched_terms"])[:5]
+    assert {k["keyword"] for k in analysis["missing_keywords"]} == set(hit["missing_terms"][:10])
+    assert "terraform" in {k["keyword"] for k in analysis["missing_keywords"]}
+    assert "alice.pdf" in analysis["summary_feedback"]
+
+def test_to_match_analysis_without_matching_terms():
+    hit = build_index().rank(JOB_DESCRIPTION, 2)[1]
+    analysis = to_match_analysis(hit)
+
+    assert analysis["job_match_score"] == "0 out of 10"
+    assert analysis["strengths"] == []
+    assert analysis["job_match_summary"].startswith("No terms")
+
+def test_rank_cli_prints_analysis_format(tmp_path, capsys):
+    build_index().save(str(tmp_path / "index"))
+    job_file = tmp_path / "job.txt"
+    job_file.write_text(JOB_DESCRIPTION, encoding="utf-8")
+
+    assert main(["rank", str(job_file), "--index", str(tmp_path / "index"), "--top", "1", "--format", "analysis"]) == 0
+    line = capsys.readouterr().out.strip()
+    assert '"job_match_score"' in line and '"doc_id"' not in line
@@ -0,0 +1,42 @@
+import time
+
+from cache import AnalysisCache
+from singleflight import SingleFlight, run_once
+
+LEASE = 0.3
+
+def short_leases(monkeypatch):
+    try_lease, keep_lease = AnalysisCache.try_lease, AnalysisCache.keep_lease
+    monkeypatch.setattr(AnalysisCache, "try_lease", lambda self, key: try_lease(self, key, LEASE))
+    monkeypatch.setattr(AnalysisCache, "keep_lease", lambda self, key: keep_lease(self, key, LEASE))
+
+def test_kept_lease_outlives_its_duration(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    holder, other = AnalysisCache(path), AnalysisCache(path)
+
+    assert holder.try_lease("key", LEASE)
+    renewing = holder.keep_lease("key", LEASE)
+    time.sleep(LEASE * 3)
+    assert not other.try_lease("key", LEASE)
+
+    renewing.set()
+    holder.release_lease("key")
+    assert not holder.renew_lease("key", LEASE)
+    assert other.try_lease("key", LEASE)
+
+def test_run_once_keeps_the_lease_while_computing(tmp_path, monkeypatch):
+    short_leases(monkeypatch)
+    path = str(tmp_path / "cache.sqlite3")
+    holder, other = AnalysisCache(path), AnalysisCache(path)
+    taken_over = []
+
+    def compute():
+        time.sleep(LEASE * 3)
+        taken_over.append(other.try_lease("key"))
+        holder.set("key", {"overall_score": "7 out of 10"})
+        return holder.peek("key")
+
+    value, shared = run_once(holder, "key", compute, SingleFlight())
+    assert taken_over == [False]
+    assert value == {"overall_score": "7 out of 10"} and not shared
+    assert other.try_lease("key")
@@ -1,6 +1,7 @@
 import streamlit as st
 import os
 import base64
+from result_model import Score, get_score
 
 def setup_page():
     """Configure Streamlit page settings"""
@@ -71,23 +72,14 @@ def display_job_match_results(analysis):
     st.header("🎯 Job Match Analysis Results")
     
     # Get job match score and style accordingly
-    job_match_score = analysis.get("job_match_score", "0 out of 10")
+    job_match_score = get_score(analysis, "job_match_score") or Score.parse("0 out of 10")
     job_match_summary = analysis.get("job_match_summary", "No match summary available")
     
-    try:
-        score_value = float(job_match_score.split()[0])
-        if score_value >= 7:
-            match_class = "high-match"
-            match_emoji = "🎉"
-        elif score_value >= 5:
-            match_class = "medium-match"
-            match_emoji = "👍"
-        else:
-            match_class = "low-match"
-            match_emoji = "📈"
-    except:
-        match_class = "medium-match"
-        match_emoji = "📊"
+    match_class, match_emoji = {
+        "high": ("high-match", "🎉"),
+        "medium": ("medium-match", "👍"),
+        "low": ("low-match", "📈"),
+    }.get(job_match_score.band, ("medium-match", "📊"))
     
     st.markdown(f"""
     <div class="job-match-score {match_class}">
@@ -143,23 +135,14 @@ def display_analysis_results(analysis, show_header=True):
     if show_header:
         st.header("📊 Resume Analysis Results")
     
-    # Get the score as a number for coloring
-    try:
-        score_text = analysis.get("overall_score", "0 out of 10")
-        score_value = float(score_text.split()[0])
-        
-        # Create a color based on the score
-        if score_value >= 7:
-            score_color = "green"
-        elif score_value >= 5:
-            score_color = "orange"
-        else:
-            score_color = "red"
-            
-        st.markdown(f"<h3 style='text-align: center; color: {score_color};'>Overall Resume Score: {score_text}</h3>", 
+    # Color by the score parsed when the result was validated
+    score = get_score(analysis, "overall_score") or Score.parse("0 out of 10")
+    score_color = {"high": "green", "medium": "orange", "low": "red"}.get(score.band)
+    if score_color:
+        st.markdown(f"<h3 style='text-align: center; color: {score_color};'>Overall Resume Score: {score}</h3>", 
                    unsafe_allow_html=True)
-    except:
-        st.subheader(f"Overall Score: {analysis.get('overall_score', 'N/A')}")
+    else:
+        st.subheader(f"Overall Score: {score.text or 'N/A'}")
     
     # Summary feedback
     st.subheader("📝 Summary Feedback")
@@ -255,6 +238,67 @@ def display_job_recommendations(job_recommendations):
                     skills_html += f'<span class="keyword-tag">{skill}</span>'
                 st.markdown(skills_html, unsafe_allow_html=True)
 
+STREAMING_SECTIONS = [
+    ("strengths", "✅ Strengths", "category", "details"),
+    ("weaknesses", "⚠️ Areas to Improve", "category", "details"),
+    ("improvement_suggestions", "💡 Suggestions", "category", "suggested_improvement"),
+    ("missing_keywords", "🔍 Missing Keywords", "keyword", "importance"),
+    ("skills_to_develop", "🚀 Skills to Develop", "skill", "reason"),
+]
+
+def display_partial_analysis(partial):
+    """
+    Display the sections of an analysis received so far.
+
+    Args:
+        partial (dict): Sections and scores parsed from the model output so far
+    """
+    st.caption("⏳ Analysis in progress...")
+    for score_key, label in (("job_match_score", "Job Match Score"), ("overall_score", "Overall Score")):
+        if score_key in partial:
+            st.markdown(f"**{label}:** {partial[score_key]}")
+    for section_key, title, title_field, body_field in STREAMING_SECTIONS:
+        items = partial.get(section_key)
+        if not items:
+            continue
+        st.markdown(f"**{title}**")
+        for item in items:
+            if isinstance(item, dict):
+                st.markdown(f"- **{item.get(title_field, '')}**: {item.get(body_field, '')}")
+
+def display_keyword_match(match):
+    """
+    Display the instant local keyword match for a resume and job description.
+
+    Args:
+        match (dict): Result of keyword_match.match_keywords
+    """
+    if not match["job_keywords"]:
+        return
+    with st.expander(f"⚡ Instant Keyword Match: {match['job_match_score']}", expanded=False):
+        st.progress(match["coverage"])
+        st.caption(f"{len(match['matched_keywords'])} of {len(match['job_keywords'])} skills from the job description found in your resume")
+        keywords_html = ""
+        for keyword_info in match["missing_keywords"]:
+            keywords_html += f'<span class="keyword-tag" title="{keyword_info["importance"]}">{keyword_info["keyword"]}</span>'
+        if keywords_html:
+            st.markdown(keywords_html, unsafe_allow_html=True)
+
+def display_rate_limit_usage(usage):
+    """
+    Display the shared Groq rate limit window in the sidebar.
+
+    Args:
+        usage (dict): Window usage as returned by RateGovernor.usage()
+    """
+    with st.sidebar.expander("📈 API Usage", expanded=False):
+        st.metric("Requests this minute", f"{usage['used']} / {usage['limit']}")
+        st.progress(min(usage["used"] / usage["limit"], 1.0) if usage["limit"] else 0.0)
+        if usage["remaining"] == 0:
+            st.caption(f"Window resets in {usage['resets_in_seconds']}s")
+        for source, count in usage["by_source"].items():
+            st.caption(f"{source}: {count}")
+
 def get_binary_file_downloader_html(bin_file, file_label='File'):
     """
     Generate HTML code for a file download link